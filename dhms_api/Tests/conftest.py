@@ -9,6 +9,14 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache(django_db_setup, django_db_blocker):
+    """Start every test with an empty cache; rolled-back rows may reuse ids."""
+    from django.core.cache import cache
+    with django_db_blocker.unblock():
+        cache.clear()
+
+
 # ==================== API CLIENT FIXTURES ====================
 
 @pytest.fixture
@@ -49,6 +57,14 @@ def security_client(api_client, security_user):
     return api_client
 
 
+@pytest.fixture
+def admin_client(api_client, admin_user):
+    """Return an API client authenticated as an admin."""
+    refresh = RefreshToken.for_user(admin_user)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return api_client
+
+
 # ==================== USER FIXTURES ====================
 
 @pytest.fixture
@@ -121,52 +137,68 @@ def admin_user(db):
 def student_profile(db, student_user):
     """Create a student profile."""
     from accounts.models import Student
-    return Student.objects.create(
+    # The post_save signal already created a bare profile for this user.
+    profile, _ = Student.objects.update_or_create(
         user=student_user,
-        student_code='STU-TEST-001',
-        student_type='government',
-        department='Computer Science',
-        year_of_study=3,
-        semester=1
+        defaults={
+            'student_code': 'STU-TEST-001',
+            'student_type': 'government',
+            'department': 'Computer Science',
+            'year_of_study': 3,
+            'semester': 1
+        }
     )
+    return profile
 
 
 @pytest.fixture
 def proctor_profile(db, proctor_user, dorm):
     """Create a proctor profile."""
     from accounts.models import Proctor
-    return Proctor.objects.create(
+    # The post_save signal already created a bare profile for this user.
+    profile, _ = Proctor.objects.update_or_create(
         user=proctor_user,
-        proctor_code='PRO-TEST-001',
-        assigned_dorm=dorm,
-        is_active=True
+        defaults={
+            'proctor_code': 'PRO-TEST-001',
+            'assigned_dorm': dorm,
+            'is_active': True
+        }
     )
+    return profile
 
 
 @pytest.fixture
 def staff_profile(db, staff_user):
     """Create a staff profile."""
     from accounts.models import Staff
-    return Staff.objects.create(
+    # The post_save signal already created a bare profile for this user.
+    profile, _ = Staff.objects.update_or_create(
         user=staff_user,
-        staff_code='STF-TEST-001',
-        department='Maintenance',
-        position='Technician',
-        is_active=True
+        defaults={
+            'staff_code': 'STF-TEST-001',
+            'department': 'Maintenance',
+            'position': 'Technician',
+            'is_active': True
+        }
     )
+    return profile
 
 
 @pytest.fixture
 def security_profile(db, security_user):
     """Create a security profile."""
     from accounts.models import Security
-    return Security.objects.create(
+    # The post_save signal already created a bare profile for this user.
+    profile, _ = Security.objects.update_or_create(
         user=security_user,
-        security_code='SEC-TEST-001',
-        shift='morning',
-        assigned_post='Main Gate',
-        is_active=True
+        defaults={
+            'security_code': 'SEC-TEST-001',
+            'shift': 'morning',
+            'assigned_post': 'Main Gate',
+            'is_active': True
+        }
     )
+    return profile
 
 
 # ==================== DORM & ROOM FIXTURES ====================
@@ -114,6 +114,53 @@ class TestCurrentUser:
         assert response.data['user']['username'] == 'teststudent'
         assert 'permissions' in response.data['user']
     
+    def test_current_user_embeds_profile(self, proctor_client, proctor_profile):
+        """Test the role profile comes with the user."""
+        response = proctor_client.get('/aau-dhms-api/auth/me/')
+        
+        profile = response.data['user']['profile']
+        assert profile['proctor_code'] == proctor_profile.proctor_code
+        assert profile['assigned_dorm_name'] == proctor_profile.assigned_dorm.name
+    
+    def test_not_modified_skips_database(self, api_client, student_profile, django_assert_num_queries):
+        """Test a matching If-None-Match is answered from the cache alone."""
+        login = api_client.post('/aau-dhms-api/auth/login/', {'username': 'teststudent', 'password': 'testpass123'})
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['token']}")
+        etag = api_client.get('/aau-dhms-api/auth/me/')['ETag']
+        
+        with django_assert_num_queries(0):
+            response = api_client.get('/aau-dhms-api/auth/me/', HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+    
+    def test_profile_save_invalidates(self, staff_client, staff_profile):
+        """Test saving the profile changes the payload and its ETag."""
+        url = '/aau-dhms-api/auth/me/'
+        etag = staff_client.get(url)['ETag']
+        
+        staff_profile.department = 'Electrical'
+        staff_profile.save()
+        response = staff_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['user']['profile']['department'] == 'Electrical'
+        assert response['ETag'] != etag
+    
+    def test_deleted_user(self, api_client, student_profile):
+        """Test an unexpired token of a deleted account gets 401 and caches nothing."""
+        from accounts.current_user import CURRENT_USER
+        
+        login = api_client.post('/aau-dhms-api/auth/login/', {'username': 'teststudent', 'password': 'testpass123'})
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['token']}")
+        user_id = student_profile.user_id
+        student_profile.user.delete()
+        response = api_client.get('/aau-dhms-api/auth/me/')
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data['code'] == 'user_not_found'
+        assert CURRENT_USER.get(user_id) is None
+    
     def test_get_current_user_unauthenticated(self, api_client):
         """Test getting current user without authentication."""
         url = '/aau-dhms-api/auth/me/'
@@ -167,3 +214,337 @@ class TestTokenRefresh:
         response = api_client.post(url, data)
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_inactive_user_cannot_refresh(self, api_client, student_user):
+        """Test a deactivated account's refresh token is refused."""
+        from rest_framework_simplejwt.tokens import RefreshToken
+        
+        refresh = str(RefreshToken.for_user(student_user))
+        student_user.is_active = False
+        student_user.save()
+        response = api_client.post('/aau-dhms-api/auth/refresh/', {'refresh': refresh})
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_rotated_token_cannot_be_reused(self, api_client, student_user):
+        """Test a refresh token only works once."""
+        from rest_framework_simplejwt.tokens import RefreshToken
+        
+        url = '/aau-dhms-api/auth/refresh/'
+        refresh = str(RefreshToken.for_user(student_user))
+        response = api_client.post(url, {'refresh': refresh})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert api_client.post(url, {'refresh': response.data['refresh']}).status_code == status.HTTP_200_OK
+        assert api_client.post(url, {'refresh': refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_logged_out_token_cannot_refresh(self, authenticated_client, api_client, student_user):
+        """Test logout revokes the refresh token."""
+        from rest_framework_simplejwt.tokens import RefreshToken
+        
+        refresh = str(RefreshToken.for_user(student_user))
+        authenticated_client.post('/aau-dhms-api/auth/logout/', {'refresh': refresh})
+        authenticated_client.credentials()
+        response = authenticated_client.post('/aau-dhms-api/auth/refresh/', {'refresh': refresh})
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_prune_deletes_only_expired_tokens(self):
+        """Test pruning keeps tokens that could still be presented."""
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        from accounts.models import UsedRefreshToken
+        
+        now = timezone.now()
+        UsedRefreshToken.objects.bulk_create([
+            UsedRefreshToken(jti=f'expired-{n}', expires_at=now - timedelta(minutes=n + 1)) for n in range(5)
+        ] + [UsedRefreshToken(jti='live', expires_at=now + timedelta(days=1))])
+        
+        out = StringIO()
+        call_command('prune_tokens', batch_size=2, stdout=out)
+        
+        assert 'Deleted 5 expired token(s).' in out.getvalue()
+        assert list(UsedRefreshToken.objects.values_list('jti', flat=True)) == ['live']
+
+
+@pytest.mark.django_db
+class TestTokenClaims:
+    """Test role and profile claims in access tokens."""
+    
+    def login(self, api_client, username):
+        response = api_client.post('/aau-dhms-api/auth/login/', {'username': username, 'password': 'testpass123'})
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['token']}")
+        return response.data
+    
+    def test_login_token_claims(self, api_client, proctor_profile):
+        """Test login tokens carry role, profile and dorm."""
+        from rest_framework_simplejwt.tokens import AccessToken
+        
+        token = AccessToken(self.login(api_client, 'testproctor')['token'])
+        
+        assert token['role'] == 'proctor'
+        assert token['profile_id'] == proctor_profile.id
+        assert token['dorm_id'] == proctor_profile.assigned_dorm_id
+    
+    def test_claims_skip_user_and_profile_rows(self, api_client, student_profile, maintenance_request):
+        """Test a student list reads neither the user nor the student row."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        self.login(api_client, 'teststudent')
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/aau-dhms-api/students/maintenance/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['data']['requests']) == 1
+        sql = [query['sql'] for query in queries.captured_queries]
+        assert not any('FROM "users"' in statement or 'FROM "students"' in statement for statement in sql)
+    
+    def test_other_columns_load_in_one_query(self, api_client, student_profile):
+        """Test reading columns outside the claims loads the user row once."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        self.login(api_client, 'teststudent')
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/aau-dhms-api/auth/me/')
+        
+        assert response.data['user']['full_name'] == 'Test Student'
+        assert response.data['user']['email'] == 'student@test.com'
+        assert sum('FROM "users"' in query['sql'] for query in queries.captured_queries) == 1
+    
+    def test_missing_profile(self, api_client, staff_user):
+        """Test a user without a profile gets the usual 404."""
+        from accounts.models import Staff
+        
+        Staff.objects.filter(user=staff_user).delete()
+        self.login(api_client, 'teststaff')
+        response = api_client.get('/aau-dhms-api/staff/dashboard/')
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_deleted_user_rejected_on_load(self, api_client, staff_profile):
+        """Test an unexpired token of a deleted account fails once its row is read."""
+        self.login(api_client, 'teststaff')
+        staff_profile.user.delete()
+        response = api_client.get('/aau-dhms-api/staff/dashboard/')
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data['code'] == 'user_not_found'
+    
+    def test_inactive_user_rejected_on_load(self, api_client, staff_profile):
+        """Test an unexpired token of a deactivated account fails once its row is read."""
+        self.login(api_client, 'teststaff')
+        staff_profile.user.is_active = False
+        staff_profile.user.save()
+        response = api_client.get('/aau-dhms-api/staff/dashboard/')
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data['code'] == 'user_inactive'
+    
+    def test_refresh_rereads_claims(self, api_client, proctor_profile):
+        """Test a refreshed access token picks up a dorm change."""
+        from rest_framework_simplejwt.tokens import AccessToken
+        from accounts.models import Proctor
+        
+        refresh = self.login(api_client, 'testproctor')['refresh']
+        Proctor.objects.filter(pk=proctor_profile.pk).update(assigned_dorm=None)
+        response = api_client.post('/aau-dhms-api/auth/refresh/', {'refresh': refresh})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert AccessToken(response.data['access'])['dorm_id'] is None
+
+
+@pytest.mark.django_db
+class TestProfileLoading:
+    """Test the user, role profile and dorm load with one query."""
+    
+    def test_claims_user_loads_profile_and_dorm_together(self, proctor_profile, django_assert_num_queries):
+        """Test the first deferred read also fills the proctor row and dorm."""
+        from accounts.authentication import user_from_claims
+        from accounts.tokens import get_token
+        
+        user = user_from_claims(get_token(proctor_profile.user).access_token)
+        with django_assert_num_queries(1):
+            assert user.full_name == 'Test Proctor'
+        with django_assert_num_queries(0):
+            profile = user.proctor_profile
+            assert profile.is_active
+            assert profile.assigned_dorm.name == proctor_profile.assigned_dorm.name
+    
+    def test_profile_read_loads_user_too(self, staff_profile, api_client):
+        """Test the staff dashboard reads the user and staff rows in one query."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        response = api_client.post('/aau-dhms-api/auth/login/', {'username': 'teststaff', 'password': 'testpass123'})
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['token']}")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/aau-dhms-api/staff/dashboard/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['staff']['full_name'] == 'Test Staff'
+        loads = [query['sql'] for query in queries.captured_queries if 'FROM "users"' in query['sql'] or 'FROM "staff"' in query['sql']]
+        assert len(loads) == 1
+        assert 'JOIN "staff"' in loads[0]
+    
+    def test_legacy_token_loads_user_and_profile_together(self, proctor_client, proctor_profile):
+        """Test tokens without claims load the user, profile and dorm in one query."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = proctor_client.get('/aau-dhms-api/proctors/dashboard/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        sql = [query['sql'] for query in queries.captured_queries]
+        assert sum('FROM "users"' in statement for statement in sql) == 1
+        assert not any('FROM "proctors"' in statement for statement in sql)
+
+
+@pytest.mark.django_db
+class TestDirtyFieldTracking:
+    """Test user and profile saves write only changed columns."""
+    
+    def writes(self, queries):
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+    
+    def test_unchanged_save_is_skipped(self, student_user, django_assert_num_queries):
+        """Test saving an unchanged user runs no query."""
+        from accounts.models import User
+        
+        user = User.objects.select_related('student_profile').get(pk=student_user.pk)
+        with django_assert_num_queries(0):
+            user.save()
+    
+    def test_save_writes_changed_columns(self, student_user):
+        """Test only the changed column and updated_at are written."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from accounts.models import User
+        
+        user = User.objects.get(pk=student_user.pk)
+        user.full_name = 'Renamed Student'
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        
+        [update] = self.writes(queries)
+        assert '"full_name"' in update and '"updated_at"' in update
+        assert '"email"' not in update and '"password"' not in update
+        assert User.objects.get(pk=user.pk).full_name == 'Renamed Student'
+    
+    def test_profile_changes_saved_with_user(self, student_profile):
+        """Test a changed profile loaded on the user is still saved with it."""
+        from accounts.models import Student, User
+        
+        user = User.objects.select_related('student_profile').get(pk=student_profile.user_id)
+        user.email = 'moved@test.com'
+        user.student_profile.department = 'Physics'
+        user.save()
+        
+        assert Student.objects.get(pk=student_profile.pk).department == 'Physics'
+    
+    def test_login_writes_last_login_only(self, api_client, student_profile, monkeypatch):
+        """Test a login that records last_login writes one column of one row."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework_simplejwt.serializers import api_settings
+        
+        monkeypatch.setattr(api_settings, 'UPDATE_LAST_LOGIN', True)
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post('/aau-dhms-api/auth/login/', {'username': 'teststudent', 'password': 'testpass123'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        [update] = self.writes(queries)
+        assert update.startswith('UPDATE "users" SET "last_login"')
+    
+    def test_register_does_not_resave_profile(self, api_client):
+        """Test registration inserts the profile without updating it again."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as queries:
+            api_client.post('/aau-dhms-api/auth/register/', {
+                'username': 'newstudent', 'password': 'StrongPass123!', 'password_confirm': 'StrongPass123!',
+                'full_name': 'New Student', 'role': 'student',
+            })
+        
+        assert not any(write.startswith('UPDATE "students"') for write in self.writes(queries))
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    """Test the configurable hasher and the rehash on login."""
+    
+    def hashing(self, algorithm, **factors):
+        from django.conf import settings
+        from django.test import override_settings
+        from accounts.hashers import hasher_paths
+        
+        return override_settings(
+            PASSWORD_HASHERS=hasher_paths(algorithm),
+            PASSWORD_HASHING={**settings.PASSWORD_HASHING, algorithm: factors},
+        )
+    
+    def login(self, api_client, password='testpass123'):
+        return api_client.post('/aau-dhms-api/auth/login/', {'username': 'teststudent', 'password': password})
+    
+    def test_selected_hasher_hashes_new_passwords(self, student_user):
+        """Test new passwords use the selected hasher and its work factors."""
+        with self.hashing('scrypt', work_factor=1024, block_size=4, parallelism=1):
+            student_user.set_password('newpass123')
+        
+        assert student_user.password.startswith('scrypt$1024$')
+        assert student_user.check_password('newpass123')
+    
+    def test_login_rehashes_with_selected_hasher(self, api_client, student_user):
+        """Test a hash from the previous hasher is replaced on login."""
+        from accounts.models import User
+        
+        assert student_user.password.startswith('pbkdf2_sha256$')
+        with self.hashing('scrypt', work_factor=1024):
+            response = self.login(api_client)
+        
+        assert response.status_code == 200
+        assert User.objects.get(pk=student_user.pk).password.startswith('scrypt$1024$')
+    
+    def test_login_rehashes_after_work_factor_change(self, api_client, student_user):
+        """Test raising the work factor rehashes on the next successful login only."""
+        from accounts.models import User
+        
+        with self.hashing('pbkdf2_sha256', iterations=1000):
+            student_user.set_password('testpass123')
+            student_user.save()
+        
+        with self.hashing('pbkdf2_sha256', iterations=2000):
+            assert self.login(api_client, 'wrongpass').status_code == 401
+            assert User.objects.get(pk=student_user.pk).password.startswith('pbkdf2_sha256$1000$')
+            
+            assert self.login(api_client).status_code == 200
+            assert User.objects.get(pk=student_user.pk).password.startswith('pbkdf2_sha256$2000$')
+    
+    def test_rehash_writes_password_only(self, api_client, student_profile):
+        """Test the rehash is a single update of the password column."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with self.hashing('scrypt', work_factor=1024), CaptureQueriesContext(connection) as queries:
+            assert self.login(api_client).status_code == 200
+        
+        writes = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        assert len(writes) == 1
+        assert writes[0].startswith('UPDATE "users" SET "password"')
+    
+    def test_unknown_hasher_fails_check(self, settings):
+        """Test an unknown PASSWORD_HASHER is reported by the system checks."""
+        from accounts.checks import check_password_hasher
+        
+        settings.PASSWORD_HASHER = 'md5'
+        
+        [error] = check_password_hasher(None)
+        assert error.id == 'accounts.E001'
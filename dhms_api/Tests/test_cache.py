@@ -0,0 +1,205 @@
+"""
+Tests for the tiered cache and the endpoints served from it.
+"""
+import pytest
+from rest_framework import status
+
+
+def tiered(location, **options):
+    from dhms_api.cache import TieredCache
+    return TieredCache(location, {'OPTIONS': {'SHARED': 'shared', **options}})
+
+
+@pytest.mark.django_db
+class TestTieredCache:
+    """Test the in-process tier in front of the shared backend."""
+
+    def test_local_hit_skips_shared_backend(self, django_assert_num_queries):
+        """Test a value just set is read back without a database query."""
+        from django.core.cache import cache
+
+        cache.set('test:key', {'a': 1})
+        with django_assert_num_queries(0):
+            assert cache.get('test:key') == {'a': 1}
+
+    def test_other_worker_reads_shared_backend(self):
+        """Test a process without a local copy gets the value from the shared backend."""
+        from django.core.cache import cache
+
+        cache.set('test:key', 'value')
+        cache.local.clear()
+
+        assert cache.get('test:key') == 'value'
+        assert cache.get('test:missing') is None
+        assert cache.get('test:key') == 'value'
+
+    def test_local_entries_are_copies(self):
+        """Test mutating a returned value does not change the cached one."""
+        from django.core.cache import cache
+
+        cache.set('test:key', {'items': [1]})
+        cache.get('test:key')['items'].append(2)
+
+        assert cache.get('test:key') == {'items': [1]}
+
+    def test_lru_evicts_least_recently_used(self):
+        """Test the local tier keeps at most MAX_ENTRIES, dropping the oldest read."""
+        cache = tiered('test-lru', MAX_ENTRIES=2)
+        cache.set('test:a', 1)
+        cache.set('test:b', 2)
+        cache.get('test:a')
+        cache.set('test:c', 3)
+
+        assert len(cache.local) == 2
+        cache.reset_stats()
+        assert cache.get('test:a') == 1 and cache.get('test:b') == 2
+        assert cache.stats()['namespaces']['test'] == {
+            'local_hits': 1, 'shared_hits': 1, 'misses': 0, 'lookups': 2, 'hit_rate': 1.0,
+        }
+
+    def test_local_entries_expire(self, monkeypatch):
+        """Test local copies are dropped after LOCAL_TIMEOUT."""
+        import time
+
+        cache = tiered('test-ttl', LOCAL_TIMEOUT=5)
+        cache.set('test:key', 'old')
+        cache.shared.set('test:key', 'new')
+        assert cache.get('test:key') == 'old'
+
+        now = time.monotonic()
+        monkeypatch.setattr('dhms_api.cache.time.monotonic', lambda: now + 6)
+        assert cache.get('test:key') == 'new'
+
+    def test_stats_per_namespace(self):
+        """Test hits and misses are counted per tier and namespace."""
+        cache = tiered('test-stats')
+        cache.set('one:key', 1)
+        cache.get('one:key')
+        cache.local.clear()
+        cache.get('one:key')
+        cache.get('two:key')
+
+        stats = cache.stats()
+        assert stats['namespaces']['one'] == {
+            'local_hits': 1, 'shared_hits': 1, 'misses': 0, 'lookups': 2, 'hit_rate': 1.0,
+        }
+        assert stats['namespaces']['two']['misses'] == 1
+        assert stats['total']['lookups'] == 3
+        assert stats['total']['hit_rate'] == pytest.approx(2 / 3, abs=1e-4)
+
+
+@pytest.mark.django_db
+class TestNamespace:
+    """Test namespaced keys and version-based invalidation."""
+
+    def test_invalidate_drops_every_key(self):
+        """Test bumping the version hides all keys of the namespace only."""
+        from dhms_api.cache import Namespace
+
+        first, second = Namespace('first'), Namespace('second')
+        first.set('a', 1)
+        first.set('b', 2)
+        second.set('a', 3)
+
+        first.invalidate()
+
+        assert first.get('a') is None and first.get('b') is None
+        assert second.get('a') == 3
+
+    def test_invalidation_reaches_other_workers(self):
+        """Test another process sees the new version once its local copy is gone."""
+        from django.core.cache import cache
+        from dhms_api.cache import Namespace
+
+        namespace = Namespace('test')
+        namespace.set('a', 1)
+        namespace.invalidate()
+        cache.local.clear()
+
+        assert namespace.get('a') is None
+
+    def test_lost_version_does_not_revive_old_keys(self):
+        """Test a version evicted from the cache is replaced by a new one."""
+        from django.core.cache import cache
+        from dhms_api.cache import Namespace
+
+        namespace = Namespace('test')
+        namespace.set('a', 1)
+        cache.delete(namespace.version_key)
+
+        assert namespace.get('a') is None
+
+    def test_get_or_set(self):
+        """Test the default is computed once and then served from the cache."""
+        from dhms_api.cache import Namespace
+
+        calls = []
+        namespace = Namespace('test')
+        build = lambda: calls.append(1) or 'value'
+
+        assert namespace.get_or_set('a', build) == 'value'
+        assert namespace.get_or_set('a', build) == 'value'
+        assert len(calls) == 1
+
+
+@pytest.mark.django_db
+class TestDormListCache:
+    """Test /dorms/ pages are cached until a dorm or proctor changes."""
+
+    url = '/aau-dhms-api/dorms/'
+
+    def names(self, client):
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        return [dorm['name'] for dorm in response.data['data']['dorms']]
+
+    def test_dorm_save_invalidates(self, staff_client, dorm):
+        """Test renaming a dorm shows up on the next request."""
+        assert self.names(staff_client) == ['Test Dorm']
+
+        dorm.name = 'Renamed Dorm'
+        dorm.save()
+
+        assert self.names(staff_client) == ['Renamed Dorm']
+
+    def test_proctor_rename_invalidates(self, staff_client, dorm, proctor_profile):
+        """Test a proctor's new name shows up in the dorm list."""
+        dorm.proctor = proctor_profile
+        dorm.save()
+        staff_client.get(self.url)
+
+        proctor_profile.user.full_name = 'New Proctor Name'
+        proctor_profile.user.save()
+
+        response = staff_client.get(self.url)
+        assert response.data['data']['dorms'][0]['proctor_name'] == 'New Proctor Name'
+
+    def test_query_strings_cached_apart(self, staff_client, dorm):
+        """Test each page size is cached on its own."""
+        response = staff_client.get(self.url, {'page_size': 1, 'total': 'estimate'})
+
+        assert response.data['data']['pagination']['page_size'] == 1
+        assert staff_client.get(self.url).data['data']['pagination']['page_size'] == 20
+
+
+@pytest.mark.django_db
+class TestCacheStats:
+    """Test the cache statistics endpoint."""
+
+    url = '/aau-dhms-api/admin/cache/stats/'
+
+    def test_admin_sees_stats(self, admin_client):
+        """Test the serving worker's counts are returned per namespace."""
+        admin_client.get('/aau-dhms-api/auth/me/')
+        response = admin_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert 'pid' in data and 'local_entries' in data
+        assert data['namespaces']['auth.me']['lookups'] >= 1
+
+    def test_non_admin_forbidden(self, staff_client):
+        """Test other roles cannot read the statistics."""
+        response = staff_client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
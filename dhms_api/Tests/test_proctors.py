@@ -20,6 +20,60 @@ class TestProctorDashboard:
         assert 'proctor' in response.data['data']
         assert 'stats' in response.data['data']
     
+    def test_dashboard_counters(self, proctor_client, proctor_profile, room_assignment,
+                                maintenance_request, laundry_form, penalty):
+        """Test dashboard stats follow state changes incrementally."""
+        url = '/aau-dhms-api/proctors/dashboard/'
+        response = proctor_client.get(url)
+        
+        assert response.data['data']['proctor']['assigned_dorm'] == 'Test Dorm'
+        assert response.data['data']['stats'] == {
+            'pending_maintenance': 1,
+            'pending_laundry': 1,
+            'active_penalties': 1,
+        }
+        
+        proctor_client.put(f'/aau-dhms-api/proctors/maintenance/{maintenance_request.id}/approve/', {})
+        proctor_client.put(f'/aau-dhms-api/proctors/laundry/{laundry_form.id}/approve/', {})
+        
+        room_assignment.status = 'completed'
+        room_assignment.save()
+        
+        response = proctor_client.get(url)
+        assert response.data['data']['stats'] == {
+            'pending_maintenance': 0,
+            'pending_laundry': 0,
+            'active_penalties': 0,
+        }
+    
+    def test_dashboard_counters_match_rebuild(self, proctor_client, proctor_profile, room_assignment,
+                                              maintenance_request, laundry_form, penalty):
+        """Test incremental counters agree with a full rebuild."""
+        from io import StringIO
+        from django.core.management import call_command
+        from operations.models import DormCounters
+        
+        incremental = DormCounters.objects.values(
+            'pending_maintenance', 'pending_laundry', 'active_penalties'
+        ).get(pk=proctor_profile.assigned_dorm_id)
+        
+        DormCounters.objects.all().delete()
+        call_command('rebuild_counters', stdout=StringIO())
+        
+        rebuilt = DormCounters.objects.values(
+            'pending_maintenance', 'pending_laundry', 'active_penalties'
+        ).get(pk=proctor_profile.assigned_dorm_id)
+        assert incremental == rebuilt
+    
+    def test_dashboard_stats_are_a_single_lookup(self, proctor_client, proctor_profile, room_assignment,
+                                                 django_assert_num_queries):
+        """Test dashboard query count: user with proctor profile, counters row."""
+        url = '/aau-dhms-api/proctors/dashboard/'
+        with django_assert_num_queries(2):
+            response = proctor_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+    
     def test_dashboard_wrong_role(self, authenticated_client, student_profile):
         """Test dashboard with student role."""
         url = '/aau-dhms-api/proctors/dashboard/'
@@ -59,6 +113,335 @@ class TestProctorRoomAssignment:
         response = proctor_client.post(url, data)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_assign_room_full(self, proctor_client, proctor_profile, student_profile, room, room_assignment):
+        """Test a room cannot take more students than its capacity."""
+        from accounts.models import User
+        from staff.models import Room
+        url = '/aau-dhms-api/proctors/assign-room/'
+        Room.objects.filter(pk=room.pk).update(current_occupancy=1)
+        
+        for i in range(2):
+            user = User.objects.create_user(username=f'late{i}', password='testpass123', full_name='Late', role='student')
+            response = proctor_client.post(url, {
+                'student_id': user.student_profile.id,
+                'room_id': room.id,
+                'assignment_date': str(date.today()),
+            })
+            assert response.status_code == (status.HTTP_201_CREATED if i == 0 else status.HTTP_400_BAD_REQUEST)
+        
+        room.refresh_from_db()
+        assert room.current_occupancy == 2
+        assert room.status == 'occupied'
+    
+    def test_assign_room_already_assigned(self, proctor_client, proctor_profile, student_profile, dorm,
+                                          room_assignment):
+        """Test a student with an active assignment is not given a second bed."""
+        from staff.models import Room
+        other = Room.objects.create(dorm=dorm, room_number='A2', floor=1, capacity=2)
+        
+        response = proctor_client.post('/aau-dhms-api/proctors/assign-room/', {
+            'student_id': student_profile.id,
+            'room_id': other.id,
+            'assignment_date': str(date.today()),
+        })
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        other.refresh_from_db()
+        assert other.current_occupancy == 0
+
+
+@pytest.mark.django_db
+class TestProctorBulkRoomAssignment:
+    """Test bulk room assignment endpoint."""
+    
+    url = '/aau-dhms-api/proctors/assign-room/bulk/'
+    
+    def _new_students(self, count, prefix='bulk'):
+        from accounts.models import User, Student
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}{i}', password='!', full_name=f'Bulk {i}', role='student')
+            for i in range(count)
+        ])
+        return Student.objects.bulk_create([
+            Student(user=user, student_code=f'STU-{prefix.upper()}-{user.pk}', student_type='government')
+            for user in users
+        ])
+    
+    def _new_rooms(self, dorm, count, capacity=4):
+        from staff.models import Room
+        return Room.objects.bulk_create([
+            Room(dorm=dorm, room_number=f'B{i}', floor=1, capacity=capacity) for i in range(count)
+        ])
+    
+    def test_bulk_assign(self, proctor_client, proctor_profile, dorm):
+        """Test every valid row is assigned and occupancy follows."""
+        from students.models import RoomAssignment
+        students = self._new_students(8)
+        rooms = self._new_rooms(dorm, 2)
+        rows = [{'student_id': s.id, 'room_id': rooms[i % 2].id} for i, s in enumerate(students)]
+        
+        response = proctor_client.post(self.url, {'assignments': rows}, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['data']['created'] == 8
+        assert response.data['data']['failed'] == 0
+        for room in rooms:
+            room.refresh_from_db()
+            assert room.current_occupancy == 4
+            assert room.status == 'occupied'
+        assert RoomAssignment.objects.filter(status='active', assigned_by=proctor_profile.user).count() == 8
+    
+    def test_bulk_assign_reports_failures_per_row(self, proctor_client, proctor_profile, dorm, student_profile, room_assignment):
+        """Test bad rows are reported by index and the rest still go through."""
+        students = self._new_students(4)
+        room = self._new_rooms(dorm, 1, capacity=2)[0]
+        rows = [
+            {'student_id': students[0].id, 'room_id': room.id},
+            {'student_id': 99999, 'room_id': room.id},
+            {'student_id': students[1].id, 'room_id': 99999},
+            {'student_id': students[0].id, 'room_id': room.id},
+            {'student_id': student_profile.id, 'room_id': room.id},
+            {'student_id': 'abc', 'room_id': room.id},
+            {'student_id': students[2].id, 'room_id': room.id},
+            {'student_id': students[3].id, 'room_id': room.id},
+        ]
+        
+        response = proctor_client.post(self.url, {'assignments': rows}, format='json')
+        
+        data = response.data['data']
+        assert data['created'] == 2
+        assert {error['index']: error['error'] for error in data['errors']} == {
+            1: 'Student not found.',
+            2: 'Room not found.',
+            3: 'Student appears more than once in this batch.',
+            4: 'Student already has an active room assignment.',
+            5: 'student_id and room_id must be integers.',
+            7: 'Room is full.',
+        }
+        room.refresh_from_db()
+        assert room.current_occupancy == 2
+    
+    def test_bulk_assign_never_doubles_a_student(self, proctor_user, dorm, student_profile, monkeypatch):
+        """Test a student assigned by another writer mid-batch is not given a second bed."""
+        from django.db import IntegrityError
+        from staff.models import Room
+        from students import assignments
+        from students.models import RoomAssignment
+        first, second = self._new_rooms(dorm, 2)
+        claim_beds = assignments.claim_beds
+        
+        def claim_after_competitor(room_id, beds=1):
+            # Another batch assigns the same student between validation and the write.
+            if not RoomAssignment.objects.filter(student=student_profile).exists():
+                RoomAssignment.objects.create(
+                    student=student_profile, room=second, assignment_date=date.today(), assigned_by=proctor_user,
+                )
+            return claim_beds(room_id, beds)
+        
+        monkeypatch.setattr(assignments, 'claim_beds', claim_after_competitor)
+        with pytest.raises(IntegrityError):
+            assignments.bulk_assign_rooms(
+                [{'student_id': student_profile.id, 'room_id': first.id}], proctor_user, date.today()
+            )
+        
+        first.refresh_from_db()
+        assert first.current_occupancy == 0
+        assert not RoomAssignment.objects.filter(student=student_profile).exists()
+    
+    def test_bulk_assign_claims_rooms_in_key_order(self, proctor_user, dorm, monkeypatch):
+        """Test rooms are claimed in primary-key order whatever the row order."""
+        from students import assignments
+        students = self._new_students(3)
+        rooms = self._new_rooms(dorm, 3)
+        claimed = []
+        claim_beds = assignments.claim_beds
+        
+        def record_claim(room_id, beds=1):
+            claimed.append(room_id)
+            return claim_beds(room_id, beds)
+        
+        monkeypatch.setattr(assignments, 'claim_beds', record_claim)
+        
+        rows = [{'student_id': student.id, 'room_id': room.id} for student, room in zip(students, reversed(rooms))]
+        assignments.bulk_assign_rooms(rows, proctor_user, date.today())
+        
+        assert claimed == sorted(room.id for room in rooms)
+    
+    def test_bulk_assign_rejects_empty_batch(self, proctor_client, proctor_profile):
+        """Test an empty batch is a validation error."""
+        response = proctor_client.post(self.url, {'assignments': []}, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_bulk_assign_query_count(self, proctor_client, proctor_profile, dorm):
+        """Test the number of queries depends on the rooms, not the rows."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        counts = []
+        for size, prefix in ((4, 'small'), (60, 'large')):
+            students = self._new_students(size, prefix)
+            rooms = self._new_rooms(dorm, 2, capacity=size)
+            for room in rooms:
+                room.room_number = f'{prefix}-{room.pk}'
+                room.save(update_fields=['room_number'])
+            rows = [{'student_id': s.id, 'room_id': rooms[i % 2].id} for i, s in enumerate(students)]
+            with CaptureQueriesContext(connection) as queries:
+                response = proctor_client.post(self.url, {'assignments': rows}, format='json')
+            assert response.data['data']['created'] == size
+            counts.append(len(queries))
+        assert counts[0] == counts[1]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRoomAssignmentConcurrency:
+    """Stress the assignment path with many proctors at once."""
+    
+    THREADS = 12
+    ATTEMPTS_PER_THREAD = 3
+    
+    def test_concurrent_assignments_never_overbook(self, proctor_user, room):
+        """Test occupancy never exceeds capacity and no increment is lost."""
+        import threading
+        from django.db import OperationalError, connection
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from accounts.models import User, Student
+        from staff.models import Room
+        from students.models import RoomAssignment
+        from students.views import ProctorAssignRoomView
+        
+        Room.objects.filter(pk=room.pk).update(capacity=5)
+        users = User.objects.bulk_create([
+            User(username=f'rush{i}', password='!', full_name=f'Rush {i}', role='student')
+            for i in range(self.THREADS * self.ATTEMPTS_PER_THREAD)
+        ])
+        students = Student.objects.bulk_create([
+            Student(user=user, student_code=f'STU-RUSH-{user.pk}', student_type='government') for user in users
+        ])
+        # Views are called directly: the test client records request
+        # exceptions through a global signal, which is not thread-safe.
+        view = ProctorAssignRoomView.as_view()
+        factory = APIRequestFactory()
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+        
+        def worker(batch):
+            barrier.wait()
+            try:
+                for student in batch:
+                    while True:
+                        request = factory.post('/aau-dhms-api/proctors/assign-room/', {
+                            'student_id': student.id,
+                            'room_id': room.id,
+                            'assignment_date': str(date.today()),
+                        })
+                        force_authenticate(request, user=proctor_user)
+                        try:
+                            response = view(request)
+                            break
+                        except OperationalError:
+                            # SQLite allows one writer at a time; try again.
+                            continue
+                    results.append(response.status_code)
+            finally:
+                connection.close()
+        
+        step = self.ATTEMPTS_PER_THREAD
+        threads = [
+            threading.Thread(target=worker, args=(students[i * step:(i + 1) * step],))
+            for i in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        room.refresh_from_db()
+        assignments = RoomAssignment.objects.filter(room=room, status='active').count()
+        assert results.count(status.HTTP_201_CREATED) == 5
+        assert results.count(status.HTTP_400_BAD_REQUEST) == len(students) - 5
+        assert room.current_occupancy == assignments == 5
+        assert room.status == 'occupied'
+
+
+@pytest.mark.django_db
+class TestProctorRoomAllocation:
+    """Test automatic room allocation."""
+    
+    url = '/aau-dhms-api/proctors/allocate-rooms/'
+    
+    def _student(self, name, gender, student_type='government', eligible=True):
+        from accounts.models import User, Student
+        user = User.objects.create(username=name, password='!', full_name=name, role='student')
+        Student.objects.filter(user=user).update(
+            gender=gender, student_type=student_type, eligibility_status=eligible
+        )
+        return Student.objects.get(user=user)
+    
+    def _room(self, dorm, number, floor, capacity):
+        from staff.models import Room
+        return Room.objects.create(dorm=dorm, room_number=number, floor=floor, capacity=capacity)
+    
+    def test_dry_run(self, proctor_client, proctor_profile, dorm):
+        """Test the plan respects dorm type, eligibility and floors, and writes nothing."""
+        from students.models import RoomAssignment
+        ground = self._room(dorm, 'G1', 1, 1)
+        upper = self._room(dorm, 'U1', 3, 2)
+        disabled = self._student('disabled', 'male', 'disabled')
+        male = self._student('male', 'male')
+        female = self._student('female', 'female')
+        unknown = self._student('unknown', None)
+        self._student('ineligible', 'male', eligible=False)
+        
+        response = proctor_client.post(self.url, {'dry_run': True}, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert data['dry_run'] is True
+        assert {(a['student_id'], a['room_id']) for a in data['assignments']} == {
+            (disabled.id, ground.id), (male.id, upper.id),
+        }
+        assert data['unplaced'] == 2
+        assert data['unplaced_reasons'] == {'No free bed in a suitable dorm.': 2}
+        assert not RoomAssignment.objects.filter(student__in=[disabled, male, female, unknown]).exists()
+    
+    def test_allocate(self, proctor_client, proctor_profile, dorm, room, student_profile, room_assignment):
+        """Test the plan is written and students already housed are left alone."""
+        from staff.models import Room
+        from students.models import RoomAssignment
+        Room.objects.filter(pk=room.pk).update(status='maintenance')
+        upper = self._room(dorm, 'U1', 3, 2)
+        students = [self._student(f'male{i}', 'male') for i in range(3)]
+        
+        response = proctor_client.post(self.url, {}, format='json')
+        
+        data = response.data['data']
+        assert data['created'] == 2
+        assert data['planned'] == 2
+        assert data['unplaced'] == 1
+        upper.refresh_from_db()
+        assert upper.current_occupancy == 2
+        assert upper.status == 'occupied'
+        assert RoomAssignment.objects.filter(student=student_profile).count() == 1
+        assert RoomAssignment.objects.filter(student__in=students, status='active').count() == 2
+    
+    def test_plan_uses_mixed_dorms_and_accessible_floors(self, dorm):
+        """Test the fallback to mixed dorms and the accessible floor limit."""
+        from staff.models import Dorm
+        from students.allocation import NO_ACCESSIBLE_BED, plan_allocation
+        mixed = Dorm.objects.create(dorm_code='MIX', name='Mixed', type='mixed')
+        male_upper = self._room(dorm, 'U1', 4, 1)
+        mixed_upper = self._room(mixed, 'M4', 4, 2)
+        males = [self._student(f'male{i}', 'male') for i in range(2)]
+        unknown = self._student('unknown', None)
+        disabled = self._student('disabled', 'female', 'disabled')
+        
+        plan = plan_allocation()
+        
+        assert dict(plan.assignments) == {
+            males[0].id: male_upper.id, males[1].id: mixed_upper.id, unknown.id: mixed_upper.id,
+        }
+        assert plan.unplaced == {disabled.id: NO_ACCESSIBLE_BED}
 
 
 @pytest.mark.django_db
@@ -92,6 +475,141 @@ class TestProctorMaintenance:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['success'] is True
         assert response.data['data']['status'] == 'rejected'
+    
+    def test_approve_rejected_maintenance(self, proctor_client, proctor_profile, maintenance_request):
+        """Test a rejected request cannot be approved and counters stay put."""
+        from operations.counters import AVAILABLE_JOBS, get_dorm_counters, get_global_counter
+        proctor_client.put(f'/aau-dhms-api/proctors/maintenance/{maintenance_request.id}/reject/', {})
+        
+        response = proctor_client.put(f'/aau-dhms-api/proctors/maintenance/{maintenance_request.id}/approve/', {})
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+        maintenance_request.refresh_from_db()
+        assert maintenance_request.status == 'rejected'
+        assert maintenance_request.approved_by is None
+        assert get_dorm_counters(proctor_profile.assigned_dorm_id).pending_maintenance == 0
+        assert get_global_counter(AVAILABLE_JOBS) == 0
+    
+    def test_approve_unknown_maintenance(self, proctor_client, proctor_profile):
+        """Test approving a request that does not exist."""
+        response = proctor_client.put('/aau-dhms-api/proctors/maintenance/99999/approve/', {})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestProctorBulkReview:
+    """Test bulk approve/reject of the pending queues."""
+    
+    def _maintenance(self, student, room, count, status='pending_proctor'):
+        from students.models import MaintenanceRequest
+        return [
+            MaintenanceRequest.objects.create(
+                request_code=f'MNT-BULK-{status[:3]}-{i}', student=student, room=room, issue_type='other',
+                title='Bulk', description='Bulk', status=status,
+            )
+            for i in range(count)
+        ]
+    
+    def test_bulk_approve_maintenance(self, proctor_client, proctor_profile, student_profile, room, room_assignment):
+        """Test pending requests move, others are reported per id."""
+        from operations.counters import AVAILABLE_JOBS, get_dorm_counters, get_global_counter
+        pending = self._maintenance(student_profile, room, 3)
+        rejected = self._maintenance(student_profile, room, 1, status='rejected')[0]
+        ids = [pending[0].id, 99999, rejected.id, pending[1].id, pending[2].id]
+        
+        response = proctor_client.post(
+            '/aau-dhms-api/proctors/maintenance/bulk/', {'ids': ids, 'action': 'approve'}, format='json'
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert data['updated'] == 3
+        assert [(r['id'], r['success']) for r in data['results']] == [
+            (pending[0].id, True), (99999, False), (rejected.id, False), (pending[1].id, True), (pending[2].id, True),
+        ]
+        assert data['results'][1]['error'] == 'Not found'
+        assert data['results'][2]['status'] == 'rejected'
+        for request in pending:
+            request.refresh_from_db()
+            assert request.status == 'approved_by_proctor'
+            assert request.approved_by == proctor_profile.user
+        assert get_dorm_counters(proctor_profile.assigned_dorm_id).pending_maintenance == 0
+        assert get_global_counter(AVAILABLE_JOBS) == 3
+    
+    def test_bulk_review_skips_rows_moved_concurrently(self, proctor_profile, student_profile, room, room_assignment):
+        """Test rows another writer moved between the read and the UPDATE are neither returned nor counted."""
+        from unittest import mock
+        from django.db.models.query import QuerySet
+        from django.utils import timezone
+        from operations.counters import AVAILABLE_JOBS, get_dorm_counters, get_global_counter
+        from students.models import MaintenanceRequest
+        from students.workflows import apply_bulk_transition, apply_transition
+        pending = self._maintenance(student_profile, room, 3)
+        update = QuerySet.update
+        
+        def racing_update(queryset, **kwargs):
+            # The first UPDATE is the bulk one: another proctor rejects a row just before it.
+            if not racing_update.done:
+                racing_update.done = True
+                apply_transition(MaintenanceRequest, 'reject', pk=pending[0].pk)
+            return update(queryset, **kwargs)
+        racing_update.done = False
+        
+        with mock.patch.object(QuerySet, 'update', racing_update):
+            moved, current = apply_bulk_transition(
+                MaintenanceRequest, 'approve', [request.pk for request in pending],
+                {'approved_by': proctor_profile.user, 'approved_date': timezone.now()},
+            )
+        
+        assert moved == [pending[1].pk, pending[2].pk]
+        assert current == {pending[0].pk: 'rejected'}
+        assert get_dorm_counters(proctor_profile.assigned_dorm_id).pending_maintenance == 0
+        assert get_global_counter(AVAILABLE_JOBS) == 2
+    
+    def test_bulk_reject_laundry(self, proctor_client, proctor_profile, student_profile, room_assignment):
+        """Test laundry forms are rejected with the reason and counters follow."""
+        from operations.counters import get_dorm_counters
+        from students.models import LaundryForm
+        forms = [
+            LaundryForm.objects.create(
+                form_code=f'LAU-BULK-{i}', student=student_profile, item_count=1, item_list='shirt',
+            )
+            for i in range(4)
+        ]
+        assert get_dorm_counters(proctor_profile.assigned_dorm_id).pending_laundry == 4
+        
+        response = proctor_client.post('/aau-dhms-api/proctors/laundry/bulk/', {
+            'ids': [form.id for form in forms[:3]], 'action': 'reject', 'rejection_reason': 'Too late',
+        }, format='json')
+        
+        assert response.data['data']['updated'] == 3
+        assert set(LaundryForm.objects.filter(rejection_reason='Too late').values_list('status', flat=True)) == {'rejected'}
+        assert get_dorm_counters(proctor_profile.assigned_dorm_id).pending_laundry == 1
+    
+    def test_bulk_review_query_count(self, proctor_client, proctor_profile, student_profile, room):
+        """Test the number of queries does not depend on the number of ids."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from students.models import MaintenanceRequest
+        counts = []
+        for size in (2, 40):
+            requests = self._maintenance(student_profile, room, size)
+            with CaptureQueriesContext(connection) as queries:
+                proctor_client.post('/aau-dhms-api/proctors/maintenance/bulk/', {
+                    'ids': [request.id for request in requests], 'action': 'reject',
+                }, format='json')
+            counts.append(len(queries))
+            MaintenanceRequest.objects.filter(pk__in=[request.pk for request in requests]).delete()
+        assert counts[0] == counts[1]
+    
+    def test_bulk_review_invalid_action(self, proctor_client, proctor_profile):
+        """Test an unknown action is a validation error."""
+        response = proctor_client.post(
+            '/aau-dhms-api/proctors/laundry/bulk/', {'ids': [1], 'action': 'delete'}, format='json'
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 @pytest.mark.django_db
@@ -162,3 +680,88 @@ class TestProctorStudents:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['success'] is True
         assert 'students' in response.data['data']
+    
+    def _add_residents(self, room, assigned_by, count, penalties_each=0):
+        """Assign ``count`` extra students to ``room``, each with some penalties."""
+        from accounts.models import User
+        from students.models import RoomAssignment, Penalty
+        
+        for i in range(count):
+            user = User.objects.create_user(
+                username=f'resident{i}', password='testpass123', full_name=f'Resident {i}', role='student'
+            )
+            RoomAssignment.objects.create(
+                student=user.student_profile, room=room, assignment_date=date.today(), status='active',
+                assigned_by=assigned_by,
+            )
+            for j in range(penalties_each):
+                Penalty.objects.create(
+                    penalty_code=f'PEN-RES-{i}-{j}', student=user.student_profile, violation_type='noise',
+                    description='Noise', duration_days=1, start_date=date.today(),
+                    end_date=date.today() + timedelta(days=1), status='active' if j == 0 else 'completed', assigned_by=assigned_by,
+                )
+    
+    def test_list_students_penalty_counts(self, proctor_client, proctor_profile, room_assignment, penalty):
+        """Test penalty stats are annotated and details are opt-in."""
+        url = '/aau-dhms-api/proctors/students/'
+        response = proctor_client.get(url)
+        
+        student = response.data['data']['students'][0]
+        assert student['penalties_count'] == 1
+        assert student['active_penalties_count'] == 1
+        assert 'penalties' not in student
+        
+        response = proctor_client.get(url, {'include': 'penalties'})
+        
+        student = response.data['data']['students'][0]
+        assert [p['penalty_code'] for p in student['penalties']] == ['PEN-TEST-001']
+    
+    def test_list_students_query_count_is_bounded(self, proctor_client, proctor_profile, room,
+                                                  room_assignment, penalty, django_assert_num_queries):
+        """Test the number of queries does not grow with students or penalties."""
+        url = '/aau-dhms-api/proctors/students/'
+        
+        with django_assert_num_queries(3):
+            proctor_client.get(url, {'include': 'penalties'})
+        
+        room.capacity = 10
+        room.save()
+        self._add_residents(room, proctor_profile.user, 5, penalties_each=2)
+        
+        with django_assert_num_queries(3):
+            response = proctor_client.get(url, {'include': 'penalties'})
+        
+        students = response.data['data']['students']
+        assert len(students) == 6
+        assert all(s['penalties_count'] == len(s['penalties']) for s in students)
+        assert sorted(s['active_penalties_count'] for s in students) == [1] * 6
+    
+    def test_list_students_cursor_pagination(self, proctor_client, proctor_profile, room, room_assignment):
+        """Test walking the student list page by page."""
+        url = '/aau-dhms-api/proctors/students/'
+        self._add_residents(room, proctor_profile.user, 4)
+        
+        seen = []
+        params = {'page_size': 2}
+        while True:
+            response = proctor_client.get(url, params)
+            data = response.data['data']
+            assert len(data['students']) <= 2
+            seen.extend(s['id'] for s in data['students'])
+            if not data['pagination']['next']:
+                break
+            params['cursor'] = data['pagination']['next']
+        
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+        
+        response = proctor_client.get(url, {'page_size': 2, 'cursor': params['cursor']})
+        previous = proctor_client.get(url, {'page_size': 2, 'cursor': response.data['data']['pagination']['previous']})
+        assert [s['id'] for s in previous.data['data']['students']] == seen[2:4]
+    
+    def test_list_students_invalid_cursor(self, proctor_client, proctor_profile, room_assignment):
+        """Test a garbled cursor is rejected."""
+        url = '/aau-dhms-api/proctors/students/'
+        response = proctor_client.get(url, {'cursor': 'not-a-cursor'})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,373 @@
+"""
+Query budgets for every API endpoint.
+
+Each endpoint is exercised against a small and a large data set. The number
+of queries must be the same at both sizes (no per-row queries) and must not
+exceed the endpoint's declared budget. On failure the captured SQL of both
+runs is printed.
+"""
+import itertools
+from collections import namedtuple
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User, Student
+from operations.counters import rebuild_dorm_counters, rebuild_global_counters
+from staff.models import Dorm, Room
+from students.models import RoomAssignment, MaintenanceRequest, LaundryForm, Penalty
+
+
+SMALL, LARGE = 10, 1_000
+
+_unique = itertools.count()
+
+MAINTENANCE_STATUSES = [choice for choice, _ in MaintenanceRequest.RequestStatus.choices]
+LAUNDRY_STATUSES = [choice for choice, _ in LaundryForm.FormStatus.choices]
+PENALTY_STATUSES = [choice for choice, _ in Penalty.PenaltyStatus.choices]
+
+
+# ==================== DATA ====================
+
+def seed(world, start, stop):
+    """Bulk-insert rows ``start..stop`` of every table the endpoints read."""
+    indexes = range(start, stop)
+
+    Dorm.objects.bulk_create([
+        Dorm(dorm_code=f'DORM-SEED-{i}', name=f'Seed Dorm {i}', type='mixed', status='active')
+        for i in indexes
+    ])
+    rooms = Room.objects.bulk_create([
+        Room(dorm=world['dorm'], room_number=f'S{i}', floor=i % 5, capacity=2, status='available')
+        for i in indexes
+    ])
+    users = User.objects.bulk_create([
+        User(username=f'seed{i}', full_name=f'Seed Student {i}', role='student', password='!')
+        for i in indexes
+    ])
+    students = Student.objects.bulk_create([
+        Student(user=user, student_code=f'STU-SEED-{i}', student_type='government')
+        for i, user in zip(indexes, users)
+    ])
+    RoomAssignment.objects.bulk_create([
+        RoomAssignment(
+            student=student, room=room, assignment_date=date.today(),
+            status='active', assigned_by=world['proctor'].user,
+        )
+        for student, room in zip(students, rooms)
+    ])
+
+    # Half of the request rows belong to the fixture student so that the
+    # student's own lists grow too.
+    owners = [world['student'] if i % 2 else student for i, student in zip(indexes, students)]
+
+    MaintenanceRequest.objects.bulk_create([
+        MaintenanceRequest(
+            request_code=f'MNT-SEED-{i}', student=owner, room=room, issue_type='other',
+            title='Seed', description='Seed', status=MAINTENANCE_STATUSES[i % len(MAINTENANCE_STATUSES)],
+            assigned_to=world['staff'] if i % 3 == 0 else None,
+        )
+        for i, owner, room in zip(indexes, owners, rooms)
+    ])
+    LaundryForm.objects.bulk_create([
+        LaundryForm(
+            form_code=f'LAU-SEED-{i}', student=owner, item_count=1, item_list='shirt',
+            status=LAUNDRY_STATUSES[i % len(LAUNDRY_STATUSES)],
+        )
+        for i, owner in zip(indexes, owners)
+    ])
+    Penalty.objects.bulk_create([
+        Penalty(
+            penalty_code=f'PEN-SEED-{i}', student=owner, violation_type='noise', description='Seed',
+            duration_days=1, start_date=date.today(), end_date=date.today() + timedelta(days=1),
+            status=PENALTY_STATUSES[i % len(PENALTY_STATUSES)], assigned_by=world['proctor'].user,
+        )
+        for i, owner in zip(indexes, owners)
+    ])
+
+    # bulk_create bypasses the counter signals.
+    rebuild_dorm_counters()
+    rebuild_global_counters()
+
+
+def new_student():
+    n = next(_unique)
+    user = User.objects.create_user(
+        username=f'budget{n}', password='testpass123', full_name=f'Budget Student {n}', role='student'
+    )
+    return user.student_profile
+
+
+def new_room(world):
+    return Room.objects.create(
+        dorm=world['dorm'], room_number=f'B{next(_unique)}', capacity=2, status='available'
+    )
+
+
+def new_maintenance(world, status, **extra):
+    return MaintenanceRequest.objects.create(
+        request_code=f'MNT-BUDGET-{next(_unique)}', student=world['student'], room=world['room'],
+        issue_type='other', title='Budget', description='Budget', status=status, **extra
+    )
+
+
+def unassigned_student(world):
+    """A male student without a room, for the allocation to place in the proctor's dorm."""
+    student = new_student()
+    student.gender = 'male'
+    student.save()
+    return {}
+
+
+def registrar_export(world):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    rows = ''.join(f'import{next(_unique)},Imported Student\n' for _ in range(3))
+    return {'file': SimpleUploadedFile('intake.csv', f'username,full_name\n{rows}'.encode())}
+
+
+def new_laundry(world, status):
+    return LaundryForm.objects.create(
+        form_code=f'LAU-BUDGET-{next(_unique)}', student=world['student'],
+        item_count=1, item_list='shirt', status=status,
+    )
+
+
+# ==================== ENDPOINTS ====================
+
+Endpoint = namedtuple('Endpoint', 'client method url budget data format', defaults=(None, 'json'))
+
+
+def fixed(value):
+    return lambda world: value
+
+
+ENDPOINTS = {
+    # accounts
+    'auth-login': Endpoint(
+        'api_client', 'post', fixed('/aau-dhms-api/auth/login/'), 2,
+        fixed({'username': 'teststudent', 'password': 'testpass123'}),
+    ),
+    'auth-register': Endpoint(
+        'api_client', 'post', fixed('/aau-dhms-api/auth/register/'), 4,
+        lambda world: {
+            'username': f'register{next(_unique)}', 'password': 'StrongPass123!',
+            'password_confirm': 'StrongPass123!', 'full_name': 'New User', 'role': 'student',
+        },
+    ),
+    'auth-logout': Endpoint(
+        'authenticated_client', 'post', fixed('/aau-dhms-api/auth/logout/'), 4,
+        lambda world: {'refresh': str(RefreshToken.for_user(world['student'].user))},
+    ),
+    'auth-refresh': Endpoint(
+        'api_client', 'post', fixed('/aau-dhms-api/auth/refresh/'), 4,
+        lambda world: {'refresh': str(RefreshToken.for_user(world['student'].user))},
+    ),
+    'auth-me': Endpoint('authenticated_client', 'get', fixed('/aau-dhms-api/auth/me/'), 1),
+    'admin-student-import': Endpoint(
+        'admin_client', 'post', fixed('/aau-dhms-api/admin/students/import/'), 10, registrar_export, 'multipart',
+    ),
+    'admin-cache-stats': Endpoint('admin_client', 'get', fixed('/aau-dhms-api/admin/cache/stats/'), 1),
+
+    # students
+    'student-dashboard': Endpoint('authenticated_client', 'get', fixed('/aau-dhms-api/students/dashboard/'), 2),
+    'student-room': Endpoint('authenticated_client', 'get', fixed('/aau-dhms-api/students/room/'), 3),
+    'student-maintenance-list': Endpoint(
+        'authenticated_client', 'get', fixed('/aau-dhms-api/students/maintenance/'), 2,
+    ),
+    'student-maintenance-create': Endpoint(
+        'authenticated_client', 'post', fixed('/aau-dhms-api/students/maintenance/'), 4,
+        lambda world: {
+            'room_id': world['room'].id, 'issue_type': 'plumbing', 'title': 'Leak',
+            'description': 'Sink leaks', 'urgency': 'low',
+        },
+    ),
+    'student-laundry-list': Endpoint('authenticated_client', 'get', fixed('/aau-dhms-api/students/laundry/'), 2),
+    'student-laundry-create': Endpoint(
+        'authenticated_client', 'post', fixed('/aau-dhms-api/students/laundry/'), 3,
+        fixed({'item_count': 2, 'item_list': 'shirt, pants'}),
+    ),
+    'student-penalties': Endpoint('authenticated_client', 'get', fixed('/aau-dhms-api/students/penalties/'), 2),
+
+    # proctors
+    'proctor-dashboard': Endpoint('proctor_client', 'get', fixed('/aau-dhms-api/proctors/dashboard/'), 2),
+    'proctor-assign-room': Endpoint(
+        'proctor_client', 'post', fixed('/aau-dhms-api/proctors/assign-room/'), 8,
+        lambda world: {
+            'student_id': new_student().id, 'room_id': new_room(world).id,
+            'assignment_date': str(date.today()),
+        },
+    ),
+    'proctor-assign-room-bulk': Endpoint(
+        'proctor_client', 'post', fixed('/aau-dhms-api/proctors/assign-room/bulk/'), 11,
+        lambda world: {
+            'assignments': [
+                {'student_id': new_student().id, 'room_id': room.id}
+                for room in (new_room(world), new_room(world)) for _ in range(2)
+            ],
+        },
+    ),
+    'proctor-allocate-rooms': Endpoint(
+        'proctor_client', 'post', fixed('/aau-dhms-api/proctors/allocate-rooms/'), 12, unassigned_student,
+    ),
+    'proctor-maintenance-pending': Endpoint(
+        'proctor_client', 'get', fixed('/aau-dhms-api/proctors/maintenance/pending/'), 2,
+    ),
+    'proctor-maintenance-approve': Endpoint(
+        'proctor_client', 'put',
+        lambda world: f"/aau-dhms-api/proctors/maintenance/{new_maintenance(world, 'pending_proctor').pk}/approve/", 6,
+    ),
+    'proctor-maintenance-reject': Endpoint(
+        'proctor_client', 'put',
+        lambda world: f"/aau-dhms-api/proctors/maintenance/{new_maintenance(world, 'pending_proctor').pk}/reject/", 5,
+        fixed({'rejection_reason': 'Duplicate'}),
+    ),
+    'proctor-maintenance-bulk': Endpoint(
+        'proctor_client', 'post', fixed('/aau-dhms-api/proctors/maintenance/bulk/'), 8,
+        lambda world: {
+            'ids': [new_maintenance(world, 'pending_proctor').pk for _ in range(3)], 'action': 'approve',
+        },
+    ),
+    'proctor-laundry-bulk': Endpoint(
+        'proctor_client', 'post', fixed('/aau-dhms-api/proctors/laundry/bulk/'), 7,
+        lambda world: {
+            'ids': [new_laundry(world, 'pending_proctor').pk for _ in range(3)], 'action': 'reject',
+        },
+    ),
+    'proctor-laundry-pending': Endpoint('proctor_client', 'get', fixed('/aau-dhms-api/proctors/laundry/pending/'), 2),
+    'proctor-laundry-approve': Endpoint(
+        'proctor_client', 'put',
+        lambda world: f"/aau-dhms-api/proctors/laundry/{new_laundry(world, 'pending_proctor').pk}/approve/", 5,
+    ),
+    'proctor-laundry-reject': Endpoint(
+        'proctor_client', 'put',
+        lambda world: f"/aau-dhms-api/proctors/laundry/{new_laundry(world, 'pending_proctor').pk}/reject/", 5,
+        fixed({'rejection_reason': 'Too many items'}),
+    ),
+    'proctor-penalty-create': Endpoint(
+        'proctor_client', 'post', fixed('/aau-dhms-api/proctors/penalties/'), 5,
+        lambda world: {
+            'student_id': world['student'].id, 'violation_type': 'noise', 'description': 'Loud music',
+            'duration_days': 3, 'start_date': str(date.today()), 'consequences': 'Warning',
+        },
+    ),
+    'proctor-students': Endpoint(
+        'proctor_client', 'get', fixed('/aau-dhms-api/proctors/students/?include=penalties'), 3,
+    ),
+
+    # staff
+    'staff-dashboard': Endpoint('staff_client', 'get', fixed('/aau-dhms-api/staff/dashboard/'), 3),
+    'staff-maintenance-list': Endpoint('staff_client', 'get', fixed('/aau-dhms-api/staff/maintenance/'), 2),
+    'staff-my-jobs': Endpoint('staff_client', 'get', fixed('/aau-dhms-api/staff/maintenance/my-jobs/'), 2),
+    'staff-accept': Endpoint(
+        'staff_client', 'put',
+        lambda world: f"/aau-dhms-api/staff/maintenance/{new_maintenance(world, 'approved_by_proctor').pk}/accept/", 5,
+    ),
+    'staff-claim-next': Endpoint(
+        'staff_client', 'post',
+        lambda world: new_maintenance(world, 'approved_by_proctor', urgency='high') and '/aau-dhms-api/staff/maintenance/claim-next/',
+        9,
+    ),
+    'staff-start': Endpoint(
+        'staff_client', 'put',
+        lambda world: (
+            f"/aau-dhms-api/staff/maintenance/"
+            f"{new_maintenance(world, 'assigned_to_staff', assigned_to=world['staff']).pk}/start/"
+        ), 4,
+    ),
+    'staff-complete': Endpoint(
+        'staff_client', 'put',
+        lambda world: (
+            f"/aau-dhms-api/staff/maintenance/"
+            f"{new_maintenance(world, 'in_progress', assigned_to=world['staff']).pk}/complete/"
+        ), 4,
+    ),
+    'dorm-list': Endpoint('staff_client', 'get', fixed('/aau-dhms-api/dorms/'), 2),
+    'dorm-rooms': Endpoint('staff_client', 'get', lambda world: f"/aau-dhms-api/dorms/{world['dorm'].pk}/rooms/", 3),
+    'rooms-available': Endpoint('staff_client', 'get', fixed('/aau-dhms-api/rooms/available/'), 2),
+
+    # security
+    'security-dashboard': Endpoint('security_client', 'get', fixed('/aau-dhms-api/security/dashboard/'), 5),
+    'security-laundry-pending': Endpoint(
+        'security_client', 'get', fixed('/aau-dhms-api/security/laundry/pending/'), 2,
+    ),
+    'security-verify': Endpoint(
+        'security_client', 'put',
+        lambda world: f"/aau-dhms-api/security/laundry/{new_laundry(world, 'approved_by_proctor').pk}/verify/", 5,
+    ),
+    'security-taken-out': Endpoint(
+        'security_client', 'put',
+        lambda world: f"/aau-dhms-api/security/laundry/{new_laundry(world, 'verified_by_security').pk}/taken-out/", 5,
+    ),
+    'security-scan': Endpoint(
+        'security_client', 'post', fixed('/aau-dhms-api/security/laundry/scan/'), 6,
+        lambda world: {'qr_code': new_laundry(world, 'verified_by_security').form_code},
+    ),
+    'security-scan-batch': Endpoint(
+        'security_client', 'post', fixed('/aau-dhms-api/security/laundry/scan/batch/'), 17,
+        lambda world: {'scans': [
+            {'form_code': new_laundry(world, status).form_code, 'scanned_at': '2026-01-05T10:00:00Z'}
+            for status in ('verified_by_security', 'verified_by_security', 'approved_by_proctor')
+        ]},
+    ),
+    'public-laundry-taken': Endpoint(
+        'security_client', 'get',
+        lambda world: f"/aau-dhms-api/public/laundry/{new_laundry(world, 'verified_by_security').form_code}/taken/", 6,
+    ),
+    'public-laundry-status': Endpoint(
+        'api_client', 'get', fixed('/aau-dhms-api/public/laundry/LAU-TEST-001/status/'), 1,
+    ),
+}
+
+
+def measure(client, endpoint, world):
+    """Issue one request, returning the captured queries."""
+    url = endpoint.url(world)
+    data = endpoint.data(world) if endpoint.data else None
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, endpoint.method)(url, data, format=endpoint.format)
+    assert response.status_code < 400, response.data
+    return queries.captured_queries
+
+
+def format_queries(label, queries):
+    lines = [f'{label}: {len(queries)} queries']
+    lines += [f"  {i}. {query['sql']}" for i, query in enumerate(queries, 1)]
+    return '\n'.join(lines)
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """Query counts must not depend on table sizes."""
+
+    @pytest.fixture
+    def world(self, student_profile, proctor_profile, staff_profile, security_profile, dorm, room,
+              room_assignment, laundry_form):
+        return {
+            'student': student_profile,
+            'proctor': proctor_profile,
+            'staff': staff_profile,
+            'security': security_profile,
+            'dorm': dorm,
+            'room': room,
+        }
+
+    @pytest.mark.parametrize('name', ENDPOINTS)
+    def test_query_budget(self, request, name, world):
+        endpoint = ENDPOINTS[name]
+        client = request.getfixturevalue(endpoint.client)
+
+        # Warm up once so first-use writes (e.g. the day's gate rollup row)
+        # are not mistaken for per-row queries.
+        measure(client, endpoint, world)
+        
+        seed(world, 0, SMALL)
+        small = measure(client, endpoint, world)
+        seed(world, SMALL, LARGE)
+        large = measure(client, endpoint, world)
+
+        report = '\n'.join([format_queries(f'{SMALL} rows', small), format_queries(f'{LARGE} rows', large)])
+        assert len(small) == len(large), f'{name}: query count grows with data\n{report}'
+        assert len(large) <= endpoint.budget, f'{name}: over budget of {endpoint.budget}\n{report}'
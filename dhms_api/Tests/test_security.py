@@ -19,6 +19,54 @@ class TestSecurityDashboard:
         assert 'security' in response.data['data']
         assert 'stats' in response.data['data']
     
+    def test_dashboard_daily_stats(self, security_client, security_profile, approved_laundry_form,
+                                   verified_laundry_form):
+        """Test today's stats and the gate rollup follow verify and taken-out."""
+        security_client.put(f'/aau-dhms-api/security/laundry/{approved_laundry_form.id}/verify/', {})
+        security_client.put(f'/aau-dhms-api/security/laundry/{verified_laundry_form.id}/taken-out/', {})
+        
+        url = '/aau-dhms-api/security/dashboard/'
+        response = security_client.get(url)
+        
+        assert response.data['data']['stats']['verified_today'] == 1
+        assert response.data['data']['stats']['taken_out_today'] == 1
+        
+        # The rollup counts events: both forms were verified today, one is now out
+        gate = response.data['data']['gate']
+        assert gate['post'] == 'Main Gate'
+        assert gate['verified'] == 2
+        assert gate['taken_out'] == 1
+    
+    def test_taken_out_before_local_midnight(self, security_profile, verified_laundry_form):
+        """Test local-day bounds use TIME_ZONE rather than UTC dates."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from operations.rollups import local_day_bounds, local_day_filter
+        from students.models import LaundryForm
+        
+        start, end = local_day_bounds()
+        assert end - start == timedelta(days=1)
+        assert timezone.localtime(start).hour == 0
+        
+        # 23:30 local yesterday is still "today" in UTC for the first hours of the day
+        LaundryForm.objects.filter(pk=verified_laundry_form.pk).update(
+            status='taken_out', taken_out_at=start - timedelta(minutes=30)
+        )
+        assert not LaundryForm.objects.filter(
+            status='taken_out', **local_day_filter('taken_out_at')
+        ).exists()
+    
+    def test_gate_rollup_matches_rebuild(self, security_client, security_profile, verified_laundry_form):
+        """Test incremental gate rollups agree with a rebuild."""
+        from operations.models import GateDailyStats
+        from operations.rollups import rebuild_gate_stats
+        
+        security_client.post('/aau-dhms-api/security/laundry/scan/', {'qr_code': verified_laundry_form.form_code})
+        incremental = list(GateDailyStats.objects.values_list('day', 'post', 'verified', 'taken_out'))
+        
+        rebuild_gate_stats()
+        assert list(GateDailyStats.objects.values_list('day', 'post', 'verified', 'taken_out')) == incremental
+    
     def test_dashboard_wrong_role(self, authenticated_client, student_profile):
         """Test dashboard with student role."""
         url = '/aau-dhms-api/security/dashboard/'
@@ -90,6 +138,162 @@ class TestSecurityLaundry:
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'already taken out' in response.data['error']
+    
+    def test_public_link_verifies_and_releases_in_one_transition(self, security_client, security_profile,
+                                                                   approved_laundry_form):
+        """Test an approved bag is verified and taken out by a single transition."""
+        from django.utils import timezone
+        from operations.rollups import get_gate_stats
+        from students.models import LaundryForm
+        from students.workflows import transition_applied
+        
+        sent = []
+        handler = lambda sender, transition, **kwargs: sent.append(transition)
+        transition_applied.connect(handler)
+        try:
+            response = security_client.get(f'/aau-dhms-api/public/laundry/{approved_laundry_form.form_code}/taken/')
+        finally:
+            transition_applied.disconnect(handler)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [transition.sources for transition in sent] == [('approved_by_proctor',)]
+        form = LaundryForm.objects.get(pk=approved_laundry_form.pk)
+        assert form.status == 'taken_out'
+        assert form.verified_by_id == form.taken_out_by_id == security_profile.id
+        gate = get_gate_stats(security_profile.assigned_post, timezone.localdate())
+        assert (gate.verified, gate.taken_out) == (1, 1)
+
+
+@pytest.mark.django_db
+class TestSecurityLaundryScanBatch:
+    """Test uploading queued gate scans."""
+    
+    url = '/aau-dhms-api/security/laundry/scan/batch/'
+    
+    def test_scan_batch(self, security_client, security_profile, laundry_form, approved_laundry_form,
+                        verified_laundry_form):
+        """Test each code gets its own result and released bags keep their scan time."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from operations.rollups import get_gate_stats
+        from students.models import LaundryForm
+        
+        scanned_at = timezone.now() - timedelta(minutes=30)
+        scans = [
+            {'form_code': code, 'scanned_at': scanned_at.isoformat()}
+            for code in (verified_laundry_form.form_code, approved_laundry_form.form_code,
+                         laundry_form.form_code, 'INVALID-CODE')
+        ]
+        response = security_client.post(self.url, {'scans': scans}, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert data['processed'] == 2
+        assert data['failed'] == 2
+        results = data['results']
+        assert results[verified_laundry_form.form_code]['outcome'] == 'taken_out'
+        assert results[approved_laundry_form.form_code]['outcome'] == 'taken_out'
+        assert results[laundry_form.form_code]['status'] == 'pending_proctor'
+        assert results['INVALID-CODE']['error'] == 'Invalid QR code'
+        
+        form = LaundryForm.objects.get(pk=approved_laundry_form.pk)
+        assert form.status == 'taken_out'
+        assert form.taken_out_at == scanned_at
+        assert form.verified_by_id == security_profile.id
+        
+        # The verified fixture was counted when created; the approved form is verified at the gate
+        gate = get_gate_stats(security_profile.assigned_post, timezone.localdate(scanned_at))
+        assert gate.verified == 2
+        assert gate.taken_out == 2
+    
+    def test_replay_is_idempotent(self, security_client, security_profile, verified_laundry_form):
+        """Test resending a batch reports replayed scans and counts nothing twice."""
+        from django.utils import timezone
+        from operations.rollups import get_gate_stats
+        
+        scans = [{'form_code': verified_laundry_form.form_code, 'scanned_at': timezone.now().isoformat()}]
+        security_client.post(self.url, {'scans': scans}, format='json')
+        response = security_client.post(self.url, {'scans': scans}, format='json')
+        
+        result = response.data['data']['results'][verified_laundry_form.form_code]
+        assert result['success'] is True
+        assert result['outcome'] == 'replayed'
+        assert get_gate_stats(security_profile.assigned_post).taken_out == 1
+    
+    def test_later_scan_of_released_bag(self, security_client, security_profile, verified_laundry_form):
+        """Test a second, different scan of a released bag is rejected."""
+        from datetime import timedelta
+        from django.utils import timezone
+        code = verified_laundry_form.form_code
+        earlier = timezone.now() - timedelta(minutes=5)
+        response = security_client.post(self.url, {'scans': [
+            {'form_code': code, 'scanned_at': timezone.now().isoformat()},
+            {'form_code': code, 'scanned_at': earlier.isoformat()},
+        ]}, format='json')
+        assert response.data['data']['processed'] == 1
+        
+        response = security_client.post(self.url, {'scans': [
+            {'form_code': code, 'scanned_at': timezone.now().isoformat()},
+        ]}, format='json')
+        
+        result = response.data['data']['results'][code]
+        assert result['success'] is False
+        assert result['error'] == 'Laundry already taken out'
+    
+    def test_unknown_security(self, security_client, security_profile, verified_laundry_form):
+        """Test scans attributed to an unknown guard are rejected."""
+        from django.utils import timezone
+        response = security_client.post(self.url, {'scans': [{
+            'form_code': verified_laundry_form.form_code,
+            'scanned_at': timezone.now().isoformat(),
+            'security_id': 999999,
+        }]}, format='json')
+        
+        result = response.data['data']['results'][verified_laundry_form.form_code]
+        assert result['error'] == 'Security profile not found'
+        assert result['status'] == 'verified_by_security'
+    
+    def test_rollups_follow_each_scan(self, security_client, security_profile, approved_laundry_form,
+                                      verified_laundry_form):
+        """Test a batch spanning two days is rolled up on the day of each scan."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from operations.rollups import get_gate_stats
+        
+        now = timezone.now()
+        yesterday = now - timedelta(days=1)
+        response = security_client.post(self.url, {'scans': [
+            {'form_code': verified_laundry_form.form_code, 'scanned_at': yesterday.isoformat()},
+            {'form_code': approved_laundry_form.form_code, 'scanned_at': now.isoformat()},
+        ]}, format='json')
+        assert response.data['data']['processed'] == 2
+        
+        post = security_profile.assigned_post
+        earlier = get_gate_stats(post, timezone.localdate(yesterday))
+        assert (earlier.verified, earlier.taken_out) == (0, 1)
+        # The verified fixture was counted when created
+        today = get_gate_stats(post, timezone.localdate(now))
+        assert (today.verified, today.taken_out) == (2, 1)
+    
+    def test_future_scan_rejected(self, security_client, security_profile, verified_laundry_form):
+        """Test a scan time ahead of the server clock is rejected."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from students.models import LaundryForm
+        
+        response = security_client.post(self.url, {'scans': [{
+            'form_code': verified_laundry_form.form_code,
+            'scanned_at': (timezone.now() + timedelta(hours=1)).isoformat(),
+        }]}, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert LaundryForm.objects.get(pk=verified_laundry_form.pk).status == 'verified_by_security'
+    
+    def test_empty_batch(self, security_client, security_profile):
+        """Test an empty upload is rejected."""
+        response = security_client.post(self.url, {'scans': []}, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 @pytest.mark.django_db
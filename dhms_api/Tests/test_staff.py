@@ -19,6 +19,32 @@ class TestStaffDashboard:
         assert 'staff' in response.data['data']
         assert 'stats' in response.data['data']
     
+    def test_dashboard_stats(self, staff_client, staff_profile, approved_maintenance_request,
+                             django_assert_num_queries):
+        """Test staff dashboard stats come from one grouped query and the jobs counter."""
+        url = '/aau-dhms-api/staff/dashboard/'
+        response = staff_client.get(url)
+        
+        assert response.data['data']['stats'] == {
+            'pending_jobs': 0,
+            'in_progress_jobs': 0,
+            'completed_jobs': 0,
+            'available_jobs': 1,
+        }
+        
+        staff_client.put(f'/aau-dhms-api/staff/maintenance/{approved_maintenance_request.id}/accept/', {})
+        
+        # User with staff profile, grouped status counts, available jobs counter
+        with django_assert_num_queries(3):
+            response = staff_client.get(url)
+        
+        assert response.data['data']['stats'] == {
+            'pending_jobs': 1,
+            'in_progress_jobs': 0,
+            'completed_jobs': 0,
+            'available_jobs': 0,
+        }
+    
     def test_dashboard_wrong_role(self, authenticated_client, student_profile):
         """Test dashboard with student role."""
         url = '/aau-dhms-api/staff/dashboard/'
@@ -41,6 +67,28 @@ class TestStaffMaintenance:
         assert 'jobs' in response.data['data']
         assert len(response.data['data']['jobs']) == 1
     
+    def test_list_available_jobs_query_count(self, staff_client, staff_profile, approved_maintenance_request,
+                                             django_assert_num_queries):
+        """Test job rows are loaded with their student, room and dorm in one query."""
+        from students.models import MaintenanceRequest
+        url = '/aau-dhms-api/staff/maintenance/'
+        
+        for i in range(5):
+            MaintenanceRequest.objects.create(
+                request_code=f'MNT-EXTRA-{i}', student=approved_maintenance_request.student,
+                room=approved_maintenance_request.room, issue_type='other', title='Extra',
+                description='Extra job', status='approved_by_proctor',
+            )
+        
+        # Authenticated user, then the job list.
+        with django_assert_num_queries(2):
+            response = staff_client.get(url)
+        
+        job = response.data['data']['jobs'][0]
+        assert job['student_name'] == 'Test Student'
+        assert job['dorm_name'] == 'Test Dorm'
+        assert len(response.data['data']['jobs']) == 6
+    
     def test_list_my_jobs(self, staff_client, staff_profile):
         """Test listing assigned jobs."""
         url = '/aau-dhms-api/staff/maintenance/my-jobs/'
@@ -50,6 +98,35 @@ class TestStaffMaintenance:
         assert response.data['success'] is True
         assert 'jobs' in response.data['data']
     
+    def test_list_my_jobs_pages_over_missing_dates(self, staff_client, staff_profile, approved_maintenance_request):
+        """Test jobs without an assigned_date come first and no job is skipped."""
+        from django.utils import timezone
+        from students.models import MaintenanceRequest
+        url = '/aau-dhms-api/staff/maintenance/my-jobs/'
+        
+        jobs = MaintenanceRequest.objects.bulk_create([
+            MaintenanceRequest(
+                request_code=f'MNT-MINE-{i}', student=approved_maintenance_request.student,
+                room=approved_maintenance_request.room, issue_type='other', title='Mine',
+                description='Mine', urgency='medium', status='assigned_to_staff', assigned_to=staff_profile,
+                assigned_date=timezone.now() if i % 2 else None,
+            )
+            for i in range(5)
+        ])
+        
+        seen = []
+        params = {'page_size': 2}
+        while True:
+            data = staff_client.get(url, params).data['data']
+            seen.extend(job['id'] for job in data['jobs'])
+            if not data['pagination']['next']:
+                break
+            params['cursor'] = data['pagination']['next']
+        
+        undated = sorted((job.id for job in jobs if job.assigned_date is None), reverse=True)
+        assert sorted(seen) == sorted(job.id for job in jobs)
+        assert seen[:len(undated)] == undated
+    
     def test_accept_job(self, staff_client, staff_profile, approved_maintenance_request):
         """Test accepting a maintenance job."""
         url = f'/aau-dhms-api/staff/maintenance/{approved_maintenance_request.id}/accept/'
@@ -59,6 +136,42 @@ class TestStaffMaintenance:
         assert response.data['success'] is True
         assert response.data['data']['status'] == 'assigned_to_staff'
     
+    def test_accept_job_already_claimed(self, staff_client, staff_profile, approved_maintenance_request):
+        """Test accepting a job someone else already holds is a conflict."""
+        from students.models import MaintenanceRequest
+        MaintenanceRequest.objects.filter(pk=approved_maintenance_request.pk).update(status='assigned_to_staff')
+        url = f'/aau-dhms-api/staff/maintenance/{approved_maintenance_request.id}/accept/'
+        response = staff_client.put(url, {})
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data['success'] is False
+    
+    def test_accept_unknown_job(self, staff_client, staff_profile):
+        """Test accepting a job that does not exist."""
+        response = staff_client.put('/aau-dhms-api/staff/maintenance/99999/accept/', {})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_claim_next_job(self, staff_client, staff_profile, approved_maintenance_request, student_profile, room):
+        """Test claim-next hands out the most urgent job, then the oldest."""
+        from operations.counters import AVAILABLE_JOBS, get_global_counter
+        from students.models import MaintenanceRequest
+        older, newer = (
+            MaintenanceRequest.objects.create(
+                request_code=f'MNT-NEXT-{i}', student=student_profile, room=room, issue_type='other',
+                title='Next', description='Next', urgency='medium', status='approved_by_proctor',
+            )
+            for i in range(2)
+        )
+        url = '/aau-dhms-api/staff/maintenance/claim-next/'
+        
+        claimed = [staff_client.post(url).data['data']['id'] for _ in range(3)]
+        
+        assert claimed == [approved_maintenance_request.id, older.id, newer.id]
+        assert staff_client.post(url).status_code == status.HTTP_404_NOT_FOUND
+        assert MaintenanceRequest.objects.filter(assigned_to=staff_profile, status='assigned_to_staff').count() == 3
+        assert get_global_counter(AVAILABLE_JOBS) == 0
+    
     def test_start_job(self, staff_client, staff_profile, approved_maintenance_request):
         """Test starting a maintenance job."""
         # First accept the job
@@ -89,6 +202,88 @@ class TestStaffMaintenance:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['success'] is True
         assert response.data['data']['status'] == 'completed'
+    
+    def test_complete_rejected_job(self, staff_client, staff_profile, approved_maintenance_request):
+        """Test a job rejected in the meantime cannot be completed."""
+        from students.models import MaintenanceRequest
+        MaintenanceRequest.objects.filter(pk=approved_maintenance_request.pk).update(
+            status='rejected', assigned_to=staff_profile
+        )
+        url = f'/aau-dhms-api/staff/maintenance/{approved_maintenance_request.id}/complete/'
+        response = staff_client.put(url, {})
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+        approved_maintenance_request.refresh_from_db()
+        assert approved_maintenance_request.status == 'rejected'
+        assert approved_maintenance_request.completed_date is None
+    
+    def test_start_job_writes_changed_columns(self, staff_client, staff_profile, approved_maintenance_request):
+        """Test a transition is one UPDATE of the changed columns."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        staff_client.put(f'/aau-dhms-api/staff/maintenance/{approved_maintenance_request.id}/accept/', {})
+        
+        with CaptureQueriesContext(connection) as queries:
+            staff_client.put(f'/aau-dhms-api/staff/maintenance/{approved_maintenance_request.id}/start/', {})
+        
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "maintenance_requests"')]
+        assert len(updates) == 1
+        assert '"started_date"' in updates[0]
+        assert '"title"' not in updates[0]
+        assert '"status" IN' in updates[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestJobClaimConcurrency:
+    """Stress job acceptance with many technicians at once."""
+    
+    THREADS = 8
+    
+    def test_concurrent_accepts_have_one_winner(self, approved_maintenance_request):
+        """Test exactly one technician gets the job and the rest see a conflict."""
+        import threading
+        from django.db import OperationalError, connection
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from accounts.models import User, Staff
+        from staff.views import StaffMaintenanceAcceptView
+        from students.models import MaintenanceRequest
+        
+        users = User.objects.bulk_create([
+            User(username=f'tech{i}', password='!', full_name=f'Tech {i}', role='staff')
+            for i in range(self.THREADS)
+        ])
+        Staff.objects.bulk_create([Staff(user=user, staff_code=f'STF-RUSH-{user.pk}') for user in users])
+        users = list(User.objects.filter(pk__in=[user.pk for user in users]).select_related('staff_profile'))
+        view = StaffMaintenanceAcceptView.as_view()
+        factory = APIRequestFactory()
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+        
+        def worker(user):
+            barrier.wait()
+            try:
+                while True:
+                    request = factory.put(f'/aau-dhms-api/staff/maintenance/{approved_maintenance_request.id}/accept/')
+                    force_authenticate(request, user=user)
+                    try:
+                        results.append((user.staff_profile.pk, view(request, pk=approved_maintenance_request.id).status_code))
+                        break
+                    except OperationalError:
+                        # SQLite allows one writer at a time; try again.
+                        continue
+            finally:
+                connection.close()
+        
+        threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        winners = [staff_id for staff_id, code in results if code == status.HTTP_200_OK]
+        assert len(winners) == 1
+        assert [code for _, code in results].count(status.HTTP_409_CONFLICT) == self.THREADS - 1
+        assert MaintenanceRequest.objects.get(pk=approved_maintenance_request.pk).assigned_to_id == winners[0]
 
 
 @pytest.mark.django_db
@@ -104,6 +299,17 @@ class TestDormList:
         assert response.data['success'] is True
         assert 'dorms' in response.data['data']
         assert len(response.data['data']['dorms']) == 1
+    
+    def test_list_dorms_wrongly_typed_cursor(self, staff_client, dorm):
+        """Test a cursor with a non-numeric id is rejected rather than failing."""
+        import base64
+        import json
+        
+        raw = json.dumps({'k': ['abc', 'x'], 'r': 0}).encode()
+        cursor = base64.urlsafe_b64encode(raw).decode().rstrip('=')
+        response = staff_client.get('/aau-dhms-api/dorms/', {'cursor': cursor})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 @pytest.mark.django_db
@@ -2,6 +2,7 @@
 Tests for student endpoints.
 """
 import pytest
+from django.db import connection
 from rest_framework import status
 
 
@@ -29,6 +30,74 @@ class TestStudentDashboard:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['data']['room'] is None
     
+    def test_dashboard_roommate_and_stats(self, authenticated_client, student_profile, room_assignment,
+                                          penalty, maintenance_request, laundry_form, proctor_user):
+        """Test dashboard roommate and stats payload."""
+        from django.contrib.auth import get_user_model
+        from students.models import RoomAssignment
+        
+        roommate_user = get_user_model().objects.create_user(
+            username='roommate', password='testpass123', full_name='Room Mate', role='student'
+        )
+        RoomAssignment.objects.create(
+            student=roommate_user.student_profile,
+            room=room_assignment.room,
+            assignment_date=room_assignment.assignment_date,
+            status='active',
+            assigned_by=proctor_user
+        )
+        
+        url = '/aau-dhms-api/students/dashboard/'
+        response = authenticated_client.get(url)
+        
+        room = response.data['data']['room']
+        assert room['id'] == room_assignment.room.id
+        assert room['dorm_name'] == 'Test Dorm'
+        assert room['check_in_date'] == room_assignment.check_in_date
+        assert room['roommate'] == {
+            'id': roommate_user.student_profile.id,
+            'full_name': 'Room Mate',
+            'student_code': roommate_user.student_profile.student_code,
+        }
+        assert response.data['data']['stats'] == {
+            'active_penalties': 1,
+            'pending_maintenance': 1,
+            'pending_laundry': 1,
+        }
+    
+    def test_dashboard_query_count_is_constant(self, authenticated_client, student_profile, room_assignment,
+                                               proctor_user, django_assert_num_queries):
+        """Test dashboard query count does not grow with the student's history."""
+        from datetime import date
+        from students.models import Penalty, MaintenanceRequest, LaundryForm
+        
+        url = '/aau-dhms-api/students/dashboard/'
+        
+        # JWT user lookup + the dashboard query
+        with django_assert_num_queries(2):
+            authenticated_client.get(url)
+        
+        for i in range(10):
+            Penalty.objects.create(
+                penalty_code=f'PEN-QC-{i}', student=student_profile, violation_type='noise',
+                description='Noise', duration_days=1, start_date=date.today(),
+                end_date=date.today(), assigned_by=proctor_user
+            )
+            MaintenanceRequest.objects.create(
+                request_code=f'MNT-QC-{i}', student=student_profile, room=room_assignment.room,
+                issue_type='other', title='Issue', description='Issue'
+            )
+            LaundryForm.objects.create(
+                form_code=f'LAU-QC-{i}', student=student_profile, item_count=1, item_list='shirt'
+            )
+        
+        with django_assert_num_queries(2):
+            response = authenticated_client.get(url)
+        
+        assert response.data['data']['stats']['active_penalties'] == 10
+        assert response.data['data']['stats']['pending_maintenance'] == 10
+        assert response.data['data']['stats']['pending_laundry'] == 10
+    
     def test_dashboard_unauthenticated(self, api_client):
         """Test dashboard without authentication."""
         url = '/aau-dhms-api/students/dashboard/'
@@ -79,6 +148,71 @@ class TestStudentMaintenance:
         assert response.data['success'] is True
         assert 'requests' in response.data['data']
         assert len(response.data['data']['requests']) == 1
+        assert response.data['data']['pagination']['next'] is None
+    
+    def test_list_maintenance_requests_pages(self, authenticated_client, student_profile, maintenance_request):
+        """Test paging through requests that share a reported_date."""
+        from students.models import MaintenanceRequest
+        url = '/aau-dhms-api/students/maintenance/'
+        
+        MaintenanceRequest.objects.bulk_create([
+            MaintenanceRequest(
+                request_code=f'MNT-PAGE-{i}', student=student_profile, room=maintenance_request.room,
+                issue_type='other', title='Page', description='Page',
+            )
+            for i in range(6)
+        ])
+        MaintenanceRequest.objects.update(reported_date=maintenance_request.reported_date)
+        
+        pages = []
+        params = {'page_size': 3}
+        while True:
+            data = authenticated_client.get(url, params).data['data']
+            pages.append([r['id'] for r in data['requests']])
+            if not data['pagination']['next']:
+                break
+            params['cursor'] = data['pagination']['next']
+        
+        ids = [i for page in pages for i in page]
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert ids == sorted(ids, reverse=True)
+        
+        # Walking back from the last page returns the middle one.
+        previous = authenticated_client.get(url, {'page_size': 3, 'cursor': data['pagination']['previous']})
+        assert [r['id'] for r in previous.data['data']['requests']] == pages[1]
+    
+    @pytest.mark.parametrize('key', [
+        ['abc', 'x'], ['2020-99-99', 'zz'], [{'a': 1}, 1], [[1], 2],
+    ])
+    def test_list_maintenance_requests_wrongly_typed_cursor(self, authenticated_client, student_profile,
+                                                            maintenance_request, key):
+        """Test a well-formed cursor whose values do not fit the key columns is rejected."""
+        import base64
+        import json
+        
+        raw = json.dumps({'k': key, 'r': 0}).encode()
+        cursor = base64.urlsafe_b64encode(raw).decode().rstrip('=')
+        response = authenticated_client.get('/aau-dhms-api/students/maintenance/', {'cursor': cursor})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_list_maintenance_requests_total(self, authenticated_client, student_profile, maintenance_request,
+                                             django_assert_num_queries):
+        """Test the total is only computed on request, exactly on SQLite."""
+        url = '/aau-dhms-api/students/maintenance/'
+        
+        # Authenticated user with student profile, one page fetch: no COUNT(*).
+        with django_assert_num_queries(2):
+            pagination = authenticated_client.get(url).data['data']['pagination']
+        assert pagination['has_next'] is False
+        assert 'total' not in pagination
+        
+        pagination = authenticated_client.get(url, {'total': 'estimate'}).data['data']['pagination']
+        if connection.vendor == 'postgresql':
+            assert pagination['total_is_estimate'] is True
+        else:
+            assert pagination['total'] == 1
+            assert pagination['total_is_estimate'] is False
     
     def test_create_maintenance_request(self, authenticated_client, student_profile, room):
         """Test creating a maintenance request."""
@@ -142,3 +276,213 @@ class TestStudentPenalties:
         assert 'penalties' in response.data['data']
         assert len(response.data['data']['penalties']) == 1
         assert response.data['data']['penalties'][0]['penalty_code'] == 'PEN-TEST-001'
+
+
+@pytest.mark.django_db
+class TestCodeAllocation:
+    """Test block-allocated record codes."""
+    
+    def test_create_maintenance_request_code(self, authenticated_client, student_profile, room_assignment):
+        """Test new requests get sequential codes for the current year."""
+        from django.utils import timezone
+        url = '/aau-dhms-api/students/maintenance/'
+        data = {'room_id': room_assignment.room.id, 'issue_type': 'plumbing', 'title': 'Leak', 'description': 'Leak'}
+        
+        first = authenticated_client.post(url, data).data['data']['request_code']
+        second = authenticated_client.post(url, data).data['data']['request_code']
+        
+        year = timezone.localdate().year
+        assert first.startswith(f'MNT-{year}-') and len(first) == len(f'MNT-{year}-0000001')
+        assert int(second.rsplit('-', 1)[1]) == int(first.rsplit('-', 1)[1]) + 1
+    
+    def test_codes_come_from_memory(self, django_assert_num_queries):
+        """Test only the first code of a block touches the database."""
+        from operations.codes import BLOCK_SIZE, next_code
+        
+        first = next_code('TSA', 2030)
+        with django_assert_num_queries(0):
+            codes = [next_code('TSA', 2030) for _ in range(BLOCK_SIZE - 1)]
+        
+        assert first == 'TSA-2030-0000001'
+        assert codes[-1] == f'TSA-2030-{BLOCK_SIZE:07d}'
+        assert next_code('TSA', 2031) == 'TSA-2031-0000001'
+    
+    def test_rolled_back_block_is_dropped(self):
+        """Test a block reserved in a rolled-back transaction is not handed out again."""
+        from django.db import transaction
+        from operations.codes import next_code
+        from operations.models import CodeSequence
+        
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                rolled_back = next_code('TSB', 2030)
+                raise RuntimeError
+        
+        assert not CodeSequence.objects.filter(prefix='TSB').exists()
+        # The reservation was undone, so its numbers are issued from a fresh block
+        assert next_code('TSB', 2030) == rolled_back
+        assert next_code('TSB', 2030) == 'TSB-2030-0000002'
+    
+    def test_next_codes_reserve_a_range(self):
+        """Test a batch of codes is reserved past the numbers already handed out."""
+        from operations.codes import BLOCK_SIZE, next_code, next_codes
+        
+        assert next_code('TSD', 2030) == 'TSD-2030-0000001'
+        codes = next_codes('TSD', 3, 2030)
+        
+        assert codes == [f'TSD-2030-{n:07d}' for n in range(BLOCK_SIZE + 1, BLOCK_SIZE + 4)]
+        assert next_code('TSD', 2030) == 'TSD-2030-0000002'
+        assert next_codes('TSD', 0, 2030) == []
+
+
+@pytest.mark.django_db
+class TestStudentImport:
+    """Test bulk student import from registrar exports."""
+    
+    URL = '/aau-dhms-api/admin/students/import/'
+    
+    def test_import_csv(self, admin_client, student_user):
+        """Test valid rows are created and the rest reported by line."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from accounts.models import Student, User
+        
+        export = (
+            'username,full_name,password,department,year_of_study,gender\n'
+            'ugr-0001,Abebe Kebede,Intake2026!,Physics,2,male\n'
+            'ugr-0002,Sara Tesfaye,,,,female\n'
+            'ugr-0003,,Intake2026!,,,\n'
+            'ugr-0001,Abebe Again,,,,\n'
+            'teststudent,Taken Name,,,,\n'
+        )
+        upload = SimpleUploadedFile('intake.csv', export.encode(), content_type='text/csv')
+        response = admin_client.post(self.URL, {'file': upload}, format='multipart')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.data['data']
+        assert (data['created'], data['failed']) == (2, 3)
+        assert {error['line']: list(error['errors']) for error in data['errors']} == {
+            4: ['full_name'], 5: ['username'], 6: ['username'],
+        }
+        
+        abebe = Student.objects.select_related('user').get(user__username='ugr-0001')
+        assert abebe.user.role == 'student' and abebe.user.full_name == 'Abebe Kebede'
+        assert abebe.user.check_password('Intake2026!')
+        assert (abebe.department, abebe.year_of_study, abebe.gender) == ('Physics', 2, 'male')
+        assert abebe.student_code.startswith('STU-')
+        assert not User.objects.get(username='ugr-0002').has_usable_password()
+    
+    def test_import_hashes_in_request_process(self, admin_client, monkeypatch):
+        """Test an upload does not start a process pool."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        
+        def no_pool(*args, **kwargs):
+            raise AssertionError('uploads must not fork')
+        monkeypatch.setattr('accounts.importers.ProcessPoolExecutor', no_pool)
+        upload = SimpleUploadedFile('intake.csv', b'username,full_name,password\nugr-0001,Abebe,Intake2026!\n')
+        
+        response = admin_client.post(self.URL, {'file': upload}, format='multipart')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+    
+    @pytest.mark.parametrize('limit, rows, message', [
+        ('UPLOAD_MAX_ROWS', 'ugr-{n},Student {n},\n', 'at most 2 rows'),
+        ('UPLOAD_MAX_PASSWORDS', 'ugr-{n},Student {n},Intake2026!\n', 'at most 2 passwords'),
+    ])
+    def test_import_upload_limits(self, admin_client, monkeypatch, limit, rows, message):
+        """Test oversized uploads are refused before anything is imported."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from accounts import importers
+        from accounts.models import User
+        
+        monkeypatch.setattr(importers, limit, 2)
+        export = 'username,full_name,password\n' + ''.join(rows.format(n=n) for n in range(3))
+        upload = SimpleUploadedFile('intake.csv', export.encode())
+        
+        response = admin_client.post(self.URL, {'file': upload}, format='multipart')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert message in response.data['errors']['file'][0]
+        assert not User.objects.filter(username__startswith='ugr-').exists()
+    
+    def test_import_command_batches(self, tmp_path):
+        """Test the command writes each batch with one insert per table."""
+        import json
+        from io import StringIO
+        from django.core.management import call_command
+        from django.test.utils import CaptureQueriesContext
+        from accounts.models import Student
+        
+        path = tmp_path / 'intake.jsonl'
+        rows = [json.dumps({'username': f'ugr-{n}', 'full_name': f'Student {n}'}) for n in range(5)]
+        path.write_text('\n'.join(rows[:2] + ['[1, 2]'] + rows[2:]) + '\n')
+        
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('import_students', str(path), batch_size=2, workers=1, stdout=out)
+        
+        assert 'Created 5 student(s)' in out.getvalue()
+        assert 'line 3 (-): non_field_errors: Line is not a JSON object.' in out.getvalue()
+        inserts = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('INSERT INTO "students"')]
+        assert len(inserts) == 3
+        assert len(set(Student.objects.filter(user__username__startswith='ugr-').values_list('student_code', flat=True))) == 5
+    
+    def test_import_requires_admin(self, authenticated_client):
+        """Test only admins can import."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        
+        upload = SimpleUploadedFile('intake.csv', b'username,full_name\n')
+        response = authenticated_client.post(self.URL, {'file': upload}, format='multipart')
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_import_unknown_format(self, admin_client):
+        """Test a file whose format cannot be told is rejected."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        
+        upload = SimpleUploadedFile('intake.txt', b'username,full_name\n')
+        response = admin_client.post(self.URL, {'file': upload}, format='multipart')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'format' in response.data['errors']
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCodeAllocationConcurrency:
+    """Stress code allocation with many workers at once."""
+    
+    THREADS = 8
+    CODES = 25
+    
+    def test_concurrent_codes_are_unique(self, monkeypatch):
+        """Test workers drawing small blocks never issue the same code twice."""
+        import threading
+        from django.db import OperationalError, transaction
+        from operations import codes
+        
+        monkeypatch.setattr(codes, 'BLOCK_SIZE', 3)
+        barrier = threading.Barrier(self.THREADS)
+        issued = []
+        
+        def worker():
+            barrier.wait()
+            try:
+                for _ in range(self.CODES):
+                    while True:
+                        try:
+                            with transaction.atomic():
+                                issued.append(codes.next_code('TSC', 2030))
+                            break
+                        except OperationalError:
+                            # SQLite allows one writer at a time; try again.
+                            continue
+            finally:
+                connection.close()
+        
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(issued) == self.THREADS * self.CODES
+        assert len(set(issued)) == len(issued)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Student, Proctor, Staff, Security, AuditLog
+from .models import User, Student, Proctor, Staff, Security, AuditLog, UsedRefreshToken
 
 
 @admin.register(User)
@@ -31,9 +31,9 @@ class UserAdmin(BaseUserAdmin):
 class StudentAdmin(admin.ModelAdmin):
     """Admin configuration for Student model."""
     
-    list_display = ('student_code', 'get_full_name', 'student_type', 'department', 
+    list_display = ('student_code', 'get_full_name', 'student_type', 'gender', 'department', 
                     'year_of_study', 'eligibility_status', 'created_at')
-    list_filter = ('student_type', 'eligibility_status', 'year_of_study', 'department')
+    list_filter = ('student_type', 'gender', 'eligibility_status', 'year_of_study', 'department')
     search_fields = ('student_code', 'user__full_name', 'user__username', 'department')
     raw_id_fields = ('user',)
     ordering = ('-created_at',)
@@ -104,3 +104,16 @@ class AuditLogAdmin(admin.ModelAdmin):
     
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(UsedRefreshToken)
+class UsedRefreshTokenAdmin(admin.ModelAdmin):
+    """Admin configuration for UsedRefreshToken model."""
+    
+    list_display = ('jti', 'expires_at')
+    search_fields = ('jti',)
+    readonly_fields = ('jti', 'expires_at')
+    ordering = ('-expires_at',)
+    
+    def has_add_permission(self, request):
+        return False
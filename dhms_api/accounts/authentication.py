@@ -0,0 +1,135 @@
+"""
+JWT authentication backed by the token's profile claims.
+"""
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import DEFERRED
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import Proctor
+from .tokens import DORM_CLAIM, PROFILE_CLAIM, PROFILE_RELATIONS, ROLE_CLAIM, User
+
+# Rows loaded together with a user of each role.
+ROLE_RELATED = {
+    User.Role.STUDENT: ('student_profile',),
+    User.Role.PROCTOR: ('proctor_profile__assigned_dorm',),
+    User.Role.STAFF: ('staff_profile',),
+    User.Role.SECURITY: ('security_profile',),
+}
+ALL_RELATED = tuple(related for paths in ROLE_RELATED.values() for related in paths)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate without reading the user or profile rows.
+
+    ``request.user`` and its role profile (``request.user.proctor_profile``
+    and so on) are model instances holding only the columns named by the
+    token's claims, so permission checks, ownership filters and foreign-key
+    writes cost no query. The first read of any other column loads the user,
+    the profile and the proctor's dorm with one ``select_related`` query.
+    DRF keeps ``request.user`` for the rest of the request, so later reads
+    are free.
+
+    Tokens without the claims, issued before they existed, load the user
+    together with every profile in one query. Because the user row is not
+    read for claims tokens, a deactivated or deleted account keeps working
+    until its access token expires for requests that need only the claims.
+    The first read of another column finds the account gone or inactive and
+    fails with 401 (``user_not_found`` / ``user_inactive``), as a token
+    without claims does.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM in validated_token:
+            return user_from_claims(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+        try:
+            user = User.objects.select_related(*ALL_RELATED).get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
+
+
+def user_from_claims(token):
+    """Build the user and its cached role profile from ``token``'s claims."""
+    user = _partial(User, **{
+        api_settings.USER_ID_FIELD: token[api_settings.USER_ID_CLAIM],
+        'role': token[ROLE_CLAIM],
+    })
+    relation = PROFILE_RELATIONS.get(user.role)
+    if relation is None:
+        user._deferred_loader = partial(_load_rows, user, None)
+        return user
+
+    profile = None
+    profile_id = token.get(PROFILE_CLAIM)
+    if profile_id is not None:
+        model = User._meta.get_field(relation).related_model
+        values = {'id': profile_id, 'user_id': user.pk}
+        if model is Proctor:
+            values['assigned_dorm_id'] = token.get(DORM_CLAIM)
+        profile = _partial(model, **values)
+        model._meta.get_field('user').set_cached_value(profile, user)
+    # A missing profile is cached too, so views answer 404 without a query.
+    User._meta.get_field(relation).set_cached_value(user, profile)
+
+    user._deferred_loader = partial(_load_rows, user, profile)
+    if profile is not None:
+        profile._deferred_loader = user._deferred_loader
+    return user
+
+
+def _partial(model, **values):
+    """A saved ``model`` instance with only ``values`` loaded."""
+    fields = model._meta.concrete_fields
+    return model.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [values.get(field.attname, DEFERRED) for field in fields],
+    )
+
+
+def _load_rows(user, profile):
+    """Fill in the deferred columns of ``user`` and ``profile`` with one query."""
+    user._deferred_loader = None
+    if profile is not None:
+        profile._deferred_loader = None
+
+    loaded = User.objects.select_related(*ROLE_RELATED.get(user.role, ())).filter(pk=user.pk).first()
+    if loaded is None:
+        raise AuthenticationFailed(_('User not found'), code='user_not_found')
+    if api_settings.CHECK_USER_IS_ACTIVE and not loaded.is_active:
+        raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+    _fill(user, loaded)
+
+    loaded_profile = getattr(loaded, PROFILE_RELATIONS[user.role], None) if profile is not None else None
+    if loaded_profile is None or loaded_profile.pk != profile.pk:
+        return
+    _fill(profile, loaded_profile)
+    if isinstance(profile, Proctor) and profile.assigned_dorm_id == loaded_profile.assigned_dorm_id:
+        dorm = Proctor._meta.get_field('assigned_dorm')
+        dorm.set_cached_value(profile, dorm.get_cached_value(loaded_profile, None))
+
+
+def _fill(instance, loaded):
+    attnames = instance.get_deferred_fields()
+    for attname in attnames:
+        setattr(instance, attname, getattr(loaded, attname))
+    instance._mark_clean(attnames)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core import checks
+from django.utils.module_loading import import_string
+
+
+@checks.register(checks.Tags.security)
+def check_password_hasher(app_configs, **kwargs):
+    """Fail at startup, not at the first login, on an unusable PASSWORD_HASHER."""
+    algorithm = getattr(settings, 'PASSWORD_HASHER', None)
+    if algorithm is None:
+        return []
+    choices = getattr(settings, 'PASSWORD_HASHER_CLASSES', {})
+    if algorithm not in choices:
+        return [checks.Error(
+            f'PASSWORD_HASHER {algorithm!r} is not one of: {", ".join(choices)}.',
+            id='accounts.E001',
+        )]
+    hasher = import_string(choices[algorithm])()
+    if hasher.library is None:
+        return []
+    try:
+        hasher._load_library()
+    except ValueError as exc:
+        return [checks.Error(str(exc), hint='pip install argon2-cffi', id='accounts.E002')]
+    return []
@@ -0,0 +1,46 @@
+"""
+Cached payload of ``/auth/me/``.
+
+The payload (the user plus their role profile) is stored per user with an
+ETag derived from its content, so a client that sends the ETag back in
+``If-None-Match`` gets ``304 Not Modified`` from the cache alone. With a
+claims token the request then reads no user or profile row.
+
+Entries are deleted whenever the user, their profile or the proctor's dorm
+is saved or deleted (see ``signals``), once right away and once more after
+the transaction commits, so a request that read the old rows in between
+cannot leave them cached. Other workers may serve their in-process copy
+for a few more seconds (see ``dhms_api.cache``). Writes that bypass signals,
+such as ``QuerySet.update()``, are picked up when the entry expires.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from dhms_api.cache import Namespace
+
+from .authentication import ALL_RELATED
+from .models import User
+from .serializers import CurrentUserSerializer
+
+CURRENT_USER = Namespace('auth.me', timeout=60 * 60)
+
+
+def current_user_payload(user_id):
+    """Return ``(etag, data)`` for the user with ``user_id``, from the cache if possible."""
+    def build():
+        user = User.objects.select_related(*ALL_RELATED).get(pk=user_id)
+        content = json.dumps(CurrentUserSerializer(user).data, cls=DjangoJSONEncoder, sort_keys=True)
+        return f'"{hashlib.md5(content.encode()).hexdigest()}"', json.loads(content)
+
+    return CURRENT_USER.get_or_set(user_id, build)
+
+
+def invalidate_current_user(*user_ids):
+    """Drop the cached payloads of ``user_ids``."""
+    if not user_ids:
+        return
+    CURRENT_USER.delete_many(user_ids)
+    transaction.on_commit(lambda: CURRENT_USER.delete_many(user_ids))
@@ -0,0 +1,63 @@
+"""
+Password hashers whose work factors come from ``settings.PASSWORD_HASHING``.
+
+Algorithm names match Django's built-in hashers, so hashes stay interchangeable
+with them. Django's ``check_password`` rehashes a password on the next successful
+login when it was stored with another algorithm or other work factors than the
+ones configured now.
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.module_loading import import_string
+
+
+def work_factor(algorithm, name, default):
+    """Configured value of ``name`` for ``algorithm``, or Django's default."""
+    value = getattr(settings, 'PASSWORD_HASHING', {}).get(algorithm, {}).get(name)
+    return default if value in (None, '') else int(value)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return work_factor(self.algorithm, 'iterations', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    # Only a ceiling; OpenSSL's 32 MiB default would reject larger work factors.
+    maxmem = 2 ** 30
+
+    @property
+    def work_factor(self):
+        return work_factor(self.algorithm, 'work_factor', hashers.ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return work_factor(self.algorithm, 'block_size', hashers.ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return work_factor(self.algorithm, 'parallelism', hashers.ScryptPasswordHasher.parallelism)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs the optional ``argon2-cffi`` package."""
+
+    @property
+    def time_cost(self):
+        return work_factor(self.algorithm, 'time_cost', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return work_factor(self.algorithm, 'memory_cost', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return work_factor(self.algorithm, 'parallelism', hashers.Argon2PasswordHasher.parallelism)
+
+
+def hasher_paths(algorithm):
+    """``PASSWORD_HASHERS`` reordered so that ``algorithm`` hashes new passwords."""
+    return sorted(settings.PASSWORD_HASHERS, key=lambda path: import_string(path).algorithm != algorithm)
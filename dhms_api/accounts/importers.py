@@ -0,0 +1,212 @@
+"""
+Bulk import of students from registrar exports.
+
+``read_rows`` streams a CSV or JSONL export one record at a time, so a file
+of any size is never held in memory. ``import_students`` validates the rows
+and creates students ``batch_size`` at a time: one query for usernames that
+are already taken, one ``bulk_create`` for the users, one ``UPDATE`` for the
+batch's student codes and one ``bulk_create`` for the profiles.
+``bulk_create`` sends no ``post_save``, so the profile signal does not run
+and the profiles are built here instead.
+
+Password hashing is deliberately slow and dominates the cost of an import,
+so each batch's passwords are hashed in a process pool. Uploads through the
+API are hashed in the request's own process instead and are capped by
+``UPLOAD_MAX_ROWS`` and ``UPLOAD_MAX_PASSWORDS`` so they finish within a
+worker timeout; larger exports go through ``manage.py import_students``.
+"""
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import PurePath
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from operations.codes import STUDENT, next_codes
+from .models import Student, User
+from .serializers import StudentImportRowSerializer
+
+BATCH_SIZE = 1000
+
+# Limits of one API upload. A password costs about a third of a second to
+# hash, so 50 of them stay well inside gunicorn's 30 second timeout.
+UPLOAD_MAX_ROWS = 1000
+UPLOAD_MAX_PASSWORDS = 50
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+USER_FIELDS = ('username', 'full_name', 'email', 'phone')
+
+USERNAME_TAKEN = 'A user with that username already exists.'
+DUPLICATE_USERNAME = 'Username already appears earlier in the file.'
+NOT_AN_OBJECT = 'Line is not a JSON object.'
+
+
+def format_for(name):
+    """``'csv'`` or ``'jsonl'`` judging by a file name, or ``None``."""
+    return FORMATS.get(PurePath(name).suffix.lower())
+
+
+def read_rows(text, fmt):
+    """
+    Yield ``(line, row)`` for each record of a CSV (with a header row) or
+    JSONL text stream. ``row`` is ``None`` for a JSONL line that is not an
+    object.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line, raw in enumerate(text, 1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError:
+            row = None
+        yield line, row if isinstance(row, dict) else None
+
+
+def upload_rows(text, fmt):
+    """
+    The rows of an API upload as a list, checked against the upload limits.
+
+    Raises ``ValidationError`` (keyed by ``file``) when the upload is too large.
+    """
+    rows = list(islice(read_rows(text, fmt), UPLOAD_MAX_ROWS + 1))
+    if len(rows) > UPLOAD_MAX_ROWS:
+        raise ValidationError({'file': [
+            f'An upload may hold at most {UPLOAD_MAX_ROWS} rows. Use manage.py import_students for larger files.'
+        ]})
+    passwords = sum(1 for _, row in rows if row and str(row.get('password') or '').strip())
+    if passwords > UPLOAD_MAX_PASSWORDS:
+        raise ValidationError({'file': [
+            f'An upload may set at most {UPLOAD_MAX_PASSWORDS} passwords. Leave the rest blank or use '
+            f'manage.py import_students.'
+        ]})
+    return rows
+
+
+def import_students(rows, batch_size=BATCH_SIZE, workers=None):
+    """
+    Create a student for every valid row of ``rows`` (``(line, mapping)`` pairs).
+
+    Rows are handled independently: an invalid row, or one whose username
+    is taken, is reported and skipped without affecting the others. Each
+    batch is committed on its own, so an import that stops halfway can be
+    run again; rows already imported come back as taken.
+    ``workers`` processes hash passwords (default: one per CPU).
+
+    Returns ``(created, errors)`` where ``errors`` lists ``{'line',
+    'username', 'errors'}`` for every rejected row.
+    """
+    created, errors = 0, []
+    seen = set()
+    # One serializer for every row, as ListSerializer does; building one per
+    # row deep-copies its fields each time.
+    validator = StudentImportRowSerializer()
+    with _password_hasher(workers) as hash_passwords:
+        for batch in _chunks(rows, batch_size):
+            valid = []
+            for line, row in batch:
+                if row is None:
+                    errors.append(_error(line, None, 'non_field_errors', NOT_AN_OBJECT))
+                    continue
+                try:
+                    data = validator.run_validation(_clean(row))
+                except ValidationError as exc:
+                    errors.append({'line': line, 'username': row.get('username'), 'errors': exc.detail})
+                    continue
+                if data['username'] in seen:
+                    errors.append(_error(line, data['username'], 'username', DUPLICATE_USERNAME))
+                    continue
+                seen.add(data['username'])
+                valid.append((line, data))
+            created += _create(valid, hash_passwords, errors)
+    return created, errors
+
+
+def _create(rows, hash_passwords, errors):
+    rows = _drop_taken(rows, errors)
+    passwords = dict(zip(
+        (line for line, _ in rows),
+        hash_passwords([data.get('password') for _, data in rows]),
+    ))
+    try:
+        return _insert(rows, passwords)
+    except IntegrityError:
+        # A username was registered between the check and the insert.
+        return _insert(_drop_taken(rows, errors), passwords)
+
+
+def _insert(rows, passwords):
+    if not rows:
+        return 0
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                role=User.Role.STUDENT, password=passwords[line],
+                **{field: data[field] for field in USER_FIELDS if field in data},
+            )
+            for line, data in rows
+        ])
+        codes = next_codes(STUDENT, len(users))
+        Student.objects.bulk_create([
+            Student(
+                user=user, student_code=code,
+                **{field: value for field, value in data.items() if field not in USER_FIELDS and field != 'password'},
+            )
+            for user, code, (_, data) in zip(users, codes, rows)
+        ])
+    return len(users)
+
+
+def _drop_taken(rows, errors):
+    """``rows`` without those whose username is taken, which are added to ``errors``."""
+    taken = set(
+        User.objects.filter(username__in=[data['username'] for _, data in rows])
+        .values_list('username', flat=True)
+    )
+    for line, data in rows:
+        if data['username'] in taken:
+            errors.append(_error(line, data['username'], 'username', USERNAME_TAKEN))
+    return [(line, data) for line, data in rows if data['username'] not in taken]
+
+
+@contextmanager
+def _password_hasher(workers):
+    """Yield a function that hashes a list of passwords (``None`` for unusable)."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield lambda passwords: [make_password(password) for password in passwords]
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        yield lambda passwords: list(
+            pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4)))
+        )
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    return iter(lambda: list(islice(rows, size)), [])
+
+
+def _clean(row):
+    """Drop blank cells and CSV columns without a header."""
+    cleaned = {}
+    for key, value in row.items():
+        if isinstance(value, str):
+            value = value.strip()
+        if key is not None and value not in ('', None):
+            cleaned[key] = value
+    return cleaned
+
+
+def _error(line, username, field, message):
+    return {'line': line, 'username': username, 'errors': {field: [message]}}
@@ -0,0 +1,115 @@
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from accounts.hashers import hasher_paths
+from accounts.models import User
+from accounts.views import CustomTokenObtainPairView
+
+PASSWORD = 'bench-pass-123'
+WORK_FACTORS = {
+    'pbkdf2_sha256': ('iterations',),
+    'scrypt': ('work_factor', 'block_size', 'parallelism'),
+    'argon2': ('time_cost', 'memory_cost', 'parallelism'),
+}
+
+
+def parse_config(spec):
+    """``algorithm[:name=value,...]`` -> (algorithm, {name: value})."""
+    algorithm, _, params = spec.partition(':')
+    if algorithm not in WORK_FACTORS:
+        raise CommandError(f'Unknown hasher {algorithm!r}; choose from {", ".join(WORK_FACTORS)}.')
+    factors = {}
+    for item in filter(None, params.split(',')):
+        name, _, value = item.partition('=')
+        if name not in WORK_FACTORS[algorithm] or not value.isdigit():
+            raise CommandError(
+                f'Bad work factor {item!r} for {algorithm}; expected name=int with name in '
+                f'{", ".join(WORK_FACTORS[algorithm])}.'
+            )
+        factors[name] = int(value)
+    return algorithm, factors
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure login throughput through the login view for each password hasher configuration. '
+        'Each user is seeded with the hasher from settings, so its first login includes the transparent '
+        'rehash to the measured configuration. All seeded data is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hasher', action='append', dest='configs', metavar='ALGORITHM[:NAME=VALUE,...]',
+            help=(
+                'Configuration to measure, e.g. scrypt:work_factor=32768 or argon2:time_cost=3,memory_cost=65536. '
+                'Repeat for several; unset work factors come from settings. Default: every algorithm as configured.'
+            ),
+        )
+        parser.add_argument('--logins', type=int, default=20, help='Logins per configuration.')
+
+    def handle(self, *args, **options):
+        configs = [parse_config(spec) for spec in options['configs'] or WORK_FACTORS]
+        view = CustomTokenObtainPairView.as_view()
+        factory = APIRequestFactory()
+
+        self.stdout.write(
+            f"{'configuration':<52} {'1st login':>10} {'ms/login':>9} {'logins/s':>9} {'per core':>9}"
+        )
+        with transaction.atomic():
+            for n, (algorithm, factors) in enumerate(configs):
+                # Hashed as settings say; the first login rehashes it for this configuration.
+                user = User.objects.create_user(
+                    username=f'bench-login-{n}', password=PASSWORD, full_name='Bench Login', role='student',
+                )
+                hashing = {**settings.PASSWORD_HASHING}
+                hashing[algorithm] = {**hashing.get(algorithm, {}), **factors}
+                with override_settings(PASSWORD_HASHERS=hasher_paths(algorithm), PASSWORD_HASHING=hashing):
+                    hasher = get_hasher(algorithm)
+                    label = self._label(hasher)
+                    try:
+                        if hasher.library:
+                            hasher._load_library()
+                    except ValueError as exc:
+                        self.stdout.write(f'{label:<52} skipped: {exc}')
+                        continue
+
+                    def login():
+                        request = factory.post(
+                            '/aau-dhms-api/auth/login/', {'username': user.username, 'password': PASSWORD},
+                            format='json',
+                        )
+                        assert view(request).status_code == 200
+
+                    started = time.perf_counter()
+                    login()
+                    first = time.perf_counter() - started
+                    user.refresh_from_db(fields=['password'])
+                    assert user.password.startswith(f'{algorithm}$'), user.password
+
+                    wall, cpu = time.perf_counter(), time.process_time()
+                    for _ in range(options['logins']):
+                        login()
+                    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+                self.stdout.write(
+                    f"{label:<52} {first * 1000:>10.1f} {wall / options['logins'] * 1000:>9.1f} "
+                    f"{options['logins'] / wall:>9.1f} {options['logins'] / cpu:>9.1f}"
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f'logins/s is wall-clock for one process; per core is logins per CPU second. '
+            f'Expect about per core x {os.cpu_count()} (CPUs here) with one worker per core.'
+        )
+
+    def _label(self, hasher):
+        factors = ','.join(f'{name}={getattr(hasher, name)}' for name in WORK_FACTORS[hasher.algorithm])
+        return f'{hasher.algorithm}:{factors}'
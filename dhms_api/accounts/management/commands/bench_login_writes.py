@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.serializers import api_settings
+
+from accounts.models import TrackedFieldsMixin, User
+from accounts.tokens import PROFILE_RELATIONS
+from accounts.views import CustomTokenObtainPairView
+
+PASSWORD = 'bench-pass-123'
+WRITES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def _all_loaded(instance):
+    """Dirty-field check that reports every loaded column, as saves used to write."""
+    return {
+        field.attname for field in instance._meta.concrete_fields
+        if not field.primary_key and field.attname in instance.__dict__
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Count the queries and writes of a login (with last_login recorded) and of user saves, '
+        'with and without dirty-field tracking. All seeded data is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Operations per role and flow.')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        view = CustomTokenObtainPairView.as_view()
+        factory = APIRequestFactory()
+
+        with transaction.atomic(), mock.patch.object(api_settings, 'UPDATE_LAST_LOGIN', True):
+            users = [
+                User.objects.create_user(
+                    username=f'bench-{role}', password=PASSWORD, full_name=f'Bench {role}', role=role,
+                )
+                for role in PROFILE_RELATIONS
+            ]
+
+            def login(user, n):
+                request = factory.post(
+                    '/aau-dhms-api/auth/login/', {'username': user.username, 'password': PASSWORD}, format='json',
+                )
+                assert view(request).status_code == 200
+
+            def edit(user, n):
+                user = User.objects.select_related(PROFILE_RELATIONS[user.role]).get(pk=user.pk)
+                user.full_name = f'Bench {user.role} {n}'
+                user.save()
+
+            def unchanged(user, n):
+                User.objects.select_related(PROFILE_RELATIONS[user.role]).get(pk=user.pk).save()
+
+            self.stdout.write(f"{'flow':<16} {'writes/op':>10} {'legacy':>8} {'queries/op':>11} {'legacy':>8}")
+            for name, flow in (('login', login), ('edit user', edit), ('unchanged save', unchanged)):
+                writes, queries = self._measure(flow, users, repeat)
+                with mock.patch.object(TrackedFieldsMixin, 'get_dirty_fields', _all_loaded):
+                    legacy_writes, legacy_queries = self._measure(flow, users, repeat)
+                self.stdout.write(
+                    f'{name:<16} {writes:>10.2f} {legacy_writes:>8.2f} {queries:>11.2f} {legacy_queries:>8.2f}'
+                )
+
+            transaction.set_rollback(True)
+
+    def _measure(self, flow, users, repeat):
+        """Average writes and queries per call of ``flow``."""
+        with CaptureQueriesContext(connection) as captured:
+            for n in range(repeat):
+                for user in users:
+                    flow(user, n)
+        statements = [query['sql'] for query in captured.captured_queries]
+        calls = repeat * len(users)
+        return sum(sql.startswith(WRITES) for sql in statements) / calls, len(statements) / calls
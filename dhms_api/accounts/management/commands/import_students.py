@@ -0,0 +1,48 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.importers import BATCH_SIZE, format_for, import_students, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Create students from a registrar export: CSV with a header row, or JSONL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Export file to read.')
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help='File format; by default taken from the file extension.',
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Students created per batch.')
+        parser.add_argument(
+            '--workers', type=int,
+            help='Processes hashing passwords (default: one per CPU).',
+        )
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or format_for(options['path'])
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name; pass --format csv or --format jsonl.')
+
+        started = time.perf_counter()
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as text:
+                created, errors = import_students(
+                    read_rows(text, fmt), batch_size=options['batch_size'], workers=options['workers'],
+                )
+        except (OSError, UnicodeDecodeError, csv.Error) as exc:
+            # Batches before the failure stay imported; running again skips them.
+            raise CommandError(f"Cannot read {options['path']}: {exc}")
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f'Created {created} student(s) in {elapsed:.2f}s.'))
+        if errors:
+            self.stdout.write(self.style.WARNING(f'{len(errors)} row(s) skipped:'))
+            for error in errors:
+                messages = '; '.join(
+                    f'{field}: {" ".join(str(message) for message in field_messages)}'
+                    for field, field_messages in error['errors'].items()
+                )
+                self.stdout.write(f"  line {error['line']} ({error['username'] or '-'}): {messages}")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from accounts.tokens import prune_used_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete used refresh tokens that have expired. Run daily, e.g. from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10_000,
+            help='Rows deleted per statement.',
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_used_tokens(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired token(s).'))
@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-17 05:51
+
+from datetime import timezone as dt_timezone
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_blacklisted_tokens(apps, schema_editor):
+    """Carry over unexpired tokens from simplejwt's token_blacklist tables."""
+    connection = schema_editor.connection
+    tables = connection.introspection.table_names()
+    if 'token_blacklist_blacklistedtoken' not in tables or 'token_blacklist_outstandingtoken' not in tables:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT o.jti, o.expires_at FROM token_blacklist_outstandingtoken o '
+            'JOIN token_blacklist_blacklistedtoken b ON b.token_id = o.id '
+            'WHERE o.expires_at > %s',
+            [timezone.now()],
+        )
+        rows = cursor.fetchall()
+    UsedRefreshToken = apps.get_model('accounts', 'UsedRefreshToken')
+    UsedRefreshToken.objects.bulk_create(
+        [UsedRefreshToken(jti=jti, expires_at=_aware(expires_at)) for jti, expires_at in rows],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def _aware(value):
+    # Backends without time zone support (SQLite) return naive UTC datetimes.
+    return value if timezone.is_aware(value) else value.replace(tzinfo=dt_timezone.utc)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_student_gender'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsedRefreshToken',
+            fields=[
+                ('jti', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Used Refresh Token',
+                'verbose_name_plural': 'Used Refresh Tokens',
+                'db_table': 'used_refresh_tokens',
+            },
+        ),
+        migrations.RunPython(copy_blacklisted_tokens, migrations.RunPython.noop),
+    ]
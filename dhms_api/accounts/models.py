@@ -2,6 +2,83 @@ from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
 
+class DeferredRowMixin:
+    """
+    Load deferred columns through a custom loader.
+    
+    Instances built from token claims carry only a few columns and a
+    ``_deferred_loader``. Django would load each deferred column with its own
+    query; the first such access calls the loader instead, which fills in
+    the user, the role profile and the proctor's dorm with one query.
+    """
+    
+    _deferred_loader = None
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        loader = self._deferred_loader
+        if fields is not None and loader is not None and self.get_deferred_fields().issuperset(fields):
+            loader()
+            if not self.get_deferred_fields().intersection(fields):
+                return
+        super().refresh_from_db(using, fields, **kwargs)
+
+
+class TrackedFieldsMixin:
+    """
+    Save only the columns that changed.
+    
+    Instances remember the values they were loaded or last saved with, and
+    ``save()`` without ``update_fields`` writes just the columns that differ
+    (plus ``auto_now`` timestamps). When nothing changed the save is skipped,
+    signals included, as Django does for an empty ``update_fields``.
+    Instances built without loading a row (``Model(pk=...)``) save in full.
+    """
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._mark_clean()
+        return instance
+    
+    def get_dirty_fields(self):
+        """Attnames of the loaded columns changed since the last load or save."""
+        saved = self.__dict__.get('_saved_values', {})
+        return {
+            field.attname for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self.__dict__
+            and (field.attname not in saved or saved[field.attname] != self.__dict__[field.attname])
+        }
+    
+    def save(self, *args, **kwargs):
+        if (
+            kwargs.get('update_fields') is None and not kwargs.get('force_insert')
+            and not self._state.adding and '_saved_values' in self.__dict__
+        ):
+            dirty = self.get_dirty_fields()
+            if dirty:
+                dirty.update(
+                    field.attname for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)
+                )
+            kwargs['update_fields'] = dirty
+        super().save(*args, **kwargs)
+        self._mark_clean(kwargs.get('update_fields'))
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        self._mark_clean(fields)
+    
+    def _mark_clean(self, fields=None):
+        """Take the current values of ``fields`` (default: all loaded) as saved."""
+        saved = self.__dict__.setdefault('_saved_values', {})
+        if fields is None:
+            attnames = [field.attname for field in self._meta.concrete_fields]
+        else:
+            attnames = [self._meta.get_field(name).attname for name in fields]
+        for attname in attnames:
+            if attname in self.__dict__:
+                saved[attname] = self.__dict__[attname]
+
+
 class UserManager(BaseUserManager):
     """Custom user manager for the User model."""
     
@@ -27,7 +104,7 @@ class UserManager(BaseUserManager):
         return self.create_user(username, password, **extra_fields)
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(DeferredRowMixin, TrackedFieldsMixin, AbstractBaseUser, PermissionsMixin):
     """Custom User model for the DHMS system."""
     
     class Role(models.TextChoices):
@@ -61,7 +138,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         return f"{self.username} ({self.get_role_display()})"
 
 
-class Student(models.Model):
+class Student(DeferredRowMixin, TrackedFieldsMixin, models.Model):
     """Student profile model linked to User."""
     
     class StudentType(models.TextChoices):
@@ -69,6 +146,10 @@ class Student(models.Model):
         SELF_SPONSORED = 'self_sponsored', 'Self Sponsored'
         DISABLED = 'disabled', 'Disabled'
     
+    class Gender(models.TextChoices):
+        MALE = 'male', 'Male'
+        FEMALE = 'female', 'Female'
+    
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -76,6 +157,7 @@ class Student(models.Model):
     )
     student_code = models.CharField(max_length=20, unique=True)
     student_type = models.CharField(max_length=20, choices=StudentType.choices)
+    gender = models.CharField(max_length=10, choices=Gender.choices, blank=True, null=True)
     academic_year = models.CharField(max_length=10, blank=True, null=True)
     department = models.CharField(max_length=100, blank=True, null=True)
     year_of_study = models.PositiveIntegerField(blank=True, null=True)
@@ -93,7 +175,7 @@ class Student(models.Model):
         return f"{self.student_code} - {self.user.full_name}"
 
 
-class Proctor(models.Model):
+class Proctor(DeferredRowMixin, TrackedFieldsMixin, models.Model):
     """Proctor profile model linked to User."""
     
     user = models.OneToOneField(
@@ -121,7 +203,7 @@ class Proctor(models.Model):
         return f"{self.proctor_code} - {self.user.full_name}"
 
 
-class Staff(models.Model):
+class Staff(DeferredRowMixin, TrackedFieldsMixin, models.Model):
     """Staff profile model linked to User."""
     
     user = models.OneToOneField(
@@ -144,7 +226,7 @@ class Staff(models.Model):
         return f"{self.staff_code} - {self.user.full_name}"
 
 
-class Security(models.Model):
+class Security(DeferredRowMixin, TrackedFieldsMixin, models.Model):
     """Security profile model linked to User."""
     
     class Shift(models.TextChoices):
@@ -203,3 +285,24 @@ class AuditLog(models.Model):
     
     def __str__(self):
         return f"{self.action} by {self.user} at {self.created_at}"
+
+
+class UsedRefreshToken(models.Model):
+    """
+    A refresh token that can no longer be used.
+
+    Rotation records the token it replaces and logout records the token it
+    ends. Rows are only needed until the token would have expired anyway,
+    so ``prune_tokens`` deletes them after ``expires_at``.
+    """
+    
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        db_table = 'used_refresh_tokens'
+        verbose_name = 'Used Refresh Token'
+        verbose_name_plural = 'Used Refresh Tokens'
+    
+    def __str__(self):
+        return self.jti
@@ -1,7 +1,10 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
 from .models import Student, Proctor, Staff, Security
+from .tokens import PROFILE_RELATIONS, ClaimsRefreshToken, add_profile_claims
 
 User = get_user_model()
 
@@ -38,6 +41,10 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom JWT token serializer that includes user data."""
     
+    @classmethod
+    def get_token(cls, user):
+        return add_profile_claims(super().get_token(user), user)
+    
     def validate(self, attrs):
         data = super().validate(attrs)
         
@@ -53,6 +60,36 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that re-reads the profile claims."""
+    
+    token_class = ClaimsRefreshToken
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        
+        # One query loads the user for the active check and its profile for the claims
+        user = User.objects.select_related(*PROFILE_RELATIONS.values()).filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        # Rotated refresh tokens are built from this one, so they pick the claims up too
+        add_profile_claims(refresh, user)
+        
+        data = {'access': str(refresh.access_token)}
+        
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        
+        return data
+
+
 class StudentProfileSerializer(serializers.ModelSerializer):
     """Serializer for Student profile."""
     
@@ -64,7 +101,7 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         model = Student
         fields = [
             'id', 'student_code', 'full_name', 'email', 'phone',
-            'student_type', 'academic_year', 'department',
+            'student_type', 'gender', 'academic_year', 'department',
             'year_of_study', 'semester', 'eligibility_status'
         ]
 
@@ -101,13 +138,22 @@ class SecurityProfileSerializer(serializers.ModelSerializer):
 
 
 class CurrentUserSerializer(serializers.ModelSerializer):
-    """Serializer for current user with permissions."""
+    """Serializer for current user with permissions and role profile."""
     
     permissions = serializers.SerializerMethodField()
+    profile = serializers.SerializerMethodField()
     
     class Meta:
         model = User
-        fields = ['id', 'username', 'role', 'full_name', 'email', 'phone', 'permissions']
+        fields = ['id', 'username', 'role', 'full_name', 'email', 'phone', 'permissions', 'profile']
+    
+    def get_profile(self, obj):
+        """Serialize the user's role profile, if they have one."""
+        relation = PROFILE_RELATIONS.get(obj.role)
+        profile = getattr(obj, relation, None) if relation else None
+        if profile is None:
+            return None
+        return PROFILE_SERIALIZERS[obj.role](profile).data
     
     def get_permissions(self, obj):
         """Get role-based permissions."""
@@ -119,3 +165,34 @@ class CurrentUserSerializer(serializers.ModelSerializer):
             'admin': ['full_access'],
         }
         return permissions_map.get(obj.role, [])
+
+
+PROFILE_SERIALIZERS = {
+    User.Role.STUDENT: StudentProfileSerializer,
+    User.Role.PROCTOR: ProctorProfileSerializer,
+    User.Role.STAFF: StaffProfileSerializer,
+    User.Role.SECURITY: SecurityProfileSerializer,
+}
+
+
+class StudentImportRowSerializer(serializers.Serializer):
+    """One student in a registrar export. Rows without a password get an unusable one."""
+    
+    username = serializers.CharField(max_length=50)
+    full_name = serializers.CharField(max_length=100)
+    password = serializers.CharField(min_length=8, required=False)
+    email = serializers.EmailField(max_length=100, required=False)
+    phone = serializers.CharField(max_length=20, required=False)
+    student_type = serializers.ChoiceField(choices=Student.StudentType.choices, default=Student.StudentType.GOVERNMENT)
+    gender = serializers.ChoiceField(choices=Student.Gender.choices, required=False)
+    academic_year = serializers.CharField(max_length=10, required=False)
+    department = serializers.CharField(max_length=100, required=False)
+    year_of_study = serializers.IntegerField(min_value=1, default=1)
+    semester = serializers.IntegerField(min_value=1, default=1)
+
+
+class StudentImportSerializer(serializers.Serializer):
+    """Serializer for uploading a registrar export."""
+    
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=['csv', 'jsonl'], required=False, help_text='Default: from the file name.')
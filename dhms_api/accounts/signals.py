@@ -1,9 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.utils import timezone
-import uuid
+from operations.codes import PROCTOR, SECURITY, STAFF, STUDENT, next_code
+from staff.models import Dorm
 
+from .current_user import invalidate_current_user
 from .models import User, Student, Proctor, Staff, Security
+from .tokens import PROFILE_RELATIONS
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -14,7 +16,7 @@ def create_user_profile(sender, instance, created, **kwargs):
         if instance.role == User.Role.STUDENT:
             Student.objects.create(
                 user=instance,
-                student_code=f"STU-{instance.id}-{uuid.uuid4().hex[:4].upper()}",
+                student_code=next_code(STUDENT),
                 student_type=Student.StudentType.GOVERNMENT,  # Default
                 year_of_study=1,
                 semester=1
@@ -22,29 +24,55 @@ def create_user_profile(sender, instance, created, **kwargs):
         elif instance.role == User.Role.PROCTOR:
             Proctor.objects.create(
                 user=instance,
-                proctor_code=f"PROC-{instance.id}-{uuid.uuid4().hex[:4].upper()}"
+                proctor_code=next_code(PROCTOR)
             )
         elif instance.role == User.Role.STAFF:
             Staff.objects.create(
                 user=instance,
-                staff_code=f"STF-{instance.id}-{uuid.uuid4().hex[:4].upper()}"
+                staff_code=next_code(STAFF)
             )
         elif instance.role == User.Role.SECURITY:
             Security.objects.create(
                 user=instance,
-                security_code=f"SEC-{instance.id}-{uuid.uuid4().hex[:4].upper()}"
+                security_code=next_code(SECURITY)
             )
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def save_user_profile(sender, instance, created, **kwargs):
     """
     Signal to save the corresponding profile when a User is saved.
+    
+    Only a profile already loaded on the user can hold unsaved changes, and
+    it is only written if it has any.
     """
-    if instance.role == User.Role.STUDENT and hasattr(instance, 'student_profile'):
-        instance.student_profile.save()
-    elif instance.role == User.Role.PROCTOR and hasattr(instance, 'proctor_profile'):
-        instance.proctor_profile.save()
-    elif instance.role == User.Role.STAFF and hasattr(instance, 'staff_profile'):
-        instance.staff_profile.save()
-    elif instance.role == User.Role.SECURITY and hasattr(instance, 'security_profile'):
-        instance.security_profile.save()
+    relation = PROFILE_RELATIONS.get(instance.role)
+    if created or relation is None:
+        return
+    field = User._meta.get_field(relation)
+    profile = field.get_cached_value(instance, None)
+    if profile is not None and profile.get_dirty_fields():
+        profile.save()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, created=False, **kwargs):
+    """Drop the cached /auth/me/ payload of a saved or deleted user."""
+    # A new user has nothing cached: a deleted one's payload went with it.
+    if not created:
+        invalidate_current_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Student)
+@receiver([post_save, post_delete], sender=Proctor)
+@receiver([post_save, post_delete], sender=Staff)
+@receiver([post_save, post_delete], sender=Security)
+def invalidate_profile(sender, instance, **kwargs):
+    """Drop the cached /auth/me/ payload of a saved or deleted profile's user."""
+    invalidate_current_user(instance.user_id)
+
+
+@receiver(post_save, sender=Dorm)
+def invalidate_dorm_proctors(sender, instance, created, **kwargs):
+    """Drop the cached /auth/me/ payloads that show this dorm's name."""
+    if not created:
+        invalidate_current_user(*Proctor.objects.filter(assigned_dorm=instance).values_list('user_id', flat=True))
@@ -0,0 +1,103 @@
+"""
+Role and profile claims carried by JWTs.
+
+Tokens issued at login, registration and refresh carry the user's role, the
+id of their role profile and, for proctors, the id of the dorm they run.
+``authentication.ClaimsJWTAuthentication`` builds ``request.user`` and its
+profile from these claims instead of reading them from the database.
+
+Claims are read again from the database on every refresh, so a profile or
+dorm change reaches new access tokens within one access-token lifetime.
+
+Refresh tokens are single use. Rotation and logout record the token's
+``jti`` in ``UsedRefreshToken``, and recording a ``jti`` that is already
+there fails, so the insert doubles as the reuse check: a refresh costs one
+primary-key insert however many tokens were issued before. Rows are only
+kept until the token expires; ``prune_used_tokens`` deletes the rest.
+"""
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import UsedRefreshToken
+
+User = get_user_model()
+
+ROLE_CLAIM = 'role'
+PROFILE_CLAIM = 'profile_id'
+DORM_CLAIM = 'dorm_id'
+
+# Reverse one-to-one accessor of each role's profile.
+PROFILE_RELATIONS = {
+    User.Role.STUDENT: 'student_profile',
+    User.Role.PROCTOR: 'proctor_profile',
+    User.Role.STAFF: 'staff_profile',
+    User.Role.SECURITY: 'security_profile',
+}
+
+
+def profile_claims(user):
+    """Claims describing ``user``'s role profile."""
+    relation = PROFILE_RELATIONS.get(user.role)
+    profile = getattr(user, relation, None) if relation else None
+    return {
+        ROLE_CLAIM: user.role,
+        PROFILE_CLAIM: profile.pk if profile else None,
+        DORM_CLAIM: getattr(profile, 'assigned_dorm_id', None),
+    }
+
+
+def add_profile_claims(token, user):
+    for claim, value in profile_claims(user).items():
+        token[claim] = value
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Single-use refresh token. ``CustomTokenRefreshSerializer`` sets its
+    profile claims before the access token is derived from it.
+    """
+
+    def blacklist(self):
+        """Called by simplejwt when this token is rotated; rejects reuse."""
+        if not use_token(self):
+            raise TokenError(_('Token is blacklisted'))
+
+
+def get_token(user):
+    """Refresh token for ``user``, with profile claims."""
+    return add_profile_claims(RefreshToken.for_user(user), user)
+
+
+def use_token(token):
+    """
+    Record refresh ``token`` as used.
+
+    Returns ``False`` if it already was, which is how a replayed token is
+    detected.
+    """
+    try:
+        with transaction.atomic():
+            UsedRefreshToken.objects.create(
+                jti=token[api_settings.JTI_CLAIM], expires_at=datetime_from_epoch(token['exp'])
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def prune_used_tokens(batch_size=10_000, now=None):
+    """Delete used tokens that have expired, ``batch_size`` rows per statement."""
+    expired = UsedRefreshToken.objects.filter(expires_at__lte=now or timezone.now())
+    deleted = 0
+    while True:
+        jtis = list(expired.values_list('jti', flat=True)[:batch_size])
+        if not jtis:
+            return deleted
+        deleted += UsedRefreshToken.objects.filter(jti__in=jtis).delete()[0]
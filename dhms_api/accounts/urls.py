@@ -6,6 +6,7 @@ from .views import (
     RegisterView,
     LogoutView,
     CurrentUserView,
+    StudentImportView,
 )
 
 app_name = 'accounts'
@@ -17,4 +18,7 @@ urlpatterns = [
     path('auth/logout/', LogoutView.as_view(), name='logout'),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('auth/me/', CurrentUserView.as_view(), name='current_user'),
+    
+    # Administration
+    path('admin/students/import/', StudentImportView.as_view(), name='student_import'),
 ]
@@ -1,10 +1,18 @@
+import csv
+import io
+
 from rest_framework import status, generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.utils.http import parse_etags
+from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 from .serializers import (
@@ -12,7 +20,12 @@ from .serializers import (
     UserRegistrationSerializer,
     CustomTokenObtainPairSerializer,
     CurrentUserSerializer,
+    StudentImportSerializer,
 )
+from .current_user import current_user_payload
+from .importers import format_for, import_students, upload_rows
+from .tokens import get_token, use_token
+from dhms_api.permissions import IsAdmin
 
 User = get_user_model()
 
@@ -65,7 +78,7 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
         
         # Generate tokens for the new user
-        refresh = RefreshToken.for_user(user)
+        refresh = get_token(user)
         
         return Response({
             'success': True,
@@ -83,14 +96,14 @@ class RegisterView(generics.CreateAPIView):
 
 
 class LogoutView(APIView):
-    """Logout view that blacklists the refresh token."""
+    """Logout view that revokes the refresh token."""
     
     permission_classes = [IsAuthenticated]
     
     @extend_schema(
         tags=['auth'],
         summary='Logout',
-        description='Logout user and blacklist the refresh token.',
+        description='Logout user and revoke the refresh token.',
         responses={
             200: OpenApiResponse(description='Logout successful'),
             400: OpenApiResponse(description='Invalid token'),
@@ -100,8 +113,7 @@ class LogoutView(APIView):
         try:
             refresh_token = request.data.get('refresh')
             if refresh_token:
-                token = RefreshToken(refresh_token)
-                token.blacklist()
+                use_token(RefreshToken(refresh_token))
             return Response({
                 'success': True,
                 'message': 'Logged out successfully'
@@ -121,14 +133,82 @@ class CurrentUserView(APIView):
     @extend_schema(
         tags=['auth'],
         summary='Get Current User',
-        description='Get the currently authenticated user information with permissions.',
+        description=(
+            'Get the currently authenticated user information with permissions and role profile. '
+            'Send the returned ETag in If-None-Match to get 304 while nothing changed.'
+        ),
         responses={
             200: CurrentUserSerializer,
+            304: OpenApiResponse(description='Not modified'),
         }
     )
     def get(self, request):
-        serializer = CurrentUserSerializer(request.user)
+        try:
+            etag, data = current_user_payload(request.user.pk)
+        except User.DoesNotExist:
+            # Deleted after its claims token was issued; nothing is cached.
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({
+                'success': True,
+                'user': data
+            })
+        response['ETag'] = etag
+        # Browsers may keep the response but must revalidate it each time.
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class StudentImportView(APIView):
+    """Create students in bulk from a registrar export."""
+    
+    permission_classes = [IsAdmin]
+    parser_classes = [MultiPartParser]
+    
+    @extend_schema(
+        tags=['admin'],
+        summary='Import Students',
+        description=(
+            'Upload a CSV (with a header row) or JSONL export with one student per record. '
+            'Valid rows are created; the rest are reported per line. At most 1,000 rows, of which at most '
+            '50 may set a password; use manage.py import_students for larger files.'
+        ),
+        request={'multipart/form-data': StudentImportSerializer},
+    )
+    def post(self, request):
+        serializer = StudentImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'success': False, 'errors': serializer.errors}, status=400)
+        
+        upload = serializer.validated_data['file']
+        fmt = serializer.validated_data.get('format') or format_for(upload.name)
+        if fmt is None:
+            return Response({
+                'success': False,
+                'errors': {'format': ['Cannot tell the format from the file name; pass csv or jsonl.']}
+            }, status=400)
+        
+        text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            # Hashed here, one at a time: a process pool per request would fork
+            # inside the web worker.
+            created, errors = import_students(upload_rows(text, fmt), workers=1)
+        except ValidationError as exc:
+            return Response({'success': False, 'errors': exc.detail}, status=400)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # The upload is read in full first, so nothing has been imported.
+            return Response({'success': False, 'errors': {'file': [f'Cannot read the file: {exc}']}}, status=400)
+        finally:
+            text.detach()
+        
         return Response({
             'success': True,
-            'user': serializer.data
-        })
+            'message': f'{created} students imported',
+            'data': {
+                'created': created,
+                'failed': len(errors),
+                'errors': errors,
+            }
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
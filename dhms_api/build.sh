@@ -15,6 +15,9 @@ pip3 install -r requirements.txt
 # Run database migrations (important step for Django setup)
 python3 manage.py migrate --no-input
 
+# Create the shared cache table (no-op when it exists or another backend is configured)
+python3 manage.py createcachetable
+
 # Collect static files (optional)
 python3 manage.py collectstatic --no-input
 
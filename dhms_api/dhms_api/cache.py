@@ -0,0 +1,263 @@
+"""
+Two-tier cache for running several workers against one database.
+
+``TieredCache`` is a Django cache backend. Each process keeps a small LRU of
+recently used entries, held for at most ``LOCAL_TIMEOUT`` seconds, in front
+of a shared backend (another entry of ``CACHES``, named by ``SHARED``) that
+every worker reads and writes. Reads try the process first, then the shared
+backend; writes and deletes go to both. Another worker's deletes reach this
+process when its local copy expires, so local entries are stale for at most
+``LOCAL_TIMEOUT`` seconds.
+
+``Namespace`` groups keys under a name and a version kept in the cache. Its
+``invalidate()`` bumps the version, which orphans every key of the namespace
+at once (they expire on their own) without knowing which keys exist.
+
+Lookups are counted per namespace, the part of the key before the first
+``:``. ``TieredCache.stats()`` returns the counts of the current process.
+"""
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MISSING = object()
+OUTCOMES = ('local_hits', 'shared_hits', 'misses')
+
+# Per-process state shared by every TieredCache instance with the same
+# location, as LocMemCache does; Django builds one instance per thread.
+_locals = {}
+_stats = {}
+_locks = {}
+
+
+class LocalLRU:
+    """Bounded in-process store of pickled values with per-entry expiry."""
+
+    def __init__(self, max_entries, lock):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = lock
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, pickled = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            self.delete(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, pickled)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache(BaseCache):
+    """
+    In-process LRU in front of a shared cache.
+
+    OPTIONS: ``SHARED`` (alias of the shared cache, default ``'shared'``),
+    ``MAX_ENTRIES`` (local entries, default 1000) and ``LOCAL_TIMEOUT``
+    (seconds an entry is kept locally, default 5).
+    """
+
+    def __init__(self, location, params):
+        options = params.get('OPTIONS', {})
+        params = {**params, 'OPTIONS': {**options, 'MAX_ENTRIES': options.get('MAX_ENTRIES', 1000)}}
+        super().__init__(params)
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        lock = _locks.setdefault(location, threading.Lock())
+        with lock:
+            self.local = _locals.setdefault(location, LocalLRU(self._max_entries, lock))
+            self._stats = _stats.setdefault(location, Counter())
+        self._stats_lock = lock
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def _count(self, key, outcome):
+        with self._stats_lock:
+            self._stats[key.partition(':')[0], outcome] += 1
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.local.get(local_key)
+        if value is not _MISSING:
+            self._count(key, 'local_hits')
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._count(key, 'misses')
+            return default
+        self._count(key, 'shared_hits')
+        self.local.set(local_key, value, self.local_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        found, remote = {}, []
+        for key in keys:
+            value = self.local.get(self.make_and_validate_key(key, version=version))
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                self._count(key, 'local_hits')
+                found[key] = value
+        fetched = self.shared.get_many(remote, version=version) if remote else {}
+        for key in remote:
+            if key in fetched:
+                self._count(key, 'shared_hits')
+                self.local.set(self.make_and_validate_key(key, version=version), fetched[key], self.local_timeout)
+            else:
+                self._count(key, 'misses')
+        return {**found, **fetched}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self.shared.set(key, value, timeout, version=version)
+        self.local.set(local_key, value, self._local_ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        if not self.shared.add(key, value, timeout, version=version):
+            return False
+        self.local.set(local_key, value, self._local_ttl(timeout))
+        return True
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self.local.set(self.make_and_validate_key(key, version=version), value, self._local_ttl(timeout))
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        local = self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.delete(key, version=version) or local
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.local.delete(self.make_and_validate_key(key, version=version))
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        return self.local.get(local_key) is not _MISSING or self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def stats(self):
+        """Lookup counts and hit rate per namespace, and in total, for this process."""
+        with self._stats_lock:
+            counts = dict(self._stats)
+        namespaces = sorted({namespace for namespace, _ in counts})
+        report = {
+            namespace: _rates({outcome: counts.get((namespace, outcome), 0) for outcome in OUTCOMES})
+            for namespace in namespaces
+        }
+        total = _rates({outcome: sum(report[n][outcome] for n in namespaces) for outcome in OUTCOMES})
+        return {'local_entries': len(self.local), 'total': total, 'namespaces': report}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+
+def _rates(counts):
+    lookups = sum(counts.values())
+    hits = counts['local_hits'] + counts['shared_hits']
+    return {**counts, 'lookups': lookups, 'hit_rate': round(hits / lookups, 4) if lookups else None}
+
+
+class Namespace:
+    """
+    Keys under ``name``, invalidated together by ``invalidate()``.
+
+    The version is a timestamp rather than a counter, so a version lost to
+    eviction is replaced by a new one instead of restarting at a number that
+    old entries may still carry.
+    """
+
+    def __init__(self, name, timeout=DEFAULT_TIMEOUT, alias=DEFAULT_CACHE_ALIAS):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+        self.version_key = f'versions:{name}'
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, key):
+        return f'{self.name}:{key}'
+
+    def version(self):
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, time.time_ns(), None)
+            version = self.cache.get(self.version_key)
+        return version
+
+    def get(self, key, default=None):
+        return self.cache.get(self.key(key), default, version=self.version())
+
+    def get_or_set(self, key, default):
+        """Cached value of ``key``, or ``default()`` stored for next time."""
+        version = self.version()
+        value = self.cache.get(self.key(key), _MISSING, version=version)
+        if value is _MISSING:
+            value = default()
+            self.cache.set(self.key(key), value, self.timeout, version=version)
+        return value
+
+    def set(self, key, value):
+        self.cache.set(self.key(key), value, self.timeout, version=self.version())
+
+    def delete_many(self, keys):
+        version = self.cache.get(self.version_key)
+        if version is not None:  # Without a version nothing was stored yet.
+            self.cache.delete_many([self.key(key) for key in keys], version=version)
+
+    def invalidate(self):
+        """Orphan every key of the namespace."""
+        self.cache.set(self.version_key, time.time_ns(), None)
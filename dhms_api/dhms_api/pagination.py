@@ -0,0 +1,266 @@
+import base64
+import datetime
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+
+
+# Query parameters accepted by every endpoint paged with KeysetPagination.
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(name='cursor', type=str, description='Opaque cursor from a previous page.'),
+    OpenApiParameter(name='page_size', type=int, description='Number of items per page (max 100).'),
+    OpenApiParameter(
+        name='total', type=str, enum=['estimate'],
+        description='Add an approximate total; estimated from planner statistics on PostgreSQL.',
+    ),
+]
+
+
+def estimate_count(queryset):
+    """
+    Approximate number of rows in ``queryset`` without counting them.
+
+    On PostgreSQL an unfiltered queryset reads ``pg_class.reltuples``, and a
+    filtered one takes the planner's row estimate from ``EXPLAIN``. Other
+    backends fall back to an exact ``COUNT(*)``. Returns ``(total, is_estimate)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count(), False
+
+    queryset = queryset.order_by().values('pk')
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 until the table has been vacuumed or analyzed.
+            if row and row[0] >= 0:
+                return int(row[0]), True
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows']), True
+
+
+class KeysetPagination:
+    """
+    Keyset (seek) pagination for the ``APIView`` list endpoints.
+
+    Rows are ordered by a fixed key that must end in a unique column, e.g.
+    ``('-reported_date', '-id')``. A page is fetched with a ``WHERE key < last
+    key`` predicate instead of an ``OFFSET``, so deep pages cost the same as
+    the first one. Cursors are opaque tokens that encode the boundary row's
+    key and the direction of travel.
+
+    Nullable key columns sort NULLs as the largest value, which is
+    PostgreSQL's default, so a plain b-tree index still serves the order.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    total_query_param = 'total'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+        self.next_cursor = None
+        self.previous_cursor = None
+        self.has_next = False
+        self.has_previous = False
+        self.total = None
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request):
+        """
+        Return the rows of the requested page as a list.
+
+        No ``COUNT(*)`` is issued: one extra row is fetched to learn whether
+        another page follows. A total is only computed when the client asks
+        for an estimate.
+        """
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        if request.query_params.get(self.total_query_param) == 'estimate':
+            self.total = estimate_count(queryset)
+
+        ordering = self._reversed(self.ordering) if reverse else self.ordering
+        queryset = self._load_key_columns(queryset)
+        nullable = {field.lstrip('-') for field in ordering if self._is_nullable(queryset.model, field)}
+        queryset = queryset.order_by(*(self._order_expression(field, nullable) for field in ordering))
+        if position is not None:
+            position = self._coerce_position(queryset.model, position)
+            queryset = queryset.filter(self._seek(ordering, position, nullable))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else position is not None
+
+        self.next_cursor = self.encode_cursor(rows[-1], False) if rows and has_next else None
+        self.previous_cursor = self.encode_cursor(rows[0], True) if rows and has_previous else None
+        self.has_next = self.next_cursor is not None
+        self.has_previous = self.previous_cursor is not None
+        return rows
+
+    def get_page_metadata(self):
+        metadata = {
+            'next': self.next_cursor,
+            'previous': self.previous_cursor,
+            'has_next': self.has_next,
+            'has_previous': self.has_previous,
+            'page_size': self.page_size,
+        }
+        if self.total is not None:
+            metadata['total'], metadata['total_is_estimate'] = self.total
+        return metadata
+
+    # ---- cursor encoding ----
+
+    def encode_cursor(self, row, reverse):
+        payload = {'k': [self._value(row, field) for field in self.ordering], 'r': int(reverse)}
+        raw = json.dumps(payload, default=self._json_default, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            position, reverse = payload['k'], bool(payload['r'])
+        except (ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        if not all(value is None or isinstance(value, (str, int, float)) for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _coerce_position(self, model, position):
+        """Convert cursor values to their fields' types; a value that does not fit is an invalid cursor."""
+        coerced = []
+        for field, value in zip(self.ordering, position):
+            model_field = self._key_field(model, field)
+            if value is not None and model_field is not None:
+                try:
+                    value = model_field.to_python(value)
+                except (ValidationError, ValueError, TypeError):
+                    raise NotFound(self.invalid_cursor_message)
+            coerced.append(value)
+        return coerced
+
+    # ---- query building ----
+
+    @staticmethod
+    def _reversed(ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    def _load_key_columns(self, queryset):
+        """Keep the key columns loaded when the queryset uses ``only()``, so cursors need no extra query."""
+        names, deferred = queryset.query.deferred_loading
+        if names and not deferred:
+            queryset = queryset.only(*names, *(field.lstrip('-') for field in self.ordering))
+        return queryset
+
+    @staticmethod
+    def _order_expression(field, nullable):
+        name = field.lstrip('-')
+        if name not in nullable:
+            return field
+        if field.startswith('-'):
+            return F(name).desc(nulls_first=True)
+        return F(name).asc(nulls_last=True)
+
+    @staticmethod
+    def _key_field(model, field):
+        """The model field at the end of the ``__`` path of ``field``, or None for annotations."""
+        model_field = None
+        for part in field.lstrip('-').split('__'):
+            if model is None:
+                return None
+            try:
+                model_field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            model = model_field.related_model
+        return model_field
+
+    @staticmethod
+    def _is_nullable(model, field):
+        """Whether any column on the ``__`` path of ``field`` may be NULL."""
+        for part in field.lstrip('-').split('__'):
+            try:
+                model_field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                # Annotations are expected to be non-null.
+                return False
+            if model_field.null:
+                return True
+            model = model_field.related_model
+        return False
+
+    @classmethod
+    def _seek(cls, ordering, position, nullable=()):
+        """
+        Row-value comparison ``key > position`` expanded into
+        ``(a > x) OR (a = x AND b > y) OR ...`` for mixed directions.
+        """
+        clauses = []
+        for index, field in enumerate(ordering):
+            equal = [Q(**{f"{ordering[j].lstrip('-')}__isnull": True}) if position[j] is None
+                     else Q(**{ordering[j].lstrip('-'): position[j]}) for j in range(index)]
+            clauses.append(reduce(and_, equal + [cls._after(field, position[index], field.lstrip('-') in nullable)]))
+        return reduce(or_, clauses)
+
+    @staticmethod
+    def _after(field, value, nullable):
+        """Rows strictly after ``value`` in the direction of ``field``, with NULL as the largest value."""
+        name = field.lstrip('-')
+        if field.startswith('-'):
+            if value is None:
+                return Q(**{f'{name}__isnull': False})
+            return Q(**{f'{name}__lt': value})
+        if value is None:
+            return Q(pk__in=[])
+        after = Q(**{f'{name}__gt': value})
+        return after | Q(**{f'{name}__isnull': True}) if nullable else after
+
+    @staticmethod
+    def _json_default(value):
+        # Full precision: a cursor rounded to milliseconds would skip rows.
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _value(row, field):
+        value = row
+        for part in field.lstrip('-').split('__'):
+            value = getattr(value, part)
+        return value
@@ -1,35 +1,44 @@
 from rest_framework import permissions
 
-class IsStudent(permissions.BasePermission):
+class HasRole(permissions.BasePermission):
     """
-    Allows access only to authenticated users with 'student' role.
+    Allows access only to authenticated users with the class's ``role``.
+    
+    With ``ClaimsJWTAuthentication`` the role comes from the token's claims,
+    so the check does not read the user row.
     """
+    role = None
+    
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role == 'student')
+        return bool(request.user and request.user.is_authenticated and request.user.role == self.role)
 
 
-class IsProctor(permissions.BasePermission):
+class IsStudent(HasRole):
+    """
+    Allows access only to authenticated users with 'student' role.
+    """
+    role = 'student'
+
+
+class IsProctor(HasRole):
     """
     Allows access only to authenticated users with 'proctor' role.
     """
-    def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role == 'proctor')
+    role = 'proctor'
 
 
-class IsStaffMember(permissions.BasePermission):
+class IsStaffMember(HasRole):
     """
     Allows access only to authenticated users with 'staff' role.
     """
-    def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role == 'staff')
+    role = 'staff'
 
 
-class IsSecurity(permissions.BasePermission):
+class IsSecurity(HasRole):
     """
     Allows access only to authenticated users with 'security' role.
     """
-    def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role == 'security')
+    role = 'security'
 
 
 class IsAdmin(permissions.BasePermission):
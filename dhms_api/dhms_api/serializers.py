@@ -0,0 +1,80 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class EagerLoadingMixin:
+    """
+    Lets a list serializer declare the relations it reads, so that views can
+    shape their queryset with ``Serializer.setup_eager_loading(queryset)``
+    instead of paying one query per row and relation.
+
+    ``select_related`` and ``prefetch_related`` are declared on the class.
+    The ``only()`` column list is derived from the serializer's fields; it is
+    skipped when a field cannot be traced to a concrete column (method
+    fields, ``source='*'``, properties), in which case every column loads.
+    """
+
+    select_related = ()
+    prefetch_related = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related:
+            queryset = queryset.select_related(*cls.select_related)
+        if cls.prefetch_related:
+            queryset = queryset.prefetch_related(*cls.prefetch_related)
+        columns = cls.get_loaded_columns()
+        if columns:
+            queryset = queryset.only(*columns)
+        return queryset
+
+    @classmethod
+    def get_loaded_columns(cls):
+        """Column paths read by the serializer, or ``None`` to load everything."""
+        if '_loaded_columns' not in cls.__dict__:
+            paths = _serializer_paths(cls(), cls.Meta.model)
+            if paths is not None:
+                # Followed relations must be loaded to be traversed.
+                paths.update(path for path in cls.select_related if not _has_children(path, paths))
+            cls._loaded_columns = sorted(paths) if paths is not None else None
+        return cls._loaded_columns
+
+
+def _has_children(path, paths):
+    return any(other.startswith(f'{path}__') for other in paths)
+
+
+def _serializer_paths(serializer, model, prefix=''):
+    paths = set()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or isinstance(field, (serializers.SerializerMethodField, serializers.ListSerializer)):
+            return None
+        path = _column_path(model, field.source_attrs)
+        if path is None:
+            return None
+        if isinstance(field, serializers.BaseSerializer):
+            nested = _serializer_paths(field, field.Meta.model, f'{prefix}{path}__')
+            if nested is None:
+                return None
+            paths.update(nested)
+        else:
+            paths.add(f'{prefix}{path}')
+    return paths
+
+
+def _column_path(model, attrs):
+    """``'room__dorm__name'`` for ``['room', 'dorm', 'name']`` if every step is a concrete field."""
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete:
+            return None
+        if index < len(attrs) - 1:
+            if not field.is_relation:
+                return None
+            model = field.related_model
+    return '__'.join(attrs)
@@ -43,7 +43,6 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
-    'rest_framework_simplejwt.token_blacklist',
     'drf_spectacular',
     'django_filters',
     'corsheaders',
@@ -120,6 +119,43 @@ else:
         }
     }
 
+# -------------------------
+# Cache
+# -------------------------
+# Every worker keeps a small in-process cache in front of a shared backend
+# picked by CACHE_BACKEND: "db" (default, the dhms_cache table; create it with
+# `manage.py createcachetable`), "file" (a directory on a disk shared by the
+# workers) or "redis" (any Redis-compatible server; needs the redis package).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "db")
+SHARED_CACHES = {
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.getenv("CACHE_LOCATION", "dhms_cache"),
+        'OPTIONS': {'MAX_ENTRIES': 100_000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv("CACHE_LOCATION", "/var/tmp/dhms_cache"),
+        'OPTIONS': {'MAX_ENTRIES': 100_000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv("CACHE_LOCATION", "redis://localhost:6379/0"),
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'dhms_api.cache.TieredCache',
+        'LOCATION': 'dhms',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'MAX_ENTRIES': int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", 1000)),
+            'LOCAL_TIMEOUT': int(os.getenv("CACHE_LOCAL_TIMEOUT", 5)),
+        },
+    },
+    'shared': SHARED_CACHES[CACHE_BACKEND],
+}
+
 # -------------------------
 # Password Validation
 # -------------------------
@@ -130,6 +166,40 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# -------------------------
+# Password Hashing
+# -------------------------
+# PASSWORD_HASHER picks the algorithm new passwords are hashed with: pbkdf2_sha256,
+# scrypt or argon2 (needs argon2-cffi). The others stay listed so existing hashes
+# still verify; they, and hashes made with other work factors than the ones below,
+# are rehashed on the user's next successful login. Unset work factors use
+# Django's defaults.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2_sha256")
+PASSWORD_HASHING = {
+    'pbkdf2_sha256': {
+        'iterations': os.getenv("PBKDF2_ITERATIONS"),
+    },
+    'scrypt': {
+        'work_factor': os.getenv("SCRYPT_WORK_FACTOR"),
+        'block_size': os.getenv("SCRYPT_BLOCK_SIZE"),
+        'parallelism': os.getenv("SCRYPT_PARALLELISM"),
+    },
+    'argon2': {
+        'time_cost': os.getenv("ARGON2_TIME_COST"),
+        'memory_cost': os.getenv("ARGON2_MEMORY_COST"),
+        'parallelism': os.getenv("ARGON2_PARALLELISM"),
+    },
+}
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2_sha256': 'accounts.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.ScryptPasswordHasher',
+    'argon2': 'accounts.hashers.Argon2PasswordHasher',
+}
+PASSWORD_HASHERS = sorted(
+    PASSWORD_HASHER_CLASSES.values(),
+    key=lambda path: path != PASSWORD_HASHER_CLASSES.get(PASSWORD_HASHER),
+)
+
 # -------------------------
 # Internationalization
 # -------------------------
@@ -159,7 +229,7 @@ CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "").split(",") if not D
 # -------------------------
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -185,6 +255,7 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.CustomTokenRefreshSerializer",
 }
 
 # -------------------------
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SystemConfiguration
+from .models import SystemConfiguration, DormCounters, GlobalCounter, GateDailyStats, CodeSequence
 
 
 @admin.register(SystemConfiguration)
@@ -23,3 +23,51 @@ class SystemConfigurationAdmin(admin.ModelAdmin):
         if len(obj.value) > 50:
             return f"{obj.value[:50]}..."
         return obj.value
+
+
+@admin.register(DormCounters)
+class DormCountersAdmin(admin.ModelAdmin):
+    """Admin configuration for DormCounters model."""
+    
+    list_display = ('dorm', 'pending_maintenance', 'pending_laundry', 'active_penalties', 'updated_at')
+    readonly_fields = ('dorm', 'pending_maintenance', 'pending_laundry', 'active_penalties', 'updated_at')
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(GlobalCounter)
+class GlobalCounterAdmin(admin.ModelAdmin):
+    """Admin configuration for GlobalCounter model."""
+    
+    list_display = ('name', 'value', 'updated_at')
+    readonly_fields = ('name', 'value', 'updated_at')
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(GateDailyStats)
+class GateDailyStatsAdmin(admin.ModelAdmin):
+    """Admin configuration for GateDailyStats model."""
+    
+    list_display = ('day', 'post', 'verified', 'taken_out', 'updated_at')
+    list_filter = ('post',)
+    readonly_fields = ('day', 'post', 'verified', 'taken_out', 'updated_at')
+    ordering = ('-day', 'post')
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(CodeSequence)
+class CodeSequenceAdmin(admin.ModelAdmin):
+    """Admin configuration for CodeSequence model."""
+    
+    list_display = ('prefix', 'year', 'next_value', 'updated_at')
+    list_filter = ('prefix',)
+    readonly_fields = ('prefix', 'year', 'next_value', 'updated_at')
+    ordering = ('prefix', '-year')
+    
+    def has_add_permission(self, request):
+        return False
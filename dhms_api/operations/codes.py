@@ -0,0 +1,135 @@
+"""
+Human-readable record codes such as ``MNT-2026-0000042``.
+
+Codes are ``{PREFIX}-{year}-{number}`` with the number zero-padded to seven
+digits, so they stay short, sort in issue order within a prefix and year,
+and can never collide. Numbers come from ``CodeSequence`` rows, one per
+prefix and year. Each worker reserves ``BLOCK_SIZE`` numbers at a time with
+one conditional ``UPDATE`` and hands them out from memory, so most inserts
+cost no extra query. Numbers left in a block when a worker exits are never
+reused; codes have gaps but no duplicates.
+
+A block reserved inside a transaction is only shared with other threads
+once that transaction commits. Until then it is private to the
+transaction, and it is dropped if the transaction rolls back, since the
+reservation itself is rolled back too and those numbers will be handed out
+again.
+"""
+import threading
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CodeSequence
+
+BLOCK_SIZE = 100
+
+MAINTENANCE = 'MNT'
+LAUNDRY = 'LAU'
+PENALTY = 'PEN'
+STUDENT = 'STU'
+PROCTOR = 'PROC'
+STAFF = 'STF'
+SECURITY = 'SEC'
+
+_lock = threading.Lock()
+_shared = {}  # (prefix, year) -> committed _Block, used by every thread
+_local = threading.local()  # .pending: (prefix, year) -> _Block not yet committed
+
+
+class _Block:
+    """Numbers ``[next_value, end)`` reserved for one prefix and year."""
+
+    def __init__(self, key, next_value, end):
+        self.key = key
+        self.next_value = next_value
+        self.end = end
+
+    def take(self):
+        if self.next_value >= self.end:
+            return None
+        value = self.next_value
+        self.next_value += 1
+        return value
+
+    def publish(self):
+        """Share the rest of the block with every thread."""
+        _pending().pop(self.key, None)
+        with _lock:
+            _shared[self.key] = self
+
+
+def next_code(prefix, year=None):
+    """Return the next unused code for ``prefix`` in ``year`` (default: this year)."""
+    year = year or timezone.localdate().year
+    return _format(prefix, year, _next_value((prefix, year)))
+
+
+def next_codes(prefix, count, year=None):
+    """Return ``count`` consecutive unused codes, reserved with one query."""
+    year = year or timezone.localdate().year
+    if count <= 0:
+        return []
+    block = _reserve((prefix, year), count)
+    return [_format(prefix, year, value) for value in range(block.next_value, block.end)]
+
+
+def _format(prefix, year, value):
+    return f'{prefix}-{year}-{value:07d}'
+
+
+def _pending():
+    if not hasattr(_local, 'pending'):
+        _local.pending = {}
+    return _local.pending
+
+
+def _next_value(key):
+    block = _pending().get(key)
+    if block is not None and _is_current(block):
+        value = block.take()
+        if value is not None:
+            return value
+
+    with _lock:
+        block = _shared.get(key)
+        value = block.take() if block is not None else None
+    if value is not None:
+        return value
+
+    block = _reserve(key)
+    value = block.take()
+    if connection.in_atomic_block:
+        _pending()[key] = block
+    # Runs at once outside a transaction.
+    transaction.on_commit(block.publish)
+    return value
+
+
+def _is_current(block):
+    """
+    Whether ``block`` was reserved in the transaction that is still open.
+
+    Django drops on-commit callbacks registered in a transaction or savepoint
+    that rolls back, so a block whose ``publish`` is no longer queued is
+    either committed (and shared) or was rolled back.
+    """
+    return any(entry[1] == block.publish for entry in connection.run_on_commit)
+
+
+def _reserve(key, size=None):
+    prefix, year = key
+    size = size or BLOCK_SIZE
+    sequence = CodeSequence.objects.filter(prefix=prefix, year=year)
+    with transaction.atomic():
+        if not sequence.update(next_value=F('next_value') + size):
+            try:
+                with transaction.atomic():
+                    CodeSequence.objects.create(prefix=prefix, year=year, next_value=1 + size)
+                return _Block(key, 1, 1 + size)
+            except IntegrityError:
+                # Another worker created the row first.
+                sequence.update(next_value=F('next_value') + size)
+        end = sequence.values_list('next_value', flat=True).get()
+    return _Block(key, end - size, end)
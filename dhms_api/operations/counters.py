@@ -0,0 +1,160 @@
+"""
+Incrementally maintained dashboard counters.
+
+Maintenance requests are counted against the dorm of their room; laundry
+forms and penalties against the dorm of the student's active room
+assignment, matching what the proctor dashboard used to compute with
+joins. Global counters, such as the number of maintenance jobs open to
+staff, live in ``GlobalCounter`` rows. ``rebuild_dorm_counters`` and
+``rebuild_global_counters`` are the authoritative recomputations.
+"""
+from django.db.models import F, IntegerField, OuterRef, Subquery
+
+from accounts.models import Student
+from staff.models import Dorm
+from students.models import RoomAssignment, MaintenanceRequest, LaundryForm, Penalty
+from .models import DormCounters, GlobalCounter
+
+
+COUNTER_FIELDS = ('pending_maintenance', 'pending_laundry', 'active_penalties')
+
+AVAILABLE_JOBS = 'available_jobs'
+
+# Source queryset for every global counter, used to rebuild it.
+GLOBAL_COUNTERS = {
+    AVAILABLE_JOBS: lambda: MaintenanceRequest.objects.filter(
+        status=MaintenanceRequest.RequestStatus.APPROVED_BY_PROCTOR
+    ),
+}
+
+
+class SubqueryCount(Subquery):
+    """``COUNT(*)`` over a correlated queryset, usable inside ``annotate()``."""
+
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
+
+
+def dorms_of_room(room_id):
+    """Dorm of the given room, as a values queryset."""
+    return Dorm.objects.filter(rooms__pk=room_id).values('pk')
+
+
+def dorms_of_student(student_id):
+    """Dorms in which the student currently holds an active assignment."""
+    return RoomAssignment.objects.filter(
+        student_id=student_id,
+        status=RoomAssignment.AssignmentStatus.ACTIVE,
+    ).values('room__dorm_id')
+
+
+def adjust_dorm_counters(dorms, **deltas):
+    """
+    Apply signed deltas to the counters of every dorm in ``dorms``.
+
+    ``dorms`` is a values queryset or an iterable of dorm ids. The update is
+    a single ``UPDATE ... SET f = f + delta`` so concurrent writers never
+    lose increments. Dorms without a counters row are skipped; the row is
+    rebuilt from scratch the next time it is read.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return 0
+    return DormCounters.objects.filter(dorm_id__in=dorms).update(**changes)
+
+
+def student_counter_totals(student_id):
+    """Pending laundry and active penalties that follow a student between dorms."""
+    totals = Student.objects.filter(pk=student_id).annotate(
+        pending_laundry=SubqueryCount(LaundryForm.objects.filter(
+            student=OuterRef('pk'), status=LaundryForm.FormStatus.PENDING_PROCTOR
+        ).values('pk')),
+        active_penalties=SubqueryCount(Penalty.objects.filter(
+            student=OuterRef('pk'), status=Penalty.PenaltyStatus.ACTIVE
+        ).values('pk')),
+    ).values('pending_laundry', 'active_penalties').first()
+    return totals or {'pending_laundry': 0, 'active_penalties': 0}
+
+
+def rebuild_dorm_counters(dorm_ids=None):
+    """
+    Recompute counters from the source tables and upsert them.
+
+    Returns the number of dorms rebuilt.
+    """
+    dorms = Dorm.objects.all()
+    if dorm_ids is not None:
+        dorms = dorms.filter(pk__in=dorm_ids)
+
+    residents = RoomAssignment.objects.filter(
+        room__dorm=OuterRef(OuterRef('pk')),
+        status=RoomAssignment.AssignmentStatus.ACTIVE,
+    ).values('student_id')
+
+    rows = dorms.annotate(
+        n_pending_maintenance=SubqueryCount(MaintenanceRequest.objects.filter(
+            room__dorm=OuterRef('pk'), status=MaintenanceRequest.RequestStatus.PENDING_PROCTOR
+        ).values('pk')),
+        n_pending_laundry=SubqueryCount(LaundryForm.objects.filter(
+            student__in=residents, status=LaundryForm.FormStatus.PENDING_PROCTOR
+        ).values('pk')),
+        n_active_penalties=SubqueryCount(Penalty.objects.filter(
+            student__in=residents, status=Penalty.PenaltyStatus.ACTIVE
+        ).values('pk')),
+    ).values_list('pk', 'n_pending_maintenance', 'n_pending_laundry', 'n_active_penalties')
+
+    counters = [
+        DormCounters(
+            dorm_id=dorm_id,
+            pending_maintenance=pending_maintenance,
+            pending_laundry=pending_laundry,
+            active_penalties=active_penalties,
+        )
+        for dorm_id, pending_maintenance, pending_laundry, active_penalties in rows
+    ]
+    DormCounters.objects.bulk_create(
+        counters,
+        update_conflicts=True,
+        unique_fields=['dorm'],
+        update_fields=[*COUNTER_FIELDS, 'updated_at'],
+    )
+    return len(counters)
+
+
+def get_dorm_counters(dorm_id):
+    """Single-row lookup of a dorm's counters, rebuilding the row if it is missing."""
+    try:
+        return DormCounters.objects.select_related('dorm').get(pk=dorm_id)
+    except DormCounters.DoesNotExist:
+        rebuild_dorm_counters([dorm_id])
+        return DormCounters.objects.select_related('dorm').get(pk=dorm_id)
+
+
+def adjust_global_counter(name, delta):
+    """Apply a signed delta to a global counter in a single UPDATE."""
+    if not delta:
+        return 0
+    return GlobalCounter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def rebuild_global_counters(names=None):
+    """
+    Recompute global counters from their source querysets.
+
+    Returns the number of counters rebuilt.
+    """
+    names = list(GLOBAL_COUNTERS) if names is None else names
+    for name in names:
+        GlobalCounter.objects.update_or_create(
+            name=name, defaults={'value': GLOBAL_COUNTERS[name]().count()}
+        )
+    return len(names)
+
+
+def get_global_counter(name):
+    """Value of a global counter, rebuilding it if the row is missing."""
+    value = GlobalCounter.objects.filter(name=name).values_list('value', flat=True).first()
+    if value is None:
+        rebuild_global_counters([name])
+        value = GlobalCounter.objects.values_list('value', flat=True).get(name=name)
+    return value
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from operations.counters import rebuild_dorm_counters, rebuild_global_counters
+from operations.rollups import rebuild_gate_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-dorm, global and gate dashboard counters from the source tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dorm', type=int, action='append', dest='dorm_ids',
+            help='Only rebuild the given dorm id (may be repeated); skips global and gate counters.',
+        )
+        parser.add_argument(
+            '--gate-days', type=int, default=1,
+            help='Number of local days, ending today, of gate rollups to rebuild.',
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_dorm_counters(options['dorm_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt counters for {rebuilt} dorm(s).'))
+        
+        if not options['dorm_ids']:
+            rebuilt = rebuild_global_counters()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} global counter(s).'))
+            
+            today = timezone.localdate()
+            rebuilt = sum(
+                rebuild_gate_stats(today - timedelta(days=offset))
+                for offset in range(options['gate_days'])
+            )
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} gate rollup row(s).'))
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-17 03:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operations', '0001_initial'),
+        ('staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DormCounters',
+            fields=[
+                ('dorm', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to='staff.dorm')),
+                ('pending_maintenance', models.IntegerField(default=0)),
+                ('pending_laundry', models.IntegerField(default=0)),
+                ('active_penalties', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dorm Counters',
+                'verbose_name_plural': 'Dorm Counters',
+                'db_table': 'dorm_counters',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 03:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operations', '0002_dormcounters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GlobalCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Global Counter',
+                'verbose_name_plural': 'Global Counters',
+                'db_table': 'global_counters',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-17 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operations', '0003_globalcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GateDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('post', models.CharField(blank=True, default='', max_length=50)),
+                ('verified', models.IntegerField(default=0)),
+                ('taken_out', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Gate Daily Stats',
+                'verbose_name_plural': 'Gate Daily Stats',
+                'db_table': 'gate_daily_stats',
+                'unique_together': {('day', 'post')},
+            },
+        ),
+    ]
@@ -30,3 +30,94 @@ class SystemConfiguration(models.Model):
     
     def __str__(self):
         return f"{self.key}: {self.value[:50]}"
+
+
+class DormCounters(models.Model):
+    """
+    Materialized per-dorm counters for the proctor dashboard.
+    
+    Kept up to date incrementally by the signal handlers in
+    ``operations.signals``; ``manage.py rebuild_counters`` recomputes
+    them from the source tables.
+    """
+    
+    dorm = models.OneToOneField(
+        'staff.Dorm',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='counters'
+    )
+    pending_maintenance = models.IntegerField(default=0)
+    pending_laundry = models.IntegerField(default=0)
+    active_penalties = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'dorm_counters'
+        verbose_name = 'Dorm Counters'
+        verbose_name_plural = 'Dorm Counters'
+    
+    def __str__(self):
+        return f"Counters for {self.dorm_id}"
+
+
+class GlobalCounter(models.Model):
+    """
+    Named system-wide counter, such as the number of maintenance jobs
+    available to staff. Maintained alongside ``DormCounters``.
+    """
+    
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'global_counters'
+        verbose_name = 'Global Counter'
+        verbose_name_plural = 'Global Counters'
+    
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class GateDailyStats(models.Model):
+    """
+    Daily laundry throughput per security post, rolled up as forms are
+    verified and released so gate dashboards never scan laundry_forms.
+    """
+    
+    day = models.DateField()
+    post = models.CharField(max_length=50, blank=True, default='')
+    verified = models.IntegerField(default=0)
+    taken_out = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'gate_daily_stats'
+        verbose_name = 'Gate Daily Stats'
+        verbose_name_plural = 'Gate Daily Stats'
+        unique_together = ['day', 'post']
+    
+    def __str__(self):
+        return f"{self.post or 'Unassigned'} - {self.day}"
+
+
+class CodeSequence(models.Model):
+    """
+    Next free number for a code prefix in a year, such as ``MNT`` in 2026.
+    Workers reserve numbers in blocks; see ``operations.codes``.
+    """
+    
+    prefix = models.CharField(max_length=10)
+    year = models.IntegerField()
+    next_value = models.BigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'code_sequences'
+        verbose_name = 'Code Sequence'
+        verbose_name_plural = 'Code Sequences'
+        unique_together = ['prefix', 'year']
+    
+    def __str__(self):
+        return f"{self.prefix}-{self.year}: {self.next_value}"
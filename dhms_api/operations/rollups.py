@@ -0,0 +1,95 @@
+"""
+Daily laundry rollups per security post.
+
+Days are local (``TIME_ZONE``) calendar days expressed as half-open UTC
+ranges, so the underlying timestamp columns can be range-scanned through
+their indexes instead of being cast row by row.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from students.models import LaundryForm
+from .models import GateDailyStats
+
+
+def local_day_bounds(day=None):
+    """Return the aware ``[start, end)`` datetimes covering a local calendar day."""
+    if day is None:
+        day = timezone.localdate()
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def local_day_filter(field, day=None):
+    """Keyword filter selecting rows whose ``field`` falls on a local day."""
+    start, end = local_day_bounds(day)
+    return {f'{field}__gte': start, f'{field}__lt': end}
+
+
+def record_gate_event(moment, post, verified=0, taken_out=0):
+    """Add verified/taken-out events to the rollup row of ``moment``'s local day and ``post``."""
+    day = timezone.localdate(moment)
+    post = post or ''
+    changes = {}
+    if verified:
+        changes['verified'] = F('verified') + verified
+    if taken_out:
+        changes['taken_out'] = F('taken_out') + taken_out
+    if not changes:
+        return
+
+    if GateDailyStats.objects.filter(day=day, post=post).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            GateDailyStats.objects.create(day=day, post=post, verified=verified, taken_out=taken_out)
+    except IntegrityError:
+        # Another writer created the row first.
+        GateDailyStats.objects.filter(day=day, post=post).update(**changes)
+
+
+def get_gate_stats(post, day=None):
+    """Rollup row for a post on a local day (unsaved zeros if nothing happened yet)."""
+    day = day or timezone.localdate()
+    post = post or ''
+    return (
+        GateDailyStats.objects.filter(day=day, post=post).first()
+        or GateDailyStats(day=day, post=post)
+    )
+
+
+def rebuild_gate_stats(day=None):
+    """
+    Recompute every post's rollup for a local day from laundry_forms.
+
+    Returns the number of rows written.
+    """
+    day = day or timezone.localdate()
+    verified = dict(
+        LaundryForm.objects.filter(**local_day_filter('verification_date', day))
+        .order_by()
+        .values_list('verified_by__assigned_post')
+        .annotate(total=Count('pk'))
+    )
+    taken_out = dict(
+        LaundryForm.objects.filter(**local_day_filter('taken_out_at', day))
+        .order_by()
+        .values_list('taken_out_by__assigned_post')
+        .annotate(total=Count('pk'))
+    )
+
+    rows = {}
+    for post, total in verified.items():
+        rows.setdefault(post or '', GateDailyStats(day=day, post=post or '')).verified += total
+    for post, total in taken_out.items():
+        rows.setdefault(post or '', GateDailyStats(day=day, post=post or '')).taken_out += total
+
+    with transaction.atomic():
+        GateDailyStats.objects.filter(day=day).delete()
+        GateDailyStats.objects.bulk_create(rows.values())
+    return len(rows)
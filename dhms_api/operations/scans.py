@@ -0,0 +1,132 @@
+"""
+Batch ingestion of gate QR scans.
+
+Gate scanners queue scans while offline and upload them in one request.
+``ingest_scans`` resolves the whole batch with one ``form_code__in`` query
+and releases every bag with at most two bulk workflow transitions:
+``take_out`` for forms that were already verified and ``verify_and_take_out``
+for forms still awaiting verification, which the gate verifies and releases
+in one go, as the public QR link does. Each row keeps the time and guard of
+its own scan; the gate rollups follow from ``transition_applied``.
+
+Uploads are idempotent: a scan that was already applied (same form, guard
+and time) is reported as ``replayed`` instead of failing, so a device can
+resend a batch whose response it never received.
+"""
+from django.db import transaction
+from django.db.models import Case, Value, When
+
+from accounts.models import Security
+from students.models import LaundryForm
+from students.workflows import apply_bulk_transition
+
+TAKEN_OUT = 'taken_out'
+REPLAYED = 'replayed'
+
+INVALID_CODE = 'Invalid QR code'
+UNKNOWN_SECURITY = 'Security profile not found'
+ALREADY_TAKEN_OUT = 'Laundry already taken out'
+NOT_VERIFIED = 'Laundry not yet verified'
+
+_Status = LaundryForm.FormStatus
+
+# Workflow transition that releases a bag scanned in each status.
+RELEASES = {
+    _Status.VERIFIED_BY_SECURITY: 'take_out',
+    _Status.APPROVED_BY_PROCTOR: 'verify_and_take_out',
+}
+
+
+def ingest_scans(scans):
+    """
+    Apply a batch of gate scans.
+
+    ``scans`` are dicts with ``form_code``, ``scanned_at`` (aware datetime)
+    and ``security_id``. When a code appears more than once, its earliest
+    scan is the one applied. Returns ``{form_code: result}`` where a result
+    has ``success`` and ``status`` plus ``outcome`` (``taken_out`` or
+    ``replayed``) on success or ``error`` on failure.
+    """
+    first = {}
+    for scan in sorted(scans, key=lambda scan: scan['scanned_at']):
+        first.setdefault(scan['form_code'], scan)
+
+    guards = set(
+        Security.objects.filter(pk__in={scan['security_id'] for scan in first.values()})
+        .values_list('pk', flat=True)
+    )
+
+    results = {}
+    release = {status: {} for status in RELEASES}
+    with transaction.atomic():
+        forms = (
+            LaundryForm.objects.select_for_update()
+            .filter(form_code__in=list(first))
+            .order_by()
+            .values_list('form_code', 'pk', 'status', 'taken_out_by_id', 'taken_out_at')
+        )
+        found = {form[0]: form[1:] for form in forms}
+
+        for code, scan in first.items():
+            if code not in found:
+                results[code] = _failed(INVALID_CODE)
+                continue
+            pk, status, taken_out_by_id, taken_out_at = found[code]
+            if status == _Status.TAKEN_OUT:
+                if (taken_out_by_id, taken_out_at) == (scan['security_id'], scan['scanned_at']):
+                    results[code] = _succeeded(REPLAYED)
+                else:
+                    results[code] = _failed(ALREADY_TAKEN_OUT, status)
+            elif scan['security_id'] not in guards:
+                results[code] = _failed(UNKNOWN_SECURITY, status)
+            elif status in release:
+                release[status][pk] = (code, scan)
+            else:
+                results[code] = _failed(NOT_VERIFIED, status)
+
+        for status, rows in release.items():
+            if not rows:
+                continue
+            moved, current = _release(status, rows)
+            for pk, (code, _) in rows.items():
+                if pk in moved:
+                    results[code] = _succeeded(TAKEN_OUT)
+                elif current.get(pk) == _Status.TAKEN_OUT:
+                    results[code] = _failed(ALREADY_TAKEN_OUT, _Status.TAKEN_OUT)
+                else:
+                    results[code] = _failed(NOT_VERIFIED, current.get(pk))
+
+    return results
+
+
+def _release(status, rows):
+    """
+    Move ``rows`` (``{pk: (code, scan)}``) out of ``status`` through its
+    release transition. Returns ``apply_bulk_transition``'s ``(moved, current)``.
+    """
+    scanned_at = _per_row(rows, 'scanned_at', LaundryForm._meta.get_field('taken_out_at'))
+    security = _per_row(rows, 'security_id', LaundryForm._meta.get_field('taken_out_by').target_field)
+    changes = {'taken_out_at': scanned_at, 'taken_out_by': security}
+    if status == _Status.APPROVED_BY_PROCTOR:
+        changes.update(verification_date=scanned_at, verified_by=security)
+    moved, current = apply_bulk_transition(LaundryForm, RELEASES[status], list(rows), changes)
+    return set(moved), current
+
+
+def _per_row(rows, key, output_field):
+    """``CASE pk WHEN ... THEN scan[key]`` over ``rows``."""
+    return Case(
+        *[When(pk=pk, then=Value(scan[key])) for pk, (_, scan) in rows.items()],
+        output_field=output_field,
+    )
+
+
+def _succeeded(outcome):
+    return {'success': True, 'outcome': outcome, 'status': _Status.TAKEN_OUT}
+
+
+def _failed(error, status=None):
+    result = {'success': False, 'error': error}
+    if status is not None:
+        result['status'] = status
+    return result
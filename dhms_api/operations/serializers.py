@@ -1,3 +1,6 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 from .models import SystemConfiguration
 
@@ -18,3 +21,25 @@ class LaundryVerificationSerializer(serializers.Serializer):
 class LaundryQRScanSerializer(serializers.Serializer):
     """Serializer for washing QR scan."""
     qr_code = serializers.CharField(required=True)
+
+
+class GateScanSerializer(serializers.Serializer):
+    """One scan recorded by a gate device."""
+    # How far ahead of the server a device clock may run.
+    CLOCK_SKEW = timedelta(minutes=1)
+
+    form_code = serializers.CharField()
+    scanned_at = serializers.DateTimeField()
+    security_id = serializers.IntegerField(required=False)
+    
+    def validate_scanned_at(self, value):
+        if value > timezone.now() + self.CLOCK_SKEW:
+            raise serializers.ValidationError("Scan time is in the future.")
+        return value
+
+
+class GateScanBatchSerializer(serializers.Serializer):
+    """Serializer for uploading queued gate scans."""
+    MAX_SCANS = 1000
+
+    scans = serializers.ListField(child=GateScanSerializer(), allow_empty=False, max_length=MAX_SCANS)
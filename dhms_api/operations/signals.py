@@ -0,0 +1,246 @@
+from collections import Counter
+from datetime import datetime
+
+from django.db.models import Count, F, Min
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import Security
+from staff.models import Dorm
+from students.models import RoomAssignment, MaintenanceRequest, LaundryForm, Penalty
+from students.workflows import transition_applied
+from .counters import (
+    AVAILABLE_JOBS,
+    adjust_dorm_counters,
+    adjust_global_counter,
+    dorms_of_room,
+    dorms_of_student,
+    student_counter_totals,
+)
+from .models import DormCounters
+from .rollups import record_gate_event
+
+
+# Each tracked model maps to the foreign key that locates its dorm.
+TRACKED_LOCATORS = {
+    MaintenanceRequest: 'room_id',
+    LaundryForm: 'student_id',
+    Penalty: 'student_id',
+    RoomAssignment: 'room_id',
+}
+
+
+def _counted_state(instance):
+    """Return the (locator, status) pair for an instance, without loading deferred fields."""
+    locator = TRACKED_LOCATORS[type(instance)]
+    values = instance.__dict__
+    if 'status' not in values or locator not in values:
+        return None
+    return values[locator], values['status']
+
+
+def _post_of(security):
+    return security.assigned_post if security else ''
+
+
+def _security_post(instance, field_name):
+    """Post of the guard referenced by ``field_name``, reusing the cached instance when there is one."""
+    field = instance._meta.get_field(field_name)
+    if field.is_cached(instance):
+        return _post_of(getattr(instance, field_name))
+    security_id = getattr(instance, field.attname)
+    if security_id is None:
+        return ''
+    return Security.objects.filter(pk=security_id).values_list('assigned_post', flat=True).first()
+
+
+def _apply(instance, state, sign):
+    """
+    Add (sign=1) or remove (sign=-1) the contribution of ``instance`` in ``state``.
+    
+    Gate rollups count events, so they only ever move forward.
+    """
+    locator, status = state
+
+    if isinstance(instance, MaintenanceRequest):
+        if status == MaintenanceRequest.RequestStatus.PENDING_PROCTOR:
+            adjust_dorm_counters(dorms_of_room(locator), pending_maintenance=sign)
+        elif status == MaintenanceRequest.RequestStatus.APPROVED_BY_PROCTOR:
+            adjust_global_counter(AVAILABLE_JOBS, sign)
+    elif isinstance(instance, LaundryForm):
+        if status == LaundryForm.FormStatus.PENDING_PROCTOR:
+            adjust_dorm_counters(dorms_of_student(locator), pending_laundry=sign)
+        elif sign > 0 and status == LaundryForm.FormStatus.VERIFIED_BY_SECURITY and instance.verification_date:
+            record_gate_event(instance.verification_date, _security_post(instance, 'verified_by'), verified=1)
+        elif sign > 0 and status == LaundryForm.FormStatus.TAKEN_OUT and instance.taken_out_at:
+            record_gate_event(instance.taken_out_at, _security_post(instance, 'taken_out_by'), taken_out=1)
+    elif isinstance(instance, Penalty):
+        if status == Penalty.PenaltyStatus.ACTIVE:
+            adjust_dorm_counters(dorms_of_student(locator), active_penalties=sign)
+    elif isinstance(instance, RoomAssignment):
+        if status == RoomAssignment.AssignmentStatus.ACTIVE:
+            # The student's open laundry and penalties move with them.
+            totals = student_counter_totals(instance.student_id)
+            adjust_dorm_counters(
+                dorms_of_room(locator),
+                pending_laundry=sign * totals['pending_laundry'],
+                active_penalties=sign * totals['active_penalties'],
+            )
+
+
+@receiver(post_init, sender=MaintenanceRequest)
+@receiver(post_init, sender=LaundryForm)
+@receiver(post_init, sender=Penalty)
+@receiver(post_init, sender=RoomAssignment)
+def snapshot_counted_state(sender, instance, **kwargs):
+    """
+    Remember the state an instance was loaded with, so that post_save can
+    tell which counters a save moved.
+    """
+    instance._counted_state = _counted_state(instance)
+
+
+@receiver(post_save, sender=MaintenanceRequest)
+@receiver(post_save, sender=LaundryForm)
+@receiver(post_save, sender=Penalty)
+@receiver(post_save, sender=RoomAssignment)
+def update_counters_on_save(sender, instance, created, **kwargs):
+    """
+    Move counters when a tracked row enters or leaves its counted state.
+    """
+    new_state = _counted_state(instance)
+    old_state = None if created else getattr(instance, '_counted_state', None)
+    if new_state is None or (old_state is None and not created):
+        # Partially loaded or unknown state: leave it to the rebuild_counters command.
+        instance._counted_state = new_state
+        return
+
+    if old_state != new_state:
+        if old_state is not None:
+            _apply(instance, old_state, -1)
+        _apply(instance, new_state, 1)
+
+    instance._counted_state = new_state
+
+
+@receiver(post_delete, sender=MaintenanceRequest)
+@receiver(post_delete, sender=LaundryForm)
+@receiver(post_delete, sender=Penalty)
+@receiver(post_delete, sender=RoomAssignment)
+def update_counters_on_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted row's contribution from the counters.
+    """
+    state = getattr(instance, '_counted_state', None)
+    if state is not None:
+        _apply(instance, state, -1)
+
+
+def _adjust_per_dorm(dorm_counts, field, sign):
+    """Apply ``sign * n`` to ``field`` of each dorm in ``(dorm_id, n)`` pairs."""
+    for dorm_id, n in dorm_counts:
+        adjust_dorm_counters([dorm_id], **{field: sign * n})
+
+
+def _record_gate_events(rows, changes, count, **events):
+    """
+    Record gate ``events`` (``{event: (time column, guard column)}``) for
+    ``count`` rows moved by one UPDATE.
+
+    A batch writes each row's own scan time and guard through ``Case``
+    expressions; those rows are grouped by local day and post from the
+    table. One rollup write is made per day and post.
+    """
+    totals, grouped = {}, {}
+    for event, (moment, guard) in events.items():
+        if isinstance(changes[moment], datetime):
+            groups = [(changes[moment], _post_of(changes.get(guard)), count)]
+        elif (id(changes[moment]), id(changes[guard])) in grouped:
+            # Written from the same scans as an event already grouped.
+            groups = grouped[id(changes[moment]), id(changes[guard])]
+        else:
+            groups = grouped[id(changes[moment]), id(changes[guard])] = list(
+                LaundryForm.objects.filter(pk__in=rows).order_by()
+                .values(day=TruncDate(moment, tzinfo=timezone.get_current_timezone()),
+                        post=F(f'{guard}__assigned_post'))
+                .annotate(first=Min(moment), n=Count('pk'))
+                .values_list('first', 'post', 'n')
+            )
+        for first, post, n in groups:
+            entry = totals.setdefault((timezone.localdate(first), post or ''), [first, Counter()])
+            entry[1][event] += n
+    for (_, post), (moment, counts) in totals.items():
+        record_gate_event(moment, post, **counts)
+
+
+def _apply_transition_state(model, rows, status, sign, changes, count):
+    """
+    ``_apply`` for ``count`` rows moved by ``apply_transition``, which only
+    knows the filter that selected them and the columns it wrote.
+    """
+    if model is MaintenanceRequest:
+        if status == MaintenanceRequest.RequestStatus.PENDING_PROCTOR:
+            if count == 1:
+                adjust_dorm_counters(
+                    Dorm.objects.filter(rooms__maintenance_requests__in=rows).values('pk'),
+                    pending_maintenance=sign,
+                )
+            else:
+                _adjust_per_dorm(
+                    MaintenanceRequest.objects.filter(pk__in=rows)
+                    .order_by().values_list('room__dorm_id').annotate(n=Count('pk')),
+                    'pending_maintenance', sign,
+                )
+        elif status == MaintenanceRequest.RequestStatus.APPROVED_BY_PROCTOR:
+            adjust_global_counter(AVAILABLE_JOBS, sign * count)
+    elif model is LaundryForm:
+        if status == LaundryForm.FormStatus.PENDING_PROCTOR:
+            if count == 1:
+                adjust_dorm_counters(
+                    RoomAssignment.objects.filter(
+                        student__laundry_forms__in=rows, status=RoomAssignment.AssignmentStatus.ACTIVE
+                    ).values('room__dorm_id'),
+                    pending_laundry=sign,
+                )
+            else:
+                _adjust_per_dorm(
+                    LaundryForm.objects.filter(
+                        pk__in=rows, student__room_assignments__status=RoomAssignment.AssignmentStatus.ACTIVE
+                    ).order_by().values_list('student__room_assignments__room__dorm_id').annotate(n=Count('pk')),
+                    'pending_laundry', sign,
+                )
+        elif sign > 0 and status == LaundryForm.FormStatus.VERIFIED_BY_SECURITY and changes.get('verification_date'):
+            _record_gate_events(rows, changes, count, verified=('verification_date', 'verified_by'))
+        elif sign > 0 and status == LaundryForm.FormStatus.TAKEN_OUT and changes.get('taken_out_at'):
+            events = {'taken_out': ('taken_out_at', 'taken_out_by')}
+            if changes.get('verification_date'):
+                # Verified and released by the same scan.
+                events['verified'] = ('verification_date', 'verified_by')
+            _record_gate_events(rows, changes, count, **events)
+
+
+@receiver(transition_applied)
+def update_counters_on_transition(sender, lookup, transition, changes, count=1, **kwargs):
+    """
+    Move counters for a status change written with a single UPDATE.
+    
+    The rows' previous status is only known when the transition has a
+    single source; every transition out of a counted status does.
+    """
+    if sender not in TRACKED_LOCATORS or not count:
+        return
+    rows = sender.objects.filter(**lookup).values('pk')
+    if len(transition.sources) == 1:
+        _apply_transition_state(sender, rows, transition.sources[0], -1, changes, count)
+    _apply_transition_state(sender, rows, transition.target, 1, changes, count)
+
+
+@receiver(post_save, sender=Dorm)
+def create_dorm_counters(sender, instance, created, **kwargs):
+    """
+    Signal to create the counters row when a Dorm is created.
+    """
+    if created:
+        DormCounters.objects.get_or_create(dorm=instance)
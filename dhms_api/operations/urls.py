@@ -5,8 +5,10 @@ from .views import (
     SecurityVerifyLaundryView,
     SecurityLaundryTakenOutView,
     SecurityLaundryQRScanView,
+    SecurityLaundryScanBatchView,
     PublicLaundryTakenOutView,
     PublicLaundryStatusView,
+    CacheStatsView,
 )
 
 app_name = 'operations'
@@ -18,6 +20,10 @@ urlpatterns = [
     path('security/laundry/<int:pk>/verify/', SecurityVerifyLaundryView.as_view(), name='security_verify_laundry'),
     path('security/laundry/<int:pk>/taken-out/', SecurityLaundryTakenOutView.as_view(), name='security_laundry_taken_out'),
     path('security/laundry/scan/', SecurityLaundryQRScanView.as_view(), name='security_laundry_scan'),
+    path('security/laundry/scan/batch/', SecurityLaundryScanBatchView.as_view(), name='security_laundry_scan_batch'),
+    
+    # Admin endpoints
+    path('admin/cache/stats/', CacheStatsView.as_view(), name='cache_stats'),
     
     # Public QR code endpoints (no authentication required)
     # QR Code should contain: {BASE_URL}/aau-dhms-api/public/laundry/{form_code}/taken/
@@ -1,17 +1,24 @@
+import os
+
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.core.cache import cache
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from students.models import LaundryForm
 from students.serializers import LaundryFormListSerializer
-from .serializers import LaundryVerificationSerializer, LaundryQRScanSerializer
+from students.workflows import TransitionNotAllowed, apply_transition
+from .serializers import LaundryVerificationSerializer, LaundryQRScanSerializer, GateScanBatchSerializer
+from .scans import ingest_scans
+from .rollups import get_gate_stats, local_day_filter
 
 
-from dhms_api.permissions import IsSecurity
+from dhms_api.pagination import KeysetPagination, PAGINATION_PARAMETERS
+from dhms_api.permissions import IsAdmin, IsSecurity
 
 
 # ==================== SECURITY VIEWS ====================
@@ -28,18 +35,21 @@ class SecurityDashboardView(APIView):
         except:
             return Response({'success': False, 'error': 'Security profile not found'}, status=404)
         
+        # Local-day ranges keep the timestamp indexes usable
         stats = {
             'pending_verification': LaundryForm.objects.filter(status='approved_by_proctor').count(),
             'verified_today': LaundryForm.objects.filter(
                 status='verified_by_security',
-                verification_date__date=timezone.now().date()
+                **local_day_filter('verification_date')
             ).count(),
             'taken_out_today': LaundryForm.objects.filter(
                 status='taken_out',
-                verification_date__date=timezone.now().date()
+                **local_day_filter('taken_out_at')
             ).count(),
         }
         
+        gate = get_gate_stats(security.assigned_post)
+        
         return Response({
             'success': True,
             'data': {
@@ -50,6 +60,12 @@ class SecurityDashboardView(APIView):
                     'assigned_post': security.assigned_post,
                 },
                 'stats': stats,
+                'gate': {
+                    'post': gate.post,
+                    'date': gate.day,
+                    'verified': gate.verified,
+                    'taken_out': gate.taken_out,
+                },
             }
         })
 
@@ -59,17 +75,17 @@ class SecurityPendingLaundryView(APIView):
     
     permission_classes = [IsSecurity]
     
-    @extend_schema(tags=['security'], summary='List Pending Laundry for Verification')
+    @extend_schema(tags=['security'], summary='List Pending Laundry for Verification', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
-        forms = LaundryForm.objects.filter(
-            status='approved_by_proctor'
-        ).order_by('-approved_date')
-        
-        serializer = LaundryFormListSerializer(forms, many=True)
+        forms = LaundryFormListSerializer.setup_eager_loading(
+            LaundryForm.objects.filter(status='approved_by_proctor')
+        )
+        paginator = KeysetPagination(ordering=('-approved_date', '-id'))
+        serializer = LaundryFormListSerializer(paginator.paginate_queryset(forms, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'forms': serializer.data}
+            'data': {'forms': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
 
 
@@ -84,26 +100,24 @@ class SecurityVerifyLaundryView(APIView):
         request=LaundryVerificationSerializer
     )
     def put(self, request, pk):
-        try:
-            form = LaundryForm.objects.get(pk=pk, status='approved_by_proctor')
-        except LaundryForm.DoesNotExist:
-            return Response({'success': False, 'error': 'Form not found or not ready for verification'}, status=404)
-        
         try:
             security = request.user.security_profile
         except:
             return Response({'success': False, 'error': 'Security profile not found'}, status=404)
         
-        form.status = 'verified_by_security'
-        form.verified_by = security
-        form.verification_date = timezone.now()
-        form.verification_notes = request.data.get('verification_notes', '')
-        form.save()
+        try:
+            new_status = apply_transition(LaundryForm, 'verify', {
+                'verified_by': security,
+                'verification_date': timezone.now(),
+                'verification_notes': request.data.get('verification_notes', ''),
+            }, pk=pk)
+        except (LaundryForm.DoesNotExist, TransitionNotAllowed):
+            return Response({'success': False, 'error': 'Form not found or not ready for verification'}, status=404)
         
         return Response({
             'success': True,
             'message': 'Laundry verified',
-            'data': {'status': form.status}
+            'data': {'status': new_status}
         })
 
 
@@ -115,17 +129,22 @@ class SecurityLaundryTakenOutView(APIView):
     @extend_schema(tags=['security'], summary='Mark Laundry as Taken Out')
     def put(self, request, pk):
         try:
-            form = LaundryForm.objects.get(pk=pk, status='verified_by_security')
-        except LaundryForm.DoesNotExist:
-            return Response({'success': False, 'error': 'Form not found or not verified'}, status=404)
+            security = request.user.security_profile
+        except:
+            return Response({'success': False, 'error': 'Security profile not found'}, status=404)
         
-        form.status = 'taken_out'
-        form.save()
+        try:
+            new_status = apply_transition(LaundryForm, 'take_out', {
+                'taken_out_by': security,
+                'taken_out_at': timezone.now(),
+            }, pk=pk)
+        except (LaundryForm.DoesNotExist, TransitionNotAllowed):
+            return Response({'success': False, 'error': 'Form not found or not verified'}, status=404)
         
         return Response({
             'success': True,
             'message': 'Laundry taken out',
-            'data': {'status': form.status}
+            'data': {'status': new_status}
         })
 
 
@@ -146,19 +165,25 @@ class SecurityLaundryQRScanView(APIView):
             return Response({'success': False, 'error': 'QR code required'}, status=400)
         
         try:
-            form = LaundryForm.objects.get(form_code=qr_code)
+            form = LaundryForm.objects.select_related('student__user').get(form_code=qr_code)
         except LaundryForm.DoesNotExist:
             return Response({'success': False, 'error': 'Invalid QR code'}, status=404)
         
-        if form.status == 'taken_out':
-            return Response({'success': False, 'error': 'Laundry already taken out'}, status=400)
+        try:
+            security = request.user.security_profile
+        except:
+            return Response({'success': False, 'error': 'Security profile not found'}, status=404)
         
-        if form.status != 'verified_by_security':
+        try:
+            form.status = apply_transition(LaundryForm, 'take_out', {
+                'taken_out_by': security,
+                'taken_out_at': timezone.now(),
+            }, pk=form.pk)
+        except TransitionNotAllowed as exc:
+            if exc.status == LaundryForm.FormStatus.TAKEN_OUT:
+                return Response({'success': False, 'error': 'Laundry already taken out'}, status=400)
             return Response({'success': False, 'error': 'Laundry not yet verified'}, status=400)
         
-        form.status = 'taken_out'
-        form.save()
-        
         return Response({
             'success': True,
             'message': 'Laundry taken out',
@@ -171,6 +196,48 @@ class SecurityLaundryQRScanView(APIView):
         })
 
 
+class SecurityLaundryScanBatchView(APIView):
+    """
+    Upload scans queued by a gate device while it was offline.
+    
+    Scans without ``security_id`` are attributed to the uploading guard.
+    Replaying a batch is safe: scans already applied come back as ``replayed``.
+    A batch with a scan time ahead of the server clock is rejected.
+    """
+    
+    permission_classes = [IsSecurity]
+    
+    @extend_schema(
+        tags=['security'],
+        summary='Upload Batch of Laundry QR Scans',
+        request=GateScanBatchSerializer
+    )
+    def post(self, request):
+        try:
+            security = request.user.security_profile
+        except:
+            return Response({'success': False, 'error': 'Security profile not found'}, status=404)
+        
+        serializer = GateScanBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'success': False, 'errors': serializer.errors}, status=400)
+        
+        scans = serializer.validated_data['scans']
+        for scan in scans:
+            scan.setdefault('security_id', security.id)
+        results = ingest_scans(scans)
+        
+        succeeded = sum(result['success'] for result in results.values())
+        return Response({
+            'success': True,
+            'data': {
+                'processed': succeeded,
+                'failed': len(results) - succeeded,
+                'results': results,
+            }
+        })
+
+
 # ==================== PUBLIC QR LINK ====================
 
 class PublicLaundryTakenOutView(APIView):
@@ -233,15 +300,18 @@ class PublicLaundryTakenOutView(APIView):
         
         # Auto-Verify Logic
         # If it's approved_by_proctor, we allow security to verify AND take out in one go
+        now = timezone.now()
+        changes = {'taken_out_by': security, 'taken_out_at': now}
+        transition = 'take_out'
         if form.status == 'approved_by_proctor':
-            form.status = 'verified_by_security'
-            form.verified_by = security
-            form.verification_date = timezone.now()
-            form.save()
-            # Fall through to taken_out logic below
-            
-        if form.status != 'verified_by_security':
-             return Response({
+            transition = 'verify_and_take_out'
+            changes.update(verified_by=security, verification_date=now)
+        try:
+            form.status = apply_transition(LaundryForm, transition, changes, pk=form.pk)
+            form.taken_out_at = now
+        except TransitionNotAllowed as exc:
+            form.status = exc.status
+            return Response({
                 'success': False,
                 'error': 'Not verified',
                 'message': f'This laundry has not been verified by security yet. Current status: {form.get_status_display()}',
@@ -251,10 +321,6 @@ class PublicLaundryTakenOutView(APIView):
                 }
             }, status=400)
         
-        # Update status to taken_out
-        form.status = 'taken_out'
-        form.save()
-        
         return Response({
             'success': True,
             'message': 'Laundry status updated: Verified and Taken Out.',
@@ -264,7 +330,7 @@ class PublicLaundryTakenOutView(APIView):
                 'student_code': form.student.student_code,
                 'item_count': form.item_count,
                 'status': form.status,
-                'taken_out_at': timezone.now().isoformat(),
+                'taken_out_at': form.taken_out_at.isoformat(),
             }
         })
 
@@ -304,3 +370,29 @@ class PublicLaundryStatusView(APIView):
                 'can_take_out': form.status == 'verified_by_security',
             }
         })
+
+
+class CacheStatsView(APIView):
+    """Cache hit and miss counts of the worker serving the request."""
+    
+    permission_classes = [IsAdmin]
+    
+    @extend_schema(
+        tags=['admin'],
+        summary='Cache Statistics',
+        description=(
+            'Lookups answered by the in-process tier, by the shared backend, and misses, per key '
+            'namespace, since this worker started. Each worker counts on its own; `pid` tells them apart.'
+        ),
+    )
+    def get(self, request):
+        if not hasattr(cache, 'stats'):
+            return Response({
+                'success': False,
+                'error': 'The configured cache does not keep statistics'
+            }, status=404)
+        
+        return Response({
+            'success': True,
+            'data': {'pid': os.getpid(), **cache.stats()}
+        })
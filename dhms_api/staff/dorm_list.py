@@ -0,0 +1,27 @@
+"""
+Cached pages of ``/dorms/``.
+
+Every page of the list, keyed by its query string, lives in the ``dorms``
+cache namespace. Saving or deleting a dorm, or renaming a proctor, bumps the
+namespace version (see ``signals``), which drops all pages at once.
+"""
+from dhms_api.cache import Namespace
+from dhms_api.pagination import KeysetPagination
+
+from .models import Dorm
+from .serializers import DormListSerializer
+
+DORM_LIST = Namespace('dorms', timeout=60 * 60)
+
+
+def dorm_list_page(request):
+    """Return the ``data`` of the ``/dorms/`` page that ``request`` asks for."""
+    def build():
+        dorms = DormListSerializer.setup_eager_loading(
+            Dorm.objects.filter(status='active')
+        )
+        paginator = KeysetPagination(ordering=('name', 'id'))
+        serializer = DormListSerializer(paginator.paginate_queryset(dorms, request), many=True)
+        return {'dorms': list(serializer.data), 'pagination': paginator.get_page_metadata()}
+
+    return DORM_LIST.get_or_set(request.GET.urlencode(), build)
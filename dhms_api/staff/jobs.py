@@ -0,0 +1,75 @@
+"""
+Maintenance job claiming.
+
+A job is claimed with a single conditional ``UPDATE ... WHERE
+status='approved_by_proctor'``, so when several technicians accept the same
+job exactly one of them gets it. ``claim_next_job`` hands out the most
+urgent open job; on databases with ``SKIP LOCKED`` it skips rows another
+transaction is already claiming instead of queueing behind them.
+
+Both go through the ``accept`` transition of ``students.workflows``.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from students.models import MaintenanceRequest
+from students.workflows import TransitionNotAllowed, apply_transition
+
+URGENCY_ORDER = (
+    MaintenanceRequest.Urgency.HIGH,
+    MaintenanceRequest.Urgency.MEDIUM,
+    MaintenanceRequest.Urgency.LOW,
+)
+
+
+class JobAlreadyClaimed(Exception):
+    """The job exists but is no longer open."""
+
+
+def claim_job(job_id, staff):
+    """
+    Assign an open job to ``staff``.
+
+    Raises ``MaintenanceRequest.DoesNotExist`` for an unknown job and
+    ``JobAlreadyClaimed`` if it is no longer open.
+    """
+    try:
+        _claim(job_id, staff)
+    except TransitionNotAllowed:
+        raise JobAlreadyClaimed
+
+
+def claim_next_job(staff):
+    """Assign the most urgent, oldest open job to ``staff`` and return its id, or ``None``."""
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    while True:
+        with transaction.atomic():
+            job_id = _next_open_job(skip_locked)
+            if job_id is None:
+                return None
+            try:
+                _claim(job_id, staff)
+                return job_id
+            except TransitionNotAllowed:
+                pass
+        # Lost the race for that row (only without SKIP LOCKED); take the next one.
+
+
+def _next_open_job(skip_locked):
+    for urgency in URGENCY_ORDER:
+        jobs = MaintenanceRequest.objects.filter(
+            status=MaintenanceRequest.RequestStatus.APPROVED_BY_PROCTOR, urgency=urgency
+        ).order_by('reported_date', 'id')
+        if skip_locked:
+            jobs = jobs.select_for_update(skip_locked=True)
+        job_id = jobs.values_list('pk', flat=True).first()
+        if job_id is not None:
+            return job_id
+    return None
+
+
+def _claim(job_id, staff):
+    apply_transition(MaintenanceRequest, 'accept', {
+        'assigned_to': staff,
+        'assigned_date': timezone.now(),
+    }, pk=job_id)
@@ -0,0 +1,125 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Staff, Student
+from operations.counters import rebuild_global_counters
+from staff.models import Dorm, Room
+from staff.views import StaffDashboardView
+from students.models import MaintenanceRequest
+
+User = get_user_model()
+
+# Status mix for the seeded rows: mostly finished history, a tail of open work.
+STATUS_CYCLE = ['completed'] * 6 + ['rejected', 'approved_by_proctor', 'assigned_to_staff', 'in_progress']
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark StaffDashboardView latency as maintenance_requests grows. '
+        'All seeded data is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000],
+            help='Table sizes to measure at, in ascending order.',
+        )
+        parser.add_argument('--repeat', type=int, default=50, help='Dashboard requests per size.')
+        parser.add_argument('--staff', type=int, default=200, help='Staff members sharing the jobs.')
+        parser.add_argument('--batch-size', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['sizes'])
+
+        with transaction.atomic():
+            staff_members, student, room = self._seed_people(options['staff'])
+            me = staff_members[0]
+            view = StaffDashboardView.as_view()
+            factory = APIRequestFactory()
+
+            self.stdout.write(f"{'rows':>12} {'dashboard ms':>14} {'legacy ms':>12}")
+            seeded = 0
+            for size in sizes:
+                self._seed_requests(seeded, size, staff_members, student, room, options['batch_size'])
+                seeded = size
+                rebuild_global_counters()
+
+                def dashboard():
+                    request = factory.get('/aau-dhms-api/staff/dashboard/')
+                    force_authenticate(request, user=me.user)
+                    view(request)
+
+                def legacy():
+                    # The four COUNT queries the dashboard used to run.
+                    jobs = MaintenanceRequest.objects.filter(assigned_to=me)
+                    jobs.filter(status='assigned_to_staff').count()
+                    jobs.filter(status='in_progress').count()
+                    jobs.filter(status='completed').count()
+                    MaintenanceRequest.objects.filter(status='approved_by_proctor').count()
+
+                self.stdout.write(
+                    f'{size:>12,} {self._median_ms(dashboard, options["repeat"]):>14.2f} '
+                    f'{self._median_ms(legacy, options["repeat"]):>12.2f}'
+                )
+
+            transaction.set_rollback(True)
+
+    def _median_ms(self, func, repeat):
+        func()  # warm up
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    def _seed_people(self, staff_count):
+        User.objects.bulk_create([
+            User(username=f'bench-staff-{i}', full_name=f'Bench Staff {i}', role='staff', password='!')
+            for i in range(staff_count)
+        ] + [User(username='bench-student', full_name='Bench Student', role='student', password='!')])
+        users = User.objects.filter(username__startswith='bench-')
+        
+        Staff.objects.bulk_create([
+            Staff(user=user, staff_code=f'BENCH-{user.username[12:]}')
+            for user in users if user.role == 'staff'
+        ])
+        staff_members = list(
+            Staff.objects.filter(staff_code__startswith='BENCH-').select_related('user').order_by('pk')
+        )
+        student = Student.objects.create(
+            user=users.get(username='bench-student'), student_code='BENCH-STU', student_type='government'
+        )
+        dorm = Dorm.objects.create(dorm_code='BENCH-DORM', name='Bench Dorm', type='mixed')
+        room = Room.objects.create(dorm=dorm, room_number='B1', capacity=4)
+        
+        # The measured staff member keeps a fixed workload; the table grows around them.
+        MaintenanceRequest.objects.bulk_create([
+            MaintenanceRequest(
+                request_code=f'BENCH-ME-{i}', student=student, room=room, issue_type='other',
+                title='Bench', description='Bench', status=('assigned_to_staff', 'in_progress', 'completed')[i % 3],
+                assigned_to=staff_members[0],
+            )
+            for i in range(60)
+        ])
+        return staff_members, student, room
+
+    def _seed_requests(self, start, stop, staff_members, student, room, batch_size):
+        others = staff_members[1:] or staff_members
+        for offset in range(start, stop, batch_size):
+            batch = []
+            for i in range(offset, min(offset + batch_size, stop)):
+                status = STATUS_CYCLE[i % len(STATUS_CYCLE)]
+                assigned = others[i % len(others)] if status in (
+                    'assigned_to_staff', 'in_progress', 'completed'
+                ) else None
+                batch.append(MaintenanceRequest(
+                    request_code=f'BENCH-{i}', student=student, room=room, issue_type='other',
+                    title='Bench', description='Bench', status=status, assigned_to=assigned,
+                ))
+            MaintenanceRequest.objects.bulk_create(batch)
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['dorm', 'floor', 'room_number', 'id'], name='room_dorm_floor_number'),
+        ),
+    ]
@@ -86,6 +86,9 @@ class Room(models.Model):
         verbose_name = 'Room'
         verbose_name_plural = 'Rooms'
         unique_together = ['dorm', 'room_number']
+        indexes = [
+            models.Index(fields=['dorm', 'floor', 'room_number', 'id'], name='room_dorm_floor_number'),
+        ]
     
     def __str__(self):
         return f"{self.dorm.dorm_code} - Room {self.room_number}"
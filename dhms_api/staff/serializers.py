@@ -1,10 +1,13 @@
 from rest_framework import serializers
+from dhms_api.serializers import EagerLoadingMixin
 from .models import Dorm, Room, RoomInventory
 
 
-class DormListSerializer(serializers.ModelSerializer):
+class DormListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for listing dorms."""
     
+    select_related = ['proctor__user']
+    
     proctor_name = serializers.CharField(source='proctor.user.full_name', read_only=True)
     
     class Meta:
@@ -16,9 +19,11 @@ class DormListSerializer(serializers.ModelSerializer):
         ]
 
 
-class RoomListSerializer(serializers.ModelSerializer):
+class RoomListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for listing rooms."""
     
+    select_related = ['dorm']
+    
     dorm_name = serializers.CharField(source='dorm.name', read_only=True)
     dorm_code = serializers.CharField(source='dorm.dorm_code', read_only=True)
     
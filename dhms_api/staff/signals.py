@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Proctor, User
+
+from .dorm_list import DORM_LIST
+from .models import Dorm
+
+
+@receiver([post_save, post_delete], sender=Dorm)
+@receiver([post_save, post_delete], sender=Proctor)
+def invalidate_dorm_list(sender, **kwargs):
+    """Drop the cached /dorms/ pages when a dorm or its proctor changes."""
+    DORM_LIST.invalidate()
+
+
+@receiver(post_save, sender=User)
+def invalidate_dorm_list_proctor_name(sender, instance, update_fields, **kwargs):
+    """Drop the cached /dorms/ pages when a proctor's name changes."""
+    if instance.role == User.Role.PROCTOR and (update_fields is None or 'full_name' in update_fields):
+        DORM_LIST.invalidate()
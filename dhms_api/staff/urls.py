@@ -5,6 +5,7 @@ from .views import (
     StaffMaintenanceListView,
     StaffMyJobsView,
     StaffMaintenanceAcceptView,
+    StaffMaintenanceClaimNextView,
     StaffMaintenanceStartView,
     StaffMaintenanceCompleteView,
     # Dorm & Room views
@@ -20,6 +21,7 @@ urlpatterns = [
     path('staff/dashboard/', StaffDashboardView.as_view(), name='staff_dashboard'),
     path('staff/maintenance/', StaffMaintenanceListView.as_view(), name='staff_maintenance_list'),
     path('staff/maintenance/my-jobs/', StaffMyJobsView.as_view(), name='staff_my_jobs'),
+    path('staff/maintenance/claim-next/', StaffMaintenanceClaimNextView.as_view(), name='staff_claim_next_maintenance'),
     path('staff/maintenance/<int:pk>/accept/', StaffMaintenanceAcceptView.as_view(), name='staff_accept_maintenance'),
     path('staff/maintenance/<int:pk>/start/', StaffMaintenanceStartView.as_view(), name='staff_start_maintenance'),
     path('staff/maintenance/<int:pk>/complete/', StaffMaintenanceCompleteView.as_view(), name='staff_complete_maintenance'),
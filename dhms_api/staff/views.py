@@ -3,14 +3,20 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from django.db.models import Count
 from drf_spectacular.utils import extend_schema
 
+from .dorm_list import dorm_list_page
+from .jobs import JobAlreadyClaimed, claim_job, claim_next_job
 from .models import Dorm, Room
 from .serializers import DormListSerializer, RoomListSerializer
 from students.models import MaintenanceRequest
 from students.serializers import MaintenanceRequestListSerializer
+from students.workflows import TransitionNotAllowed, apply_transition
+from operations.counters import AVAILABLE_JOBS, get_global_counter
 
 
+from dhms_api.pagination import KeysetPagination, PAGINATION_PARAMETERS
 from dhms_api.permissions import IsStaffMember
 
 
@@ -28,16 +34,20 @@ class StaffDashboardView(APIView):
         except:
             return Response({'success': False, 'error': 'Staff profile not found'}, status=404)
         
-        # Get maintenance stats
-        assigned_jobs = MaintenanceRequest.objects.filter(
-            assigned_to=staff
+        # One grouped aggregation over this staff member's jobs
+        status_counts = dict(
+            MaintenanceRequest.objects
+            .filter(assigned_to=staff, status__in=['assigned_to_staff', 'in_progress', 'completed'])
+            .order_by()
+            .values_list('status')
+            .annotate(total=Count('pk'))
         )
         
         stats = {
-            'pending_jobs': assigned_jobs.filter(status='assigned_to_staff').count(),
-            'in_progress_jobs': assigned_jobs.filter(status='in_progress').count(),
-            'completed_jobs': assigned_jobs.filter(status='completed').count(),
-            'available_jobs': MaintenanceRequest.objects.filter(status='approved_by_proctor').count(),
+            'pending_jobs': status_counts.get('assigned_to_staff', 0),
+            'in_progress_jobs': status_counts.get('in_progress', 0),
+            'completed_jobs': status_counts.get('completed', 0),
+            'available_jobs': get_global_counter(AVAILABLE_JOBS),
         }
         
         return Response({
@@ -59,18 +69,18 @@ class StaffMaintenanceListView(APIView):
     
     permission_classes = [IsStaffMember]
     
-    @extend_schema(tags=['staff'], summary='List Available Maintenance Jobs')
+    @extend_schema(tags=['staff'], summary='List Available Maintenance Jobs', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
         # Get jobs approved by proctor (available for staff to accept)
-        jobs = MaintenanceRequest.objects.filter(
-            status='approved_by_proctor'
-        ).order_by('-urgency', '-reported_date')
-        
-        serializer = MaintenanceRequestListSerializer(jobs, many=True)
+        jobs = MaintenanceRequestListSerializer.setup_eager_loading(
+            MaintenanceRequest.objects.filter(status='approved_by_proctor')
+        )
+        paginator = KeysetPagination(ordering=('-urgency', '-reported_date', '-id'))
+        serializer = MaintenanceRequestListSerializer(paginator.paginate_queryset(jobs, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'jobs': serializer.data}
+            'data': {'jobs': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
 
 
@@ -79,23 +89,25 @@ class StaffMyJobsView(APIView):
     
     permission_classes = [IsStaffMember]
     
-    @extend_schema(tags=['staff'], summary='List My Assigned Jobs')
+    @extend_schema(tags=['staff'], summary='List My Assigned Jobs', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
         try:
             staff = request.user.staff_profile
         except:
             return Response({'success': False, 'error': 'Staff profile not found'}, status=404)
         
-        jobs = MaintenanceRequest.objects.filter(
-            assigned_to=staff,
-            status__in=['assigned_to_staff', 'in_progress']
-        ).order_by('-urgency', '-assigned_date')
-        
-        serializer = MaintenanceRequestListSerializer(jobs, many=True)
+        jobs = MaintenanceRequestListSerializer.setup_eager_loading(
+            MaintenanceRequest.objects.filter(
+                assigned_to=staff,
+                status__in=['assigned_to_staff', 'in_progress']
+            )
+        )
+        paginator = KeysetPagination(ordering=('-urgency', '-assigned_date', '-id'))
+        serializer = MaintenanceRequestListSerializer(paginator.paginate_queryset(jobs, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'jobs': serializer.data}
+            'data': {'jobs': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
 
 
@@ -107,24 +119,48 @@ class StaffMaintenanceAcceptView(APIView):
     @extend_schema(tags=['staff'], summary='Accept Maintenance Job')
     def put(self, request, pk):
         try:
-            maintenance = MaintenanceRequest.objects.get(pk=pk, status='approved_by_proctor')
+            staff = request.user.staff_profile
+        except:
+            return Response({'success': False, 'error': 'Staff profile not found'}, status=404)
+        
+        try:
+            claim_job(pk, staff)
         except MaintenanceRequest.DoesNotExist:
             return Response({'success': False, 'error': 'Job not found or not available'}, status=404)
+        except JobAlreadyClaimed:
+            return Response(
+                {'success': False, 'error': 'Job has already been claimed'},
+                status=status.HTTP_409_CONFLICT
+            )
         
+        return Response({
+            'success': True,
+            'message': 'Job accepted',
+            'data': {'status': MaintenanceRequest.RequestStatus.ASSIGNED_TO_STAFF}
+        })
+
+
+class StaffMaintenanceClaimNextView(APIView):
+    """Claim the most urgent open maintenance job."""
+    
+    permission_classes = [IsStaffMember]
+    
+    @extend_schema(tags=['staff'], summary='Claim Next Maintenance Job', request=None)
+    def post(self, request):
         try:
             staff = request.user.staff_profile
         except:
             return Response({'success': False, 'error': 'Staff profile not found'}, status=404)
         
-        maintenance.status = 'assigned_to_staff'
-        maintenance.assigned_to = staff
-        maintenance.assigned_date = timezone.now()
-        maintenance.save()
+        job_id = claim_next_job(staff)
+        if job_id is None:
+            return Response({'success': False, 'error': 'No jobs available'}, status=404)
         
+        job = MaintenanceRequestListSerializer.setup_eager_loading(MaintenanceRequest.objects.all()).get(pk=job_id)
         return Response({
             'success': True,
             'message': 'Job accepted',
-            'data': {'status': maintenance.status}
+            'data': MaintenanceRequestListSerializer(job).data
         })
 
 
@@ -137,20 +173,22 @@ class StaffMaintenanceStartView(APIView):
     def put(self, request, pk):
         try:
             staff = request.user.staff_profile
-            maintenance = MaintenanceRequest.objects.get(pk=pk, assigned_to=staff)
-        except MaintenanceRequest.DoesNotExist:
-            return Response({'success': False, 'error': 'Job not found'}, status=404)
         except:
             return Response({'success': False, 'error': 'Staff profile not found'}, status=404)
         
-        maintenance.status = 'in_progress'
-        maintenance.started_date = timezone.now()
-        maintenance.save()
+        try:
+            new_status = apply_transition(MaintenanceRequest, 'start', {
+                'started_date': timezone.now(),
+            }, pk=pk, assigned_to=staff)
+        except MaintenanceRequest.DoesNotExist:
+            return Response({'success': False, 'error': 'Job not found'}, status=404)
+        except TransitionNotAllowed as exc:
+            return Response({'success': False, 'error': f'Cannot start a job that is {exc.status}'}, status=409)
         
         return Response({
             'success': True,
             'message': 'Job started',
-            'data': {'status': maintenance.status}
+            'data': {'status': new_status}
         })
 
 
@@ -163,20 +201,22 @@ class StaffMaintenanceCompleteView(APIView):
     def put(self, request, pk):
         try:
             staff = request.user.staff_profile
-            maintenance = MaintenanceRequest.objects.get(pk=pk, assigned_to=staff)
-        except MaintenanceRequest.DoesNotExist:
-            return Response({'success': False, 'error': 'Job not found'}, status=404)
         except:
             return Response({'success': False, 'error': 'Staff profile not found'}, status=404)
         
-        maintenance.status = 'completed'
-        maintenance.completed_date = timezone.now()
-        maintenance.save()
+        try:
+            new_status = apply_transition(MaintenanceRequest, 'complete', {
+                'completed_date': timezone.now(),
+            }, pk=pk, assigned_to=staff)
+        except MaintenanceRequest.DoesNotExist:
+            return Response({'success': False, 'error': 'Job not found'}, status=404)
+        except TransitionNotAllowed as exc:
+            return Response({'success': False, 'error': f'Cannot complete a job that is {exc.status}'}, status=409)
         
         return Response({
             'success': True,
             'message': 'Job completed',
-            'data': {'status': maintenance.status}
+            'data': {'status': new_status}
         })
 
 
@@ -187,15 +227,9 @@ class DormListView(APIView):
     
     permission_classes = [IsAuthenticated]
     
-    @extend_schema(tags=['dorms'], summary='List Dorms')
+    @extend_schema(tags=['dorms'], summary='List Dorms', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
-        dorms = Dorm.objects.filter(status='active').order_by('name')
-        serializer = DormListSerializer(dorms, many=True)
-        
-        return Response({
-            'success': True,
-            'data': {'dorms': serializer.data}
-        })
+        return Response({'success': True, 'data': dorm_list_page(request)})
 
 
 class DormRoomsView(APIView):
@@ -203,21 +237,25 @@ class DormRoomsView(APIView):
     
     permission_classes = [IsAuthenticated]
     
-    @extend_schema(tags=['rooms'], summary='List Rooms in Dorm')
+    @extend_schema(tags=['rooms'], summary='List Rooms in Dorm', parameters=PAGINATION_PARAMETERS)
     def get(self, request, dorm_id):
         try:
-            dorm = Dorm.objects.get(pk=dorm_id)
+            dorm = DormListSerializer.setup_eager_loading(Dorm.objects.all()).get(pk=dorm_id)
         except Dorm.DoesNotExist:
             return Response({'success': False, 'error': 'Dorm not found'}, status=404)
         
-        rooms = Room.objects.filter(dorm=dorm).order_by('floor', 'room_number')
-        serializer = RoomListSerializer(rooms, many=True)
+        rooms = RoomListSerializer.setup_eager_loading(
+            Room.objects.filter(dorm=dorm)
+        )
+        paginator = KeysetPagination(ordering=('floor', 'room_number', 'id'))
+        serializer = RoomListSerializer(paginator.paginate_queryset(rooms, request), many=True)
         
         return Response({
             'success': True,
             'data': {
                 'dorm': DormListSerializer(dorm).data,
-                'rooms': serializer.data
+                'rooms': serializer.data,
+                'pagination': paginator.get_page_metadata(),
             }
         })
 
@@ -227,15 +265,15 @@ class AvailableRoomsView(APIView):
     
     permission_classes = [IsAuthenticated]
     
-    @extend_schema(tags=['rooms'], summary='List Available Rooms')
+    @extend_schema(tags=['rooms'], summary='List Available Rooms', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
-        rooms = Room.objects.filter(
-            status='available'
-        ).select_related('dorm').order_by('dorm__name', 'floor', 'room_number')
-        
-        serializer = RoomListSerializer(rooms, many=True)
+        rooms = RoomListSerializer.setup_eager_loading(
+            Room.objects.filter(status='available')
+        )
+        paginator = KeysetPagination(ordering=('dorm__name', 'floor', 'room_number', 'id'))
+        serializer = RoomListSerializer(paginator.paginate_queryset(rooms, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'rooms': serializer.data}
+            'data': {'rooms': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
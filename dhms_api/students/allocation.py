@@ -0,0 +1,167 @@
+"""
+Automatic room allocation.
+
+``plan_allocation`` matches unassigned, eligible students to free beds in a
+single pass. Students and rooms are read with two queries, rooms are sorted
+once into per-gender preference lists, and every student takes the next
+free bed from the front of its list, so planning is linear in the number of
+students plus rooms.
+
+Placement rules:
+
+* only students with ``eligibility_status`` and no active assignment are
+  placed, and only into ``available`` rooms of ``active`` dorms;
+* male and female students go to dorms of their own type first and to
+  mixed dorms after that; students with no recorded gender only go to
+  mixed dorms;
+* disabled students are placed first, lowest floor first, and never above
+  ``ACCESSIBLE_MAX_FLOOR``. Everyone else fills rooms from the top floor
+  down, which keeps ground-floor beds free for later disabled students.
+
+``allocate_rooms`` commits a plan through ``bulk_assign_rooms``, so beds
+taken between planning and writing are reported per row instead of being
+overbooked.
+"""
+from collections import Counter
+
+from django.db.models import Exists, F, OuterRef
+
+from accounts.models import Student
+from staff.models import Dorm, Room
+from .assignments import bulk_assign_rooms
+from .models import RoomAssignment
+
+ACCESSIBLE_MAX_FLOOR = 1
+
+NO_BED = 'No free bed in a suitable dorm.'
+NO_ACCESSIBLE_BED = 'No free bed on an accessible floor.'
+
+
+class AllocationPlan:
+    """Result of ``plan_allocation``."""
+
+    def __init__(self, assignments, unplaced, room_dorms):
+        self.assignments = assignments  # [(student_id, room_id), ...]
+        self.unplaced = unplaced  # {student_id: reason}
+        self._room_dorms = room_dorms
+
+    def summary(self):
+        per_dorm = Counter(self._room_dorms[room_id] for _, room_id in self.assignments)
+        return {
+            'planned': len(self.assignments),
+            'unplaced': len(self.unplaced),
+            'unplaced_reasons': dict(Counter(self.unplaced.values())),
+            'per_dorm': [{'dorm_id': dorm_id, 'planned': count} for dorm_id, count in sorted(per_dorm.items())],
+        }
+
+
+class _BedQueue:
+    """Rooms in preference order, consumed front to back."""
+
+    def __init__(self, rooms, free):
+        self.rooms = rooms
+        self.free = free  # shared between queues
+        self.position = 0
+
+    def take(self):
+        rooms, free = self.rooms, self.free
+        while self.position < len(rooms):
+            room_id = rooms[self.position]
+            if free[room_id]:
+                free[room_id] -= 1
+                return room_id
+            self.position += 1
+        return None
+
+
+def plan_allocation(dorm_ids=None, accessible_max_floor=ACCESSIBLE_MAX_FLOOR):
+    """
+    Build an assignment plan without writing anything.
+
+    ``dorm_ids`` limits the rooms considered; every eligible unassigned
+    student is a candidate regardless.
+    """
+    active = RoomAssignment.objects.filter(
+        student=OuterRef('pk'), status=RoomAssignment.AssignmentStatus.ACTIVE
+    )
+    students = (
+        Student.objects
+        .filter(eligibility_status=True)
+        .exclude(Exists(active))
+        .order_by('pk')
+        .values_list('pk', 'gender', 'student_type')
+    )
+
+    rooms = Room.objects.filter(
+        status=Room.RoomStatus.AVAILABLE,
+        dorm__status=Dorm.DormStatus.ACTIVE,
+        current_occupancy__lt=F('capacity'),
+    )
+    if dorm_ids is not None:
+        rooms = rooms.filter(dorm_id__in=dorm_ids)
+    rooms = list(rooms.values_list(
+        'pk', 'dorm_id', 'dorm__type', 'floor', 'room_number', 'capacity', 'current_occupancy'
+    ))
+
+    free = {room[0]: room[5] - room[6] for room in rooms}
+    room_dorms = {room[0]: room[1] for room in rooms}
+    queues = _build_queues(rooms, free, accessible_max_floor)
+
+    disabled, others = [], []
+    for student in students:
+        (disabled if student[2] == Student.StudentType.DISABLED else others).append(student)
+
+    assignments, unplaced = [], {}
+    for group, accessible in ((disabled, True), (others, False)):
+        for student_id, gender, _ in group:
+            room_id = queues[accessible, gender].take()
+            if room_id is None:
+                unplaced[student_id] = NO_ACCESSIBLE_BED if accessible else NO_BED
+            else:
+                assignments.append((student_id, room_id))
+    return AllocationPlan(assignments, unplaced, room_dorms)
+
+
+def _build_queues(rooms, free, accessible_max_floor):
+    by_type = {dorm_type: [] for dorm_type in Dorm.DormType.values}
+    for room in rooms:
+        by_type[room[2]].append(room)
+
+    def upper_floors_first(room):
+        # Rooms with an unknown floor are never offered as accessible, so use them first.
+        return (room[3] is not None, -(room[3] or 0), room[1], room[4], room[0])
+
+    def lower_floors_first(room):
+        return (room[3], room[2] == Dorm.DormType.MIXED, room[1], room[4], room[0])
+
+    def accessible(candidates):
+        return [room for room in candidates if room[3] is not None and room[3] <= accessible_max_floor]
+
+    mixed = sorted(by_type[Dorm.DormType.MIXED], key=upper_floors_first)
+    queues = {}
+    for gender in (*Student.Gender.values, None):
+        own = sorted(by_type[gender], key=upper_floors_first) if gender else []
+        queues[False, gender] = _BedQueue([room[0] for room in own + mixed], free)
+        queues[True, gender] = _BedQueue(
+            [room[0] for room in sorted(accessible(own + mixed), key=lower_floors_first)], free
+        )
+    return queues
+
+
+def allocate_rooms(assigned_by, assignment_date, dorm_ids=None, dry_run=False,
+                   accessible_max_floor=ACCESSIBLE_MAX_FLOOR):
+    """
+    Plan an allocation and, unless ``dry_run``, write it.
+
+    Returns ``(plan, created, errors)``; ``created`` and ``errors`` come from
+    ``bulk_assign_rooms`` and are ``0`` and ``[]`` on a dry run.
+    """
+    plan = plan_allocation(dorm_ids, accessible_max_floor)
+    if dry_run or not plan.assignments:
+        return plan, 0, []
+    created, errors = bulk_assign_rooms(
+        [{'student_id': student_id, 'room_id': room_id} for student_id, room_id in plan.assignments],
+        assigned_by,
+        assignment_date,
+    )
+    return plan, created, errors
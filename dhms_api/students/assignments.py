@@ -0,0 +1,194 @@
+"""
+Room assignment write path.
+
+A bed is claimed with a single conditional ``UPDATE`` that only succeeds
+while ``current_occupancy < capacity``, so concurrent assignments to the
+same room can neither overbook it nor lose an increment. The claim and the
+``RoomAssignment`` insert share one transaction.
+
+``bulk_assign_rooms`` is the set-based variant for move-in batches: rows
+are validated with a handful of ``IN`` queries, each room is claimed with
+one ``UPDATE`` for all of its rows, and assignments are written with
+``bulk_create``. The batch's students are locked while it is validated
+and written, so a concurrent batch with the same students waits and then
+reports them as already assigned; the ``one_active_assignment_per_student``
+constraint guarantees it in the database.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+
+from accounts.models import Student
+from operations.counters import rebuild_dorm_counters
+from staff.models import Room
+from .models import RoomAssignment
+
+
+class RoomFull(Exception):
+    """The room has no free bed left."""
+
+
+class AlreadyAssigned(Exception):
+    """The student already has an active room assignment."""
+
+
+def claim_beds(room_id, beds=1):
+    """
+    Atomically take ``beds`` free beds in a room.
+
+    Marks the room occupied when the last bed is taken. Returns ``False``
+    (and changes nothing) if the room does not have that many free beds.
+    """
+    return bool(
+        Room.objects.filter(pk=room_id, current_occupancy__lte=F('capacity') - beds).update(
+            current_occupancy=F('current_occupancy') + beds,
+            status=Case(
+                When(current_occupancy__gte=F('capacity') - beds, then=Value(Room.RoomStatus.OCCUPIED)),
+                default=F('status'),
+            ),
+        )
+    )
+
+
+def assign_room(student_id, room_id, assigned_by, **fields):
+    """
+    Create an active assignment of a student to a room, raising ``RoomFull``
+    if it has no free bed and ``AlreadyAssigned`` if the student has a room.
+    """
+    try:
+        with transaction.atomic():
+            if not claim_beds(room_id):
+                raise RoomFull
+            return RoomAssignment.objects.create(
+                student_id=student_id, room_id=room_id, assigned_by=assigned_by, **fields
+            )
+    except IntegrityError:
+        if RoomAssignment.objects.filter(
+            student_id=student_id, status=RoomAssignment.AssignmentStatus.ACTIVE
+        ).exists():
+            raise AlreadyAssigned
+        raise
+
+
+def _as_id(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def bulk_assign_rooms(rows, assigned_by, assignment_date, expected_check_out=None, batch_size=1000):
+    """
+    Assign many students to rooms at once.
+
+    ``rows`` is a sequence of ``{'student_id': ..., 'room_id': ...}`` mappings.
+    Rows are handled independently and in order: a row that fails
+    validation, or arrives after its room has filled up, is reported and
+    skipped without affecting the others.
+
+    Returns ``(created, errors)`` where ``created`` is the number of
+    assignments written and ``errors`` lists ``{'index', 'student_id',
+    'room_id', 'error'}`` for every rejected row.
+    """
+    errors = []
+    pending = []  # (index, student_id, room_id)
+
+    def reject(index, row, message):
+        errors.append({
+            'index': index,
+            'student_id': row.get('student_id') if isinstance(row, dict) else None,
+            'room_id': row.get('room_id') if isinstance(row, dict) else None,
+            'error': message,
+        })
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            reject(index, row, 'Expected an object with student_id and room_id.')
+            continue
+        student_id, room_id = _as_id(row.get('student_id')), _as_id(row.get('room_id'))
+        if student_id is None or room_id is None:
+            reject(index, row, 'student_id and room_id must be integers.')
+            continue
+        pending.append((index, student_id, room_id))
+
+    student_ids = {student_id for _, student_id, _ in pending}
+    room_ids = {room_id for _, _, room_id in pending}
+
+    with transaction.atomic():
+        # Locking the students (in key order) makes a concurrent batch with any of
+        # them wait until this one commits, and then see its assignments.
+        existing_students = set(
+            Student.objects.select_for_update().filter(pk__in=student_ids).order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        already_assigned = set(
+            RoomAssignment.objects.filter(
+                student_id__in=student_ids, status=RoomAssignment.AssignmentStatus.ACTIVE
+            ).values_list('student_id', flat=True)
+        )
+        free_beds, room_dorms = {}, {}
+        for pk, dorm_id, capacity, occupancy in Room.objects.filter(pk__in=room_ids).values_list(
+            'pk', 'dorm_id', 'capacity', 'current_occupancy'
+        ):
+            free_beds[pk] = max(capacity - occupancy, 0)
+            room_dorms[pk] = dorm_id
+
+        seen_students = set()
+        by_room = defaultdict(list)
+        for index, student_id, room_id in pending:
+            row = {'student_id': student_id, 'room_id': room_id}
+            if student_id not in existing_students:
+                reject(index, row, 'Student not found.')
+            elif student_id in already_assigned:
+                reject(index, row, 'Student already has an active room assignment.')
+            elif student_id in seen_students:
+                reject(index, row, 'Student appears more than once in this batch.')
+            elif room_id not in free_beds:
+                reject(index, row, 'Room not found.')
+            elif len(by_room[room_id]) >= free_beds[room_id]:
+                reject(index, row, 'Room is full.')
+            else:
+                seen_students.add(student_id)
+                by_room[room_id].append((index, student_id))
+
+        assignments = []
+        dorm_ids = set()
+        # Rooms are claimed in key order so that batches sharing rooms take
+        # their row locks in the same order and cannot deadlock.
+        for room_id in sorted(by_room):
+            members = by_room[room_id]
+            if not members:
+                continue
+            if not claim_beds(room_id, len(members)):
+                # Another writer took beds since they were read; keep what still fits.
+                capacity, occupancy = Room.objects.values_list('capacity', 'current_occupancy').get(pk=room_id)
+                fits = max(capacity - occupancy, 0)
+                while fits and not claim_beds(room_id, fits):
+                    capacity, occupancy = Room.objects.values_list('capacity', 'current_occupancy').get(pk=room_id)
+                    fits = max(capacity - occupancy, 0)
+                for index, student_id in members[fits:]:
+                    reject(index, {'student_id': student_id, 'room_id': room_id}, 'Room is full.')
+                members = members[:fits]
+            if members:
+                dorm_ids.add(room_dorms[room_id])
+            assignments.extend(
+                RoomAssignment(
+                    student_id=student_id,
+                    room_id=room_id,
+                    assignment_date=assignment_date,
+                    expected_check_out=expected_check_out,
+                    assigned_by=assigned_by,
+                )
+                for _, student_id in members
+            )
+        RoomAssignment.objects.bulk_create(assignments, batch_size=batch_size)
+
+        # bulk_create skips the counter signals; recount the dorms that gained residents.
+        if dorm_ids:
+            rebuild_dorm_counters(dorm_ids)
+
+    errors.sort(key=lambda error: error['index'])
+    return len(assignments), errors
@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from students.allocation import ACCESSIBLE_MAX_FLOOR, allocate_rooms
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Assign every unassigned eligible student to a free bed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Print the plan summary without writing it.')
+        parser.add_argument(
+            '--dorm', type=int, action='append', dest='dorm_ids',
+            help='Only fill the given dorm id (may be repeated).',
+        )
+        parser.add_argument(
+            '--assigned-by', help='Username recorded as assigner; required unless --dry-run.',
+        )
+        parser.add_argument(
+            '--accessible-max-floor', type=int, default=ACCESSIBLE_MAX_FLOOR,
+            help='Highest floor disabled students may be placed on.',
+        )
+
+    def handle(self, *args, **options):
+        assigned_by = None
+        if not options['dry_run']:
+            if not options['assigned_by']:
+                raise CommandError('--assigned-by is required unless --dry-run is given.')
+            try:
+                assigned_by = User.objects.get(username=options['assigned_by'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['assigned_by']}' does not exist.")
+
+        started = time.perf_counter()
+        plan, created, errors = allocate_rooms(
+            assigned_by,
+            timezone.localdate(),
+            dorm_ids=options['dorm_ids'],
+            dry_run=options['dry_run'],
+            accessible_max_floor=options['accessible_max_floor'],
+        )
+        elapsed = time.perf_counter() - started
+
+        summary = plan.summary()
+        self.stdout.write(f"Planned {summary['planned']} assignment(s) in {elapsed:.2f}s.")
+        for reason, count in summary['unplaced_reasons'].items():
+            self.stdout.write(f'  {count} unplaced: {reason}')
+        for dorm in summary['per_dorm']:
+            self.stdout.write(f"  dorm {dorm['dorm_id']}: {dorm['planned']}")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run; nothing was written.'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Created {created} assignment(s).'))
+        if errors:
+            self.stdout.write(self.style.WARNING(f'{len(errors)} row(s) failed at write time:'))
+            for error in errors:
+                self.stdout.write(f"  student {error['student_id']} -> room {error['room_id']}: {error['error']}")
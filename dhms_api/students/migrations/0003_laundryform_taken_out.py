@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-17 03:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_taken_out_at(apps, schema_editor):
+    """Released forms never recorded when they left; the verification time is the closest we have."""
+    LaundryForm = apps.get_model('students', 'LaundryForm')
+    LaundryForm.objects.filter(status='taken_out', taken_out_at__isnull=True).update(
+        taken_out_at=models.F('verification_date')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_initial'),
+        ('students', '0002_maintenancerequest_maintenance_assignee_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='laundryform',
+            name='taken_out_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='laundryform',
+            name='taken_out_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='released_laundry_forms', to='accounts.security'),
+        ),
+        migrations.AddIndex(
+            model_name='laundryform',
+            index=models.Index(fields=['status', 'verification_date'], name='laundry_status_verified'),
+        ),
+        migrations.AddIndex(
+            model_name='laundryform',
+            index=models.Index(fields=['status', 'taken_out_at'], name='laundry_status_taken_out'),
+        ),
+        migrations.RunPython(backfill_taken_out_at, migrations.RunPython.noop),
+    ]
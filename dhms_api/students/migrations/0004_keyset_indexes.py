@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-17 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_initial'),
+        ('staff', '0002_keyset_indexes'),
+        ('students', '0003_laundryform_taken_out'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='laundryform',
+            index=models.Index(fields=['status', 'submission_date', 'id'], name='laundry_status_submitted'),
+        ),
+        migrations.AddIndex(
+            model_name='laundryform',
+            index=models.Index(fields=['status', 'approved_date', 'id'], name='laundry_status_approved'),
+        ),
+        migrations.AddIndex(
+            model_name='laundryform',
+            index=models.Index(fields=['student', 'submission_date', 'id'], name='laundry_student_submitted'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['status', 'reported_date', 'id'], name='maintenance_status_reported'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['status', 'urgency', 'reported_date', 'id'], name='maintenance_status_urgency'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['student', 'reported_date', 'id'], name='maintenance_student_reported'),
+        ),
+        migrations.AddIndex(
+            model_name='penalty',
+            index=models.Index(fields=['student', 'assigned_date', 'id'], name='penalty_student_assigned'),
+        ),
+    ]
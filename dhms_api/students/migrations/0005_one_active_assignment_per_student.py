@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_usedrefreshtoken'),
+        ('staff', '0002_keyset_indexes'),
+        ('students', '0004_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='roomassignment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'active')), fields=('student',), name='one_active_assignment_per_student'),
+        ),
+    ]
@@ -39,6 +39,11 @@ class RoomAssignment(models.Model):
         db_table = 'room_assignments'
         verbose_name = 'Room Assignment'
         verbose_name_plural = 'Room Assignments'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student'], condition=models.Q(status='active'), name='one_active_assignment_per_student'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.student} - {self.room} ({self.status})"
@@ -117,6 +122,13 @@ class MaintenanceRequest(models.Model):
         verbose_name = 'Maintenance Request'
         verbose_name_plural = 'Maintenance Requests'
         ordering = ['-reported_date']
+        indexes = [
+            models.Index(fields=['assigned_to', 'status'], name='maintenance_assignee_status'),
+            # Keyset pagination keys
+            models.Index(fields=['status', 'reported_date', 'id'], name='maintenance_status_reported'),
+            models.Index(fields=['status', 'urgency', 'reported_date', 'id'], name='maintenance_status_urgency'),
+            models.Index(fields=['student', 'reported_date', 'id'], name='maintenance_student_reported'),
+        ]
     
     def __str__(self):
         return f"{self.request_code} - {self.title}"
@@ -164,6 +176,14 @@ class LaundryForm(models.Model):
     )
     verification_date = models.DateTimeField(blank=True, null=True)
     verification_notes = models.TextField(blank=True, null=True)
+    taken_out_by = models.ForeignKey(
+        'accounts.Security',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='released_laundry_forms'
+    )
+    taken_out_at = models.DateTimeField(blank=True, null=True)
     rejection_reason = models.TextField(blank=True, null=True)
     
     class Meta:
@@ -171,6 +191,14 @@ class LaundryForm(models.Model):
         verbose_name = 'Laundry Form'
         verbose_name_plural = 'Laundry Forms'
         ordering = ['-submission_date']
+        indexes = [
+            models.Index(fields=['status', 'verification_date'], name='laundry_status_verified'),
+            models.Index(fields=['status', 'taken_out_at'], name='laundry_status_taken_out'),
+            # Keyset pagination keys
+            models.Index(fields=['status', 'submission_date', 'id'], name='laundry_status_submitted'),
+            models.Index(fields=['status', 'approved_date', 'id'], name='laundry_status_approved'),
+            models.Index(fields=['student', 'submission_date', 'id'], name='laundry_student_submitted'),
+        ]
     
     def __str__(self):
         return f"{self.form_code} - {self.student}"
@@ -221,6 +249,9 @@ class Penalty(models.Model):
         verbose_name = 'Penalty'
         verbose_name_plural = 'Penalties'
         ordering = ['-assigned_date']
+        indexes = [
+            models.Index(fields=['student', 'assigned_date', 'id'], name='penalty_student_assigned'),
+        ]
     
     def __str__(self):
         return f"{self.penalty_code} - {self.student} ({self.violation_type})"
@@ -1,10 +1,11 @@
 from rest_framework import serializers
-from django.utils import timezone
-import uuid
 
 from .models import RoomAssignment, MaintenanceRequest, LaundryForm, Penalty, KeyManagement
+from .assignments import AlreadyAssigned, RoomFull, assign_room
 from staff.models import Dorm, Room
 from accounts.models import Student
+from operations.codes import LAUNDRY, MAINTENANCE, PENALTY, next_code
+from dhms_api.serializers import EagerLoadingMixin
 
 
 class DormSerializer(serializers.ModelSerializer):
@@ -70,14 +71,16 @@ class MaintenanceRequestCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         # Generate request code
-        validated_data['request_code'] = f"MNT-{timezone.now().year}-{uuid.uuid4().hex[:6].upper()}"
+        validated_data['request_code'] = next_code(MAINTENANCE)
         validated_data['student'] = self.context['request'].user.student_profile
         return super().create(validated_data)
 
 
-class MaintenanceRequestListSerializer(serializers.ModelSerializer):
+class MaintenanceRequestListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for listing maintenance requests."""
     
+    select_related = ['student__user', 'room__dorm']
+    
     student_name = serializers.CharField(source='student.user.full_name', read_only=True)
     room_number = serializers.CharField(source='room.room_number', read_only=True)
     dorm_name = serializers.CharField(source='room.dorm.name', read_only=True)
@@ -112,14 +115,16 @@ class LaundryFormCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         # Generate form code
-        validated_data['form_code'] = f"LAU-{timezone.now().year}-{uuid.uuid4().hex[:6].upper()}"
+        validated_data['form_code'] = next_code(LAUNDRY)
         validated_data['student'] = self.context['request'].user.student_profile
         return super().create(validated_data)
 
 
-class LaundryFormListSerializer(serializers.ModelSerializer):
+class LaundryFormListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for listing laundry forms."""
     
+    select_related = ['student__user']
+    
     student_name = serializers.CharField(source='student.user.full_name', read_only=True)
     student_code = serializers.CharField(source='student.student_code', read_only=True)
     
@@ -128,14 +133,16 @@ class LaundryFormListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'form_code', 'item_count', 'item_list', 'special_instructions',
             'status', 'submission_date', 'student_name', 'student_code',
-            'approved_date', 'verification_date'
+            'approved_date', 'verification_date', 'taken_out_at'
         ]
 
 
 # Penalty Serializers
-class PenaltySerializer(serializers.ModelSerializer):
+class PenaltySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for penalties."""
     
+    select_related = ['student__user', 'assigned_by']
+    
     student_name = serializers.CharField(source='student.user.full_name', read_only=True)
     assigned_by_name = serializers.CharField(source='assigned_by.full_name', read_only=True)
     
@@ -170,7 +177,7 @@ class PenaltyCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         student_id = validated_data.pop('student_id')
         validated_data['student'] = Student.objects.get(id=student_id)
-        validated_data['penalty_code'] = f"PEN-{timezone.now().year}-{uuid.uuid4().hex[:6].upper()}"
+        validated_data['penalty_code'] = next_code(PENALTY)
         validated_data['assigned_by'] = self.context['request'].user
         
         # Calculate end date
@@ -211,18 +218,45 @@ class RoomAssignmentCreateSerializer(serializers.ModelSerializer):
         student_id = validated_data.pop('student_id')
         room_id = validated_data.pop('room_id')
         
-        validated_data['student'] = Student.objects.get(id=student_id)
-        validated_data['room'] = Room.objects.get(id=room_id)
-        validated_data['assigned_by'] = self.context['request'].user
-        
-        # Update room occupancy
-        room = validated_data['room']
-        room.current_occupancy += 1
-        if room.current_occupancy >= room.capacity:
-            room.status = 'occupied'
-        room.save()
-        
-        return super().create(validated_data)
+        # The room may have filled up since validate_room_id() looked at it;
+        # the bed is claimed atomically together with the insert.
+        try:
+            return assign_room(student_id, room_id, self.context['request'].user, **validated_data)
+        except RoomFull:
+            raise serializers.ValidationError({'room_id': ['Room is full.']})
+        except AlreadyAssigned:
+            raise serializers.ValidationError({'student_id': ['Student already has an active room assignment.']})
+
+
+class BulkRoomAssignmentSerializer(serializers.Serializer):
+    """Serializer for assigning many students to rooms in one request."""
+
+    MAX_ROWS = 20000
+
+    assignments = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_ROWS
+    )
+    assignment_date = serializers.DateField(required=False)
+    expected_check_out = serializers.DateField(required=False, allow_null=True)
+
+
+class RoomAllocationSerializer(serializers.Serializer):
+    """Serializer for running the automatic room allocation."""
+
+    dry_run = serializers.BooleanField(default=False)
+    assignment_date = serializers.DateField(required=False)
+
+
+class BulkReviewSerializer(serializers.Serializer):
+    """Serializer for approving or rejecting many pending items at once."""
+
+    MAX_IDS = 500
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=MAX_IDS
+    )
+    action = serializers.ChoiceField(choices=['approve', 'reject'])
+    rejection_reason = serializers.CharField(required=False, allow_blank=True, default='')
 
 
 class MaintenanceRejectionSerializer(serializers.Serializer):
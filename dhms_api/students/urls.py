@@ -9,12 +9,16 @@ from .views import (
     # Proctor views
     ProctorDashboardView,
     ProctorAssignRoomView,
+    ProctorBulkAssignRoomView,
+    ProctorAllocateRoomsView,
     ProctorPendingMaintenanceView,
     ProctorMaintenanceApproveView,
     ProctorMaintenanceRejectView,
+    ProctorMaintenanceBulkReviewView,
     ProctorPendingLaundryView,
     ProctorLaundryApproveView,
     ProctorLaundryRejectView,
+    ProctorLaundryBulkReviewView,
     ProctorCreatePenaltyView,
     ProctorStudentsView,
 )
@@ -32,12 +36,16 @@ urlpatterns = [
     # Proctor endpoints
     path('proctors/dashboard/', ProctorDashboardView.as_view(), name='proctor_dashboard'),
     path('proctors/assign-room/', ProctorAssignRoomView.as_view(), name='proctor_assign_room'),
+    path('proctors/assign-room/bulk/', ProctorBulkAssignRoomView.as_view(), name='proctor_bulk_assign_room'),
+    path('proctors/allocate-rooms/', ProctorAllocateRoomsView.as_view(), name='proctor_allocate_rooms'),
     path('proctors/maintenance/pending/', ProctorPendingMaintenanceView.as_view(), name='proctor_pending_maintenance'),
     path('proctors/maintenance/<int:pk>/approve/', ProctorMaintenanceApproveView.as_view(), name='proctor_approve_maintenance'),
     path('proctors/maintenance/<int:pk>/reject/', ProctorMaintenanceRejectView.as_view(), name='proctor_reject_maintenance'),
+    path('proctors/maintenance/bulk/', ProctorMaintenanceBulkReviewView.as_view(), name='proctor_bulk_review_maintenance'),
     path('proctors/laundry/pending/', ProctorPendingLaundryView.as_view(), name='proctor_pending_laundry'),
     path('proctors/laundry/<int:pk>/approve/', ProctorLaundryApproveView.as_view(), name='proctor_approve_laundry'),
     path('proctors/laundry/<int:pk>/reject/', ProctorLaundryRejectView.as_view(), name='proctor_reject_laundry'),
+    path('proctors/laundry/bulk/', ProctorLaundryBulkReviewView.as_view(), name='proctor_bulk_review_laundry'),
     path('proctors/penalties/', ProctorCreatePenaltyView.as_view(), name='proctor_create_penalty'),
     path('proctors/students/', ProctorStudentsView.as_view(), name='proctor_students'),
 ]
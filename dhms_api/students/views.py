@@ -1,10 +1,12 @@
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from django.db.models import Count, Q
-from drf_spectacular.utils import extend_schema, OpenApiResponse
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 
 from .models import RoomAssignment, MaintenanceRequest, LaundryForm, Penalty
 from .serializers import (
@@ -12,12 +14,17 @@ from .serializers import (
     MaintenanceRequestCreateSerializer, MaintenanceRequestListSerializer,
     LaundryFormCreateSerializer, LaundryFormListSerializer,
     PenaltySerializer, PenaltyCreateSerializer, RoomAssignmentCreateSerializer,
-    MaintenanceRejectionSerializer, LaundryRejectionSerializer,
+    MaintenanceRejectionSerializer, LaundryRejectionSerializer, BulkRoomAssignmentSerializer,
+    RoomAllocationSerializer, BulkReviewSerializer,
 )
+from .allocation import allocate_rooms
+from .assignments import bulk_assign_rooms
+from .workflows import WORKFLOWS, TransitionNotAllowed, apply_bulk_transition, apply_transition
 from accounts.models import Student
-from staff.models import Room
+from operations.counters import get_dorm_counters
 
 
+from dhms_api.pagination import KeysetPagination, PAGINATION_PARAMETERS
 from dhms_api.permissions import IsStudent, IsProctor
 
 
@@ -28,54 +35,84 @@ class StudentDashboardView(APIView):
     
     permission_classes = [IsStudent]
     
+    MAINTENANCE_OPEN_STATUSES = ['pending_proctor', 'approved_by_proctor', 'assigned_to_staff', 'in_progress']
+    LAUNDRY_OPEN_STATUSES = ['pending_proctor', 'approved_by_proctor']
+    
+    def get_dashboard_queryset(self, user):
+        """
+        Build the whole dashboard as a single query on the student row.
+        
+        The active assignment and the roommate are pulled in through correlated
+        subqueries and the stats through conditional aggregates, so the number
+        of round trips does not depend on how much history the student has.
+        """
+        assignment = RoomAssignment.objects.filter(
+            student=OuterRef('pk'), status='active'
+        ).order_by('pk')
+        roommate = RoomAssignment.objects.filter(
+            room=OuterRef('room_id'), status='active'
+        ).exclude(student=OuterRef('pk')).order_by('pk')
+        
+        def field(queryset, name):
+            return Subquery(queryset.values(name)[:1])
+        
+        def count(model, condition):
+            counted = model.objects.filter(student=OuterRef('pk')).order_by().values('student').annotate(
+                total=Count('pk', filter=condition)
+            ).values('total')
+            return Coalesce(Subquery(counted), 0)
+        
+        return (
+            Student.objects
+            .filter(user=user)
+            .select_related('user')
+            .annotate(
+                room_id=field(assignment, 'room_id'),
+                room_number=field(assignment, 'room__room_number'),
+                room_floor=field(assignment, 'room__floor'),
+                dorm_name=field(assignment, 'room__dorm__name'),
+                check_in_date=field(assignment, 'check_in_date'),
+                expected_check_out=field(assignment, 'expected_check_out'),
+            )
+            .annotate(
+                roommate_id=field(roommate, 'student_id'),
+                roommate_name=field(roommate, 'student__user__full_name'),
+                roommate_code=field(roommate, 'student__student_code'),
+                active_penalties=count(Penalty, Q(status='active')),
+                pending_maintenance=count(MaintenanceRequest, Q(status__in=self.MAINTENANCE_OPEN_STATUSES)),
+                pending_laundry=count(LaundryForm, Q(status__in=self.LAUNDRY_OPEN_STATUSES)),
+            )
+        )
+    
     @extend_schema(tags=['students'], summary='Student Dashboard')
     def get(self, request):
-        try:
-            student = request.user.student_profile
-        except Student.DoesNotExist:
+        student = self.get_dashboard_queryset(request.user).first()
+        if student is None:
             return Response({'success': False, 'error': 'Student profile not found'}, status=404)
         
-        # Get current room assignment
-        assignment = RoomAssignment.objects.filter(
-            student=student, status='active'
-        ).select_related('room', 'room__dorm').first()
-        
         room_data = None
-        roommate_data = None
         
-        if assignment:
-            room = assignment.room
+        if student.room_id is not None:
             room_data = {
-                'id': room.id,
-                'room_number': room.room_number,
-                'dorm_name': room.dorm.name,
-                'floor': room.floor,
-                'check_in_date': assignment.check_in_date,
-                'expected_check_out': assignment.expected_check_out,
+                'id': student.room_id,
+                'room_number': student.room_number,
+                'dorm_name': student.dorm_name,
+                'floor': student.room_floor,
+                'check_in_date': student.check_in_date,
+                'expected_check_out': student.expected_check_out,
             }
             
-            # Get roommate
-            roommate_assignment = RoomAssignment.objects.filter(
-                room=room, status='active'
-            ).exclude(student=student).select_related('student', 'student__user').first()
-            
-            if roommate_assignment:
-                roommate_data = {
-                    'id': roommate_assignment.student.id,
-                    'full_name': roommate_assignment.student.user.full_name,
-                    'student_code': roommate_assignment.student.student_code,
+            if student.roommate_id is not None:
+                room_data['roommate'] = {
+                    'id': student.roommate_id,
+                    'full_name': student.roommate_name,
+                    'student_code': student.roommate_code,
                 }
-                room_data['roommate'] = roommate_data
         
-        # Get stats
         stats = {
-            'active_penalties': Penalty.objects.filter(student=student, status='active').count(),
-            'pending_maintenance': MaintenanceRequest.objects.filter(
-                student=student, status__in=['pending_proctor', 'approved_by_proctor', 'assigned_to_staff', 'in_progress']
-            ).count(),
-            'pending_laundry': LaundryForm.objects.filter(
-                student=student, status__in=['pending_proctor', 'approved_by_proctor']
-            ).count(),
+            'active_penalties': student.active_penalties,
+            'pending_maintenance': student.pending_maintenance,
+            'pending_laundry': student.pending_laundry,
         }
         
         return Response({
@@ -140,19 +177,22 @@ class StudentMaintenanceView(APIView):
     
     permission_classes = [IsStudent]
     
-    @extend_schema(tags=['students'], summary='List Student Maintenance Requests')
+    @extend_schema(tags=['students'], summary='List Student Maintenance Requests', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
         try:
             student = request.user.student_profile
         except Student.DoesNotExist:
             return Response({'success': False, 'error': 'Student profile not found'}, status=404)
         
-        requests = MaintenanceRequest.objects.filter(student=student).order_by('-reported_date')
-        serializer = MaintenanceRequestListSerializer(requests, many=True)
+        requests = MaintenanceRequestListSerializer.setup_eager_loading(
+            MaintenanceRequest.objects.filter(student=student)
+        )
+        paginator = KeysetPagination(ordering=('-reported_date', '-id'))
+        serializer = MaintenanceRequestListSerializer(paginator.paginate_queryset(requests, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'requests': serializer.data}
+            'data': {'requests': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
     
     @extend_schema(
@@ -187,19 +227,22 @@ class StudentLaundryView(APIView):
     
     permission_classes = [IsStudent]
     
-    @extend_schema(tags=['students'], summary='List Student Laundry Forms')
+    @extend_schema(tags=['students'], summary='List Student Laundry Forms', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
         try:
             student = request.user.student_profile
         except Student.DoesNotExist:
             return Response({'success': False, 'error': 'Student profile not found'}, status=404)
         
-        forms = LaundryForm.objects.filter(student=student).order_by('-submission_date')
-        serializer = LaundryFormListSerializer(forms, many=True)
+        forms = LaundryFormListSerializer.setup_eager_loading(
+            LaundryForm.objects.filter(student=student)
+        )
+        paginator = KeysetPagination(ordering=('-submission_date', '-id'))
+        serializer = LaundryFormListSerializer(paginator.paginate_queryset(forms, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'forms': serializer.data}
+            'data': {'forms': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
     
     @extend_schema(
@@ -240,19 +283,22 @@ class StudentPenaltiesView(APIView):
     
     permission_classes = [IsStudent]
     
-    @extend_schema(tags=['students'], summary='List Student Penalties')
+    @extend_schema(tags=['students'], summary='List Student Penalties', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
         try:
             student = request.user.student_profile
         except Student.DoesNotExist:
             return Response({'success': False, 'error': 'Student profile not found'}, status=404)
         
-        penalties = Penalty.objects.filter(student=student).order_by('-assigned_date')
-        serializer = PenaltySerializer(penalties, many=True)
+        penalties = PenaltySerializer.setup_eager_loading(
+            Penalty.objects.filter(student=student)
+        )
+        paginator = KeysetPagination(ordering=('-assigned_date', '-id'))
+        serializer = PenaltySerializer(paginator.paginate_queryset(penalties, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'penalties': serializer.data}
+            'data': {'penalties': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
 
 
@@ -270,24 +316,15 @@ class ProctorDashboardView(APIView):
         except:
             return Response({'success': False, 'error': 'Proctor profile not found'}, status=404)
         
-        # Get stats for the assigned dorm
-        dorm = proctor.assigned_dorm
+        # Stats for the assigned dorm come from its materialized counters row
+        dorm = None
         
-        if dorm:
-            rooms = Room.objects.filter(dorm=dorm)
-            pending_maintenance = MaintenanceRequest.objects.filter(
-                room__in=rooms, status='pending_proctor'
-            ).count()
-            pending_laundry = LaundryForm.objects.filter(
-                student__room_assignments__room__in=rooms,
-                student__room_assignments__status='active',
-                status='pending_proctor'
-            ).distinct().count()
-            active_penalties = Penalty.objects.filter(
-                student__room_assignments__room__in=rooms,
-                student__room_assignments__status='active',
-                status='active'
-            ).distinct().count()
+        if proctor.assigned_dorm_id:
+            counters = get_dorm_counters(proctor.assigned_dorm_id)
+            dorm = counters.dorm
+            pending_maintenance = counters.pending_maintenance
+            pending_laundry = counters.pending_laundry
+            active_penalties = counters.active_penalties
         else:
             pending_maintenance = MaintenanceRequest.objects.filter(status='pending_proctor').count()
             pending_laundry = LaundryForm.objects.filter(status='pending_proctor').count()
@@ -327,7 +364,10 @@ class ProctorAssignRoomView(APIView):
         )
         
         if serializer.is_valid():
-            assignment = serializer.save()
+            try:
+                assignment = serializer.save()
+            except ValidationError as exc:
+                return Response({'success': False, 'errors': exc.detail}, status=400)
             return Response({
                 'success': True,
                 'message': 'Room assigned',
@@ -340,21 +380,136 @@ class ProctorAssignRoomView(APIView):
         return Response({'success': False, 'errors': serializer.errors}, status=400)
 
 
+class ProctorBulkAssignRoomView(APIView):
+    """Assign many students to rooms at once."""
+
+    permission_classes = [IsProctor]
+
+    @extend_schema(
+        tags=['proctors'],
+        summary='Bulk Assign Rooms',
+        request=BulkRoomAssignmentSerializer,
+    )
+    def post(self, request):
+        serializer = BulkRoomAssignmentSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'success': False, 'errors': serializer.errors}, status=400)
+
+        data = serializer.validated_data
+        created, errors = bulk_assign_rooms(
+            data['assignments'],
+            request.user,
+            assignment_date=data.get('assignment_date') or timezone.localdate(),
+            expected_check_out=data.get('expected_check_out'),
+        )
+        return Response({
+            'success': True,
+            'message': f'{created} rooms assigned',
+            'data': {
+                'created': created,
+                'failed': len(errors),
+                'errors': errors,
+            }
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class ProctorAllocateRoomsView(APIView):
+    """Fill the proctor's dorm with unassigned eligible students."""
+
+    permission_classes = [IsProctor]
+
+    @extend_schema(
+        tags=['proctors'],
+        summary='Allocate Rooms Automatically',
+        request=RoomAllocationSerializer,
+    )
+    def post(self, request):
+        try:
+            proctor = request.user.proctor_profile
+        except:
+            return Response(
+                {'success': False, 'error': 'Proctor profile not found'},
+                status=404
+            )
+
+        if not proctor.assigned_dorm_id:
+            return Response({'success': False, 'error': 'No dorm assigned'}, status=400)
+
+        serializer = RoomAllocationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'success': False, 'errors': serializer.errors}, status=400)
+
+        dry_run = serializer.validated_data['dry_run']
+        plan, created, errors = allocate_rooms(
+            request.user,
+            serializer.validated_data.get('assignment_date') or timezone.localdate(),
+            dorm_ids=[proctor.assigned_dorm_id],
+            dry_run=dry_run,
+        )
+        data = {'dry_run': dry_run, **plan.summary()}
+        if dry_run:
+            data['assignments'] = [
+                {'student_id': student_id, 'room_id': room_id} for student_id, room_id in plan.assignments
+            ]
+        else:
+            data.update(created=created, failed=len(errors), errors=errors)
+        return Response({'success': True, 'data': data})
+
+
+def _bulk_review(request, model):
+    """
+    Approve or reject many pending items of ``model`` in one request.
+
+    Returns a response with one outcome per requested id, in request order.
+    """
+    serializer = BulkReviewSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({'success': False, 'errors': serializer.errors}, status=400)
+
+    data = serializer.validated_data
+    ids = list(dict.fromkeys(data['ids']))
+    if data['action'] == 'approve':
+        changes = {'approved_by': request.user, 'approved_date': timezone.now()}
+    else:
+        changes = {'rejection_reason': data['rejection_reason']}
+    moved, current = apply_bulk_transition(model, data['action'], ids, changes)
+
+    moved = set(moved)
+    target = WORKFLOWS[model][data['action']].target
+    results = []
+    for pk in ids:
+        if pk in moved:
+            results.append({'id': pk, 'success': True, 'status': target})
+        elif pk in current:
+            results.append({'id': pk, 'success': False, 'status': current[pk], 'error': f'Not pending; status is {current[pk]}'})
+        else:
+            results.append({'id': pk, 'success': False, 'error': 'Not found'})
+    return Response({
+        'success': True,
+        'data': {
+            'updated': len(moved),
+            'failed': len(ids) - len(moved),
+            'results': results,
+        }
+    })
+
+
 class ProctorPendingMaintenanceView(APIView):
     """Get pending maintenance requests for proctor."""
     
     permission_classes = [IsProctor]
     
-    @extend_schema(tags=['proctors'], summary='List Pending Maintenance')
+    @extend_schema(tags=['proctors'], summary='List Pending Maintenance', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
-        requests = MaintenanceRequest.objects.filter(
-            status='pending_proctor'
-        ).order_by('-reported_date')
-        serializer = MaintenanceRequestListSerializer(requests, many=True)
+        requests = MaintenanceRequestListSerializer.setup_eager_loading(
+            MaintenanceRequest.objects.filter(status='pending_proctor')
+        )
+        paginator = KeysetPagination(ordering=('-reported_date', '-id'))
+        serializer = MaintenanceRequestListSerializer(paginator.paginate_queryset(requests, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'requests': serializer.data}
+            'data': {'requests': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
 
 
@@ -366,19 +521,19 @@ class ProctorMaintenanceApproveView(APIView):
     @extend_schema(tags=['proctors'], summary='Approve Maintenance Request')
     def put(self, request, pk):
         try:
-            maintenance = MaintenanceRequest.objects.get(pk=pk)
+            new_status = apply_transition(MaintenanceRequest, 'approve', {
+                'approved_by': request.user,
+                'approved_date': timezone.now(),
+            }, pk=pk)
         except MaintenanceRequest.DoesNotExist:
             return Response({'success': False, 'error': 'Request not found'}, status=404)
-        
-        maintenance.status = 'approved_by_proctor'
-        maintenance.approved_by = request.user
-        maintenance.approved_date = timezone.now()
-        maintenance.save()
+        except TransitionNotAllowed as exc:
+            return Response({'success': False, 'error': f'Cannot approve a request that is {exc.status}'}, status=409)
         
         return Response({
             'success': True,
             'message': 'Maintenance approved',
-            'data': {'status': maintenance.status}
+            'data': {'status': new_status}
         })
 
 
@@ -394,36 +549,47 @@ class ProctorMaintenanceRejectView(APIView):
     )
     def put(self, request, pk):
         try:
-            maintenance = MaintenanceRequest.objects.get(pk=pk)
+            new_status = apply_transition(MaintenanceRequest, 'reject', {
+                'rejection_reason': request.data.get('rejection_reason', ''),
+            }, pk=pk)
         except MaintenanceRequest.DoesNotExist:
             return Response({'success': False, 'error': 'Request not found'}, status=404)
-        
-        maintenance.status = 'rejected'
-        maintenance.rejection_reason = request.data.get('rejection_reason', '')
-        maintenance.save()
+        except TransitionNotAllowed as exc:
+            return Response({'success': False, 'error': f'Cannot reject a request that is {exc.status}'}, status=409)
         
         return Response({
             'success': True,
             'message': 'Maintenance rejected',
-            'data': {'status': maintenance.status}
+            'data': {'status': new_status}
         })
 
 
+class ProctorMaintenanceBulkReviewView(APIView):
+    """Approve or reject many maintenance requests at once."""
+    
+    permission_classes = [IsProctor]
+    
+    @extend_schema(tags=['proctors'], summary='Bulk Approve/Reject Maintenance', request=BulkReviewSerializer)
+    def post(self, request):
+        return _bulk_review(request, MaintenanceRequest)
+
+
 class ProctorPendingLaundryView(APIView):
     """Get pending laundry forms for proctor."""
     
     permission_classes = [IsProctor]
     
-    @extend_schema(tags=['proctors'], summary='List Pending Laundry')
+    @extend_schema(tags=['proctors'], summary='List Pending Laundry', parameters=PAGINATION_PARAMETERS)
     def get(self, request):
-        forms = LaundryForm.objects.filter(
-            status='pending_proctor'
-        ).order_by('-submission_date')
-        serializer = LaundryFormListSerializer(forms, many=True)
+        forms = LaundryFormListSerializer.setup_eager_loading(
+            LaundryForm.objects.filter(status='pending_proctor')
+        )
+        paginator = KeysetPagination(ordering=('-submission_date', '-id'))
+        serializer = LaundryFormListSerializer(paginator.paginate_queryset(forms, request), many=True)
         
         return Response({
             'success': True,
-            'data': {'forms': serializer.data}
+            'data': {'forms': serializer.data, 'pagination': paginator.get_page_metadata()}
         })
 
 
@@ -435,19 +601,19 @@ class ProctorLaundryApproveView(APIView):
     @extend_schema(tags=['proctors'], summary='Approve Laundry Form')
     def put(self, request, pk):
         try:
-            form = LaundryForm.objects.get(pk=pk)
+            new_status = apply_transition(LaundryForm, 'approve', {
+                'approved_by': request.user,
+                'approved_date': timezone.now(),
+            }, pk=pk)
         except LaundryForm.DoesNotExist:
             return Response({'success': False, 'error': 'Form not found'}, status=404)
-        
-        form.status = 'approved_by_proctor'
-        form.approved_by = request.user
-        form.approved_date = timezone.now()
-        form.save()
+        except TransitionNotAllowed as exc:
+            return Response({'success': False, 'error': f'Cannot approve a form that is {exc.status}'}, status=409)
         
         return Response({
             'success': True,
             'message': 'Laundry approved',
-            'data': {'status': form.status}
+            'data': {'status': new_status}
         })
 
 
@@ -463,21 +629,31 @@ class ProctorLaundryRejectView(APIView):
     )
     def put(self, request, pk):
         try:
-            form = LaundryForm.objects.get(pk=pk)
+            new_status = apply_transition(LaundryForm, 'reject', {
+                'rejection_reason': request.data.get('rejection_reason', ''),
+            }, pk=pk)
         except LaundryForm.DoesNotExist:
             return Response({'success': False, 'error': 'Form not found'}, status=404)
-        
-        form.status = 'rejected'
-        form.rejection_reason = request.data.get('rejection_reason', '')
-        form.save()
+        except TransitionNotAllowed as exc:
+            return Response({'success': False, 'error': f'Cannot reject a form that is {exc.status}'}, status=409)
         
         return Response({
             'success': True,
             'message': 'Laundry rejected',
-            'data': {'status': form.status}
+            'data': {'status': new_status}
         })
 
 
+class ProctorLaundryBulkReviewView(APIView):
+    """Approve or reject many laundry forms at once."""
+    
+    permission_classes = [IsProctor]
+    
+    @extend_schema(tags=['proctors'], summary='Bulk Approve/Reject Laundry', request=BulkReviewSerializer)
+    def post(self, request):
+        return _bulk_review(request, LaundryForm)
+
+
 class ProctorCreatePenaltyView(APIView):
     """Create penalty for student."""
     
@@ -513,7 +689,14 @@ class ProctorStudentsView(APIView):
     
     permission_classes = [IsProctor]
     
-    @extend_schema(tags=['proctors'], summary='List Students in Dorm with Penalties')
+    @extend_schema(
+        tags=['proctors'],
+        summary='List Students in Dorm with Penalties',
+        parameters=[
+            OpenApiParameter(name='include', type=str, description='Set to "penalties" to embed penalty details.'),
+            *PAGINATION_PARAMETERS,
+        ]
+    )
     def get(self, request):
         try:
             proctor = request.user.proctor_profile
@@ -531,24 +714,35 @@ class ProctorStudentsView(APIView):
                 'data': {'students': []}
             })
         
-        # Active room assignments in proctor's dorm
+        include = {part.strip() for part in request.query_params.get('include', '').split(',')}
+        include_penalties = 'penalties' in include
+        
+        # Active room assignments in proctor's dorm, with penalty stats
+        # aggregated in the same query
         assignments = (
             RoomAssignment.objects
             .filter(room__dorm=dorm, status='active')
             .select_related('student', 'student__user', 'room')
+            .annotate(
+                penalties_count=Count('student__penalties'),
+                active_penalties_count=Count('student__penalties', filter=Q(student__penalties__status='active')),
+            )
         )
         
+        if include_penalties:
+            assignments = assignments.prefetch_related(
+                Prefetch('student__penalties', queryset=PenaltySerializer.setup_eager_loading(Penalty.objects.all()))
+            )
+        
+        paginator = KeysetPagination(ordering=('id',))
+        page = paginator.paginate_queryset(assignments, request)
+        
         students = []
         
-        for assignment in assignments:
+        for assignment in page:
             student = assignment.student
             
-            # Penalties for this student
-            penalties_qs = Penalty.objects.filter(student=student)
-            
-            penalties_data = PenaltySerializer(penalties_qs, many=True).data
-            
-            students.append({
+            student_data = {
                 'id': student.id,
                 'full_name': student.user.full_name,
                 'student_code': student.student_code,
@@ -556,19 +750,21 @@ class ProctorStudentsView(APIView):
                 'status': 'active',
                 
                 # Penalty stats
-                'penalties_count': penalties_qs.count(),
-                'active_penalties_count': penalties_qs.filter(status='active').count(),
-                
+                'penalties_count': assignment.penalties_count,
+                'active_penalties_count': assignment.active_penalties_count,
+            }
+            
+            if include_penalties:
                 # Penalty details
-                'penalties': penalties_data,
-            })
+                student_data['penalties'] = PenaltySerializer(student.penalties.all(), many=True).data
+            
+            students.append(student_data)
         
         return Response({
             'success': True,
             'data': {
                 'dorm': dorm.name,
-                'students': students
+                'students': students,
+                'pagination': paginator.get_page_metadata(),
             }
         })
-
-
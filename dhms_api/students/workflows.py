@@ -0,0 +1,132 @@
+"""
+Status workflows for maintenance requests and laundry forms.
+
+Each workflow is a table of named transitions, each listing the statuses it
+may start from and the status it ends in. ``apply_transition`` runs one as a
+single ``UPDATE ... WHERE <lookup> AND status IN (<sources>)`` that writes
+the new status and the given columns only, so two concurrent transitions on
+the same row cannot both succeed and a late "complete" cannot land on a
+rejected request.
+
+``apply_bulk_transition`` does the same for a list of ids at once: the
+requested rows are read (and locked where the database supports it) in
+one query, and the ones in a source status are moved with one ``UPDATE``.
+
+``update()`` does not send ``post_save``; ``transition_applied`` is sent
+instead, inside the same transaction, so that counters and rollups can
+follow the change.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+from django.dispatch import Signal
+
+from .models import LaundryForm, MaintenanceRequest
+
+Transition = namedtuple('Transition', 'sources target')
+
+_Maintenance = MaintenanceRequest.RequestStatus
+_Laundry = LaundryForm.FormStatus
+
+WORKFLOWS = {
+    MaintenanceRequest: {
+        'approve': Transition((_Maintenance.PENDING_PROCTOR,), _Maintenance.APPROVED_BY_PROCTOR),
+        'reject': Transition((_Maintenance.PENDING_PROCTOR,), _Maintenance.REJECTED),
+        'accept': Transition((_Maintenance.APPROVED_BY_PROCTOR,), _Maintenance.ASSIGNED_TO_STAFF),
+        'start': Transition((_Maintenance.ASSIGNED_TO_STAFF,), _Maintenance.IN_PROGRESS),
+        'complete': Transition(
+            (_Maintenance.ASSIGNED_TO_STAFF, _Maintenance.IN_PROGRESS), _Maintenance.COMPLETED
+        ),
+    },
+    LaundryForm: {
+        'approve': Transition((_Laundry.PENDING_PROCTOR,), _Laundry.APPROVED_BY_PROCTOR),
+        'reject': Transition((_Laundry.PENDING_PROCTOR,), _Laundry.REJECTED),
+        'verify': Transition((_Laundry.APPROVED_BY_PROCTOR,), _Laundry.VERIFIED_BY_SECURITY),
+        'take_out': Transition((_Laundry.VERIFIED_BY_SECURITY,), _Laundry.TAKEN_OUT),
+        # A gate scan of a bag the proctor approved verifies and releases it at once.
+        'verify_and_take_out': Transition((_Laundry.APPROVED_BY_PROCTOR,), _Laundry.TAKEN_OUT),
+    },
+}
+
+# Sent with ``sender`` (the model), ``lookup`` (the filter that selected the
+# rows), ``transition``, ``changes`` (the other columns written) and
+# ``count`` (the number of rows moved).
+transition_applied = Signal()
+
+
+class TransitionNotAllowed(Exception):
+    """The row exists but its status is not a source of the transition."""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+def apply_transition(model, name, changes=None, **lookup):
+    """
+    Move the row matching ``lookup`` through transition ``name``.
+
+    ``changes`` are extra columns to write alongside the new status. Returns
+    the new status. Raises ``model.DoesNotExist`` if no row matches
+    ``lookup`` and ``TransitionNotAllowed`` if the row is in another status.
+    """
+    transition = WORKFLOWS[model][name]
+    changes = changes or {}
+    with transaction.atomic():
+        updated = model.objects.filter(status__in=transition.sources, **lookup).update(
+            status=transition.target, **changes
+        )
+        if updated:
+            transition_applied.send(
+                sender=model, lookup=lookup, transition=transition, changes=changes, count=updated
+            )
+            return transition.target
+
+    status = model.objects.filter(**lookup).values_list('status', flat=True).first()
+    if status is None:
+        raise model.DoesNotExist
+    raise TransitionNotAllowed(status)
+
+
+def apply_bulk_transition(model, name, ids, changes=None, **lookup):
+    """
+    Move every row in ``ids`` that is in a source status through ``name``.
+
+    ``lookup`` narrows the rows further. Returns ``(moved, current)``:
+    the ids that were moved, and the status of every other id that
+    exists. Ids in neither were not found.
+    """
+    transition = WORKFLOWS[model][name]
+    changes = changes or {}
+    with transaction.atomic():
+        current = dict(
+            model.objects.select_for_update()
+            .filter(pk__in=ids, **lookup)
+            .order_by()
+            .values_list('pk', 'status')
+        )
+        moved = [pk for pk, status in current.items() if status in transition.sources]
+        if moved:
+            # Re-checking the status keeps the UPDATE safe where the read could not lock.
+            updated = model.objects.filter(pk__in=moved, status__in=transition.sources).update(
+                status=transition.target, **changes
+            )
+            if updated != len(moved):
+                # Another writer moved some rows between the read and the UPDATE
+                # (SQLite); keep only the rows that carry this call's changes.
+                mine = set(
+                    model.objects.filter(pk__in=moved, status=transition.target, **changes)
+                    .values_list('pk', flat=True)
+                )
+                current.update(
+                    model.objects.filter(pk__in=[pk for pk in moved if pk not in mine]).values_list('pk', 'status')
+                )
+                moved = [pk for pk in moved if pk in mine]
+            if moved:
+                transition_applied.send(
+                    sender=model, lookup={'pk__in': moved}, transition=transition, changes=changes,
+                    count=len(moved),
+                )
+    for pk in moved:
+        del current[pk]
+    return moved, current